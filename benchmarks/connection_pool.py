@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark latensi per query: koneksi per query (cara lama) vs pool koneksi.
+
+Cara lama membuka sqlite3.connect, menjalankan satu statement lalu menutup
+koneksinya di setiap panggilan. Database sekarang memakai satu koneksi
+per thread yang dipakai ulang. Keduanya diukur pada database sementara
+yang sama, termasuk dari thread lain (seperti timer di StudyTools).
+
+    python benchmarks/connection_pool.py               # 2.000 query per jenis
+    python benchmarks/connection_pool.py --ulang 10000
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import Database
+
+console = Console()
+
+FETCH_ONE = "SELECT * FROM tasks WHERE id = ?"
+FETCH_ALL = "SELECT * FROM tasks WHERE status = ? ORDER BY id LIMIT 20"
+
+
+def per_koneksi(db_path: Path, query: str, params: tuple, satu: bool):
+    """Pola lama Database.fetch_one/fetch_all: connect, query, close"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    c = conn.cursor()
+    c.execute(query, params)
+    if satu:
+        row = c.fetchone()
+        hasil = dict(row) if row else None
+    else:
+        hasil = [dict(row) for row in c.fetchall()]
+    conn.close()
+    return hasil
+
+
+def ukur(fungsi, ulang: int, seed: int) -> float:
+    """Rata-rata mikrodetik per panggilan"""
+    rng = random.Random(seed)
+    fungsi(rng)
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        fungsi(rng)
+    return (time.perf_counter() - mulai) / ulang * 1e6
+
+
+def ukur_thread(fungsi, ulang: int, seed: int) -> float:
+    """Seperti ukur(), tapi dijalankan di thread terpisah"""
+    hasil = []
+    t = threading.Thread(target=lambda: hasil.append(ukur(fungsi, ulang, seed)))
+    t.start()
+    t.join()
+    return hasil[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ulang", type=int, default=2000, help="jumlah query per jenis")
+    parser.add_argument("--tasks", type=int, default=1000, help="jumlah task di database")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp))
+        rng = random.Random(args.seed)
+        db.execute_many(
+            "INSERT INTO tasks (task, priority, status, deadline) VALUES (?, ?, ?, ?)",
+            [(f"Task {i}", rng.choice(["High", "Medium", "Low"]),
+              rng.choice(["pending", "done"]), f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+             for i in range(args.tasks)],
+        )
+        n = args.tasks
+
+        kasus = [
+            ("fetch_one (by id)",
+             lambda r: per_koneksi(db.db_path, FETCH_ONE, (r.randint(1, n),), True),
+             lambda r: db.fetch_one(FETCH_ONE, (r.randint(1, n),))),
+            ("fetch_all (20 baris)",
+             lambda r: per_koneksi(db.db_path, FETCH_ALL, (r.choice(["pending", "done"]),), False),
+             lambda r: db.fetch_all(FETCH_ALL, (r.choice(["pending", "done"]),))),
+        ]
+
+        table = Table(title=f"🔌 Latensi per query ({args.ulang:,} query, {n:,} task)")
+        table.add_column("Query")
+        table.add_column("Koneksi per query", justify="right")
+        table.add_column("Pool", justify="right")
+        table.add_column("Lebih cepat", justify="right", style="green")
+        for label, lama, baru in kasus:
+            for thread, fungsi_ukur in (("", ukur), (" di thread lain", ukur_thread)):
+                lama_us = fungsi_ukur(lama, args.ulang, args.seed)
+                baru_us = fungsi_ukur(baru, args.ulang, args.seed)
+                table.add_row(label + thread, f"{lama_us:.0f} µs", f"{baru_us:.0f} µs",
+                              f"{lama_us / baru_us:.0f}x")
+        db.close()
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark throughput tulis per profil durabilitas (config "db_durability").
+
+Setiap profil memakai database sementara sendiri, lalu menyisipkan baris
+satu per satu dengan autocommit, seperti tambah pengeluaran atau item
+clipboard dari menu. Sebagai pembanding, mode lama (rollback journal +
+synchronous=FULL) ikut diukur.
+
+    python benchmarks/durability.py                  # 2.000 baris per profil
+    python benchmarks/durability.py --baris 10000 --dir /sdcard/tmp
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import DURABILITY_PROFILES, Database
+
+console = Console()
+
+INSERT_EXPENSE = "INSERT INTO expenses (tanggal, jumlah, kategori, deskripsi) VALUES (?, ?, ?, ?)"
+INSERT_CLIPBOARD = "INSERT INTO clipboard_items (content) VALUES (?)"
+
+
+def ukur(db: Database, baris: int, seed: int) -> float:
+    """Baris per detik, tiap insert di-commit sendiri"""
+    rng = random.Random(seed)
+    mulai = time.perf_counter()
+    for i in range(baris):
+        if i % 2:
+            db.execute_query(INSERT_CLIPBOARD, (f"teks {i}",))
+        else:
+            db.execute_query(INSERT_EXPENSE, (f"2026-01-{rng.randint(1, 28):02d}",
+                                              rng.randint(1, 500) * 1000, "Makanan", "Kopi"))
+    return baris / (time.perf_counter() - mulai)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=2000, help="jumlah insert per profil")
+    parser.add_argument("--dir", type=Path, default=None,
+                        help="folder untuk database sementara (mis. penyimpanan HP)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    kasus = [("rollback journal + FULL (lama)", {"journal_mode": "DELETE", "synchronous": "FULL"}, "safe")]
+    kasus += [(f"WAL {nama} (synchronous={p['synchronous']})", None, nama)
+              for nama, p in DURABILITY_PROFILES.items()]
+
+    table = Table(title=f"💾 Insert satu per satu, {args.baris:,} baris")
+    table.add_column("Mode")
+    table.add_column("Baris/detik", justify="right")
+    table.add_column("vs lama", justify="right", style="green")
+    dasar = None
+    for label, pragmas, profil in kasus:
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+            db = Database(Path(tmp), pragmas=pragmas, durability=profil)
+            per_detik = ukur(db, args.baris, args.seed)
+            db.close()
+        dasar = dasar or per_detik
+        table.add_row(label, f"{per_detik:,.0f}", f"{per_detik / dasar:.1f}x")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark import pengeluaran dari CSV (ImporterPengeluaran).
+
+Membuat export mutasi rekening sintetis (pemisah ';', kolom debit/kredit,
+~10% baris kredit yang dilewati), lalu mengukur baca CSV saja, import ke
+database kosong, dan import ulang file yang sama (semua baris duplikat).
+Sebagai pembanding, baris yang sama juga di-insert langsung dengan trigger
+ringkasan per baris.
+
+    python benchmarks/expense_import.py                 # 100.000 baris
+    python benchmarks/expense_import.py --baris 300000 --acak
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import Database
+from modules.expense_import import INSERT_EXPENSE, ImporterPengeluaran, baca_csv
+from modules.expense_rollup import cek_konsistensi_rollup
+
+console = Console()
+
+KATEGORI = ["Makanan", "Transportasi", "Belanja", "Hiburan", "Tagihan", "Kesehatan", "Pendidikan", "Lainnya"]
+DESKRIPSI = ["GOFOOD Bakso", "Indomaret", "Token PLN", "Netflix", "Apotek K24",
+             "Transfer ke Budi", "Shell SPBU", "Udemy course", "GRAB*Ride", "Kopi Kenangan"]
+
+
+def buat_csv(path: Path, jumlah: int, acak: bool, seed: int):
+    """Export sintetis setahun; urut tanggal seperti mutasi bank kecuali acak=True"""
+    rng = random.Random(seed)
+    awal = date(2026, 1, 1)
+    hari = [rng.randint(0, 364) for _ in range(jumlah)]
+    if not acak:
+        hari.sort()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Tanggal;Keterangan;Debit;Kredit\n")
+        for h in hari:
+            tanggal = (awal + timedelta(days=h)).strftime("%d/%m/%Y")
+            if rng.random() < 0.1:
+                f.write(f"{tanggal};Gaji;;5.000.000\n")
+            else:
+                jumlah_rp = f"{rng.randint(1, 500) * 1000:,}".replace(",", ".")
+                f.write(f"{tanggal};{rng.choice(DESKRIPSI)} {rng.randint(1, 50)};{jumlah_rp};\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=100000, help="jumlah baris CSV")
+    parser.add_argument("--acak", action="store_true", help="tanggal tidak berurutan")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    table = Table(title=f"📥 Import {args.baris:,} baris CSV"
+                        f" ({'tanggal acak' if args.acak else 'urut tanggal'})")
+    table.add_column("Tahap")
+    table.add_column("Waktu", justify="right")
+    table.add_column("Baris/detik", justify="right")
+
+    def catat(label, detik, baris):
+        table.add_row(label, f"{detik:.2f} s", f"{baris / detik:,.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "mutasi.csv"
+        buat_csv(path, args.baris, args.acak, args.seed)
+
+        mulai = time.perf_counter()
+        dibaca = sum(len(batch) for batch in baca_csv(path))
+        catat("Baca CSV saja", time.perf_counter() - mulai, dibaca)
+
+        (tmp / "baru").mkdir()
+        db = Database(tmp / "baru")
+        mulai = time.perf_counter()
+        hasil = ImporterPengeluaran(db, KATEGORI).import_file(path)
+        catat(f"Import ({hasil.baru:,} baru)", time.perf_counter() - mulai, hasil.dibaca)
+
+        mulai = time.perf_counter()
+        ulang = ImporterPengeluaran(db, KATEGORI).import_file(path)
+        catat(f"Import ulang ({ulang.duplikat:,} duplikat)", time.perf_counter() - mulai, ulang.dibaca)
+        selisih = len(cek_konsistensi_rollup(db))
+        rows = db.fetch_all("SELECT tanggal, jumlah, kategori, deskripsi FROM expenses ORDER BY id", raw=True)
+        rows = [tuple(r) for r in rows]
+        db.close()
+
+        (tmp / "trigger").mkdir()
+        db = Database(tmp / "trigger")
+        mulai = time.perf_counter()
+        for i in range(0, len(rows), 5000):
+            db.execute_many(INSERT_EXPENSE, rows[i:i + 5000])
+        catat("Insert saja, trigger per baris", time.perf_counter() - mulai, len(rows))
+        db.close()
+
+    console.print(table)
+    console.print(f"[dim]Ringkasan tidak cocok setelah import: {selisih}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark laporan pengeluaran: agregasi baris mentah vs ringkasan harian.
+
+Mengisi database sementara dengan pengeluaran sintetis selama tiga tahun,
+lalu mengukur laporan bulanan/tahunan yang dihitung ulang dari tabel
+expenses (cara sebelum expense_daily_rollup) dan yang membaca ringkasan
+harian, plus cek konsistensi dan hitung ulang ringkasan penuh.
+
+    python benchmarks/expense_rollup.py              # 1.000.000 transaksi
+    python benchmarks/expense_rollup.py --baris 200000 --ulang 9
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import (EXPENSE_BY_CATEGORY_RANGE, EXPENSE_DAILY_AVG_RANGE, Database,
+                              month_range)
+from modules.expense_import import INSERT_EXPENSE
+from modules.expense_rollup import cek_konsistensi_rollup, insert_massal, rebuild_expense_rollup
+
+console = Console()
+
+KATEGORI = ["Makanan", "Transportasi", "Belanja", "Hiburan", "Tagihan", "Kesehatan", "Pendidikan", "Lainnya"]
+HARI = 3 * 365
+
+RAW_BY_CATEGORY = """SELECT kategori, SUM(jumlah) as total, COUNT(*) as jumlah_transaksi
+                     FROM expenses WHERE tanggal >= ? AND tanggal < ?
+                     GROUP BY kategori ORDER BY total DESC"""
+RAW_DAILY_AVG = """SELECT COUNT(DISTINCT tanggal) as hari, COALESCE(SUM(jumlah), 0) as total
+                   FROM expenses WHERE tanggal >= ? AND tanggal < ?"""
+
+
+def median_ms(fungsi, ulang: int) -> float:
+    fungsi()
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append(time.perf_counter() - mulai)
+    return statistics.median(waktu) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=1000000, help="jumlah transaksi")
+    parser.add_argument("--ulang", type=int, default=5, help="pengulangan per query (median)")
+    parser.add_argument("--seed", type=int, default=19)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    awal = date(2024, 1, 1)
+    rows = [
+        ((awal + timedelta(days=rng.randrange(HARI))).isoformat(), rng.randint(1, 500) * 1000,
+         rng.choice(KATEGORI), "")
+        for _ in range(args.baris)
+    ]
+    bulan = month_range("2026-06")
+    tahun = ("2025-01-01", "2026-01-01")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp))
+        mulai = time.perf_counter()
+        insert_massal(db, INSERT_EXPENSE, rows)
+        console.print(f"[dim]Insert {args.baris:,} transaksi: {time.perf_counter() - mulai:.1f} s[/dim]")
+
+        table = Table(title=f"📊 Laporan dari {args.baris:,} transaksi (median {args.ulang}x)")
+        table.add_column("Laporan")
+        table.add_column("Baris mentah", justify="right")
+        table.add_column("Ringkasan harian", justify="right")
+        for label, raw, rollup, rentang in [
+            ("Bulanan per kategori", RAW_BY_CATEGORY, EXPENSE_BY_CATEGORY_RANGE, bulan),
+            ("Rata-rata harian sebulan", RAW_DAILY_AVG, EXPENSE_DAILY_AVG_RANGE, bulan),
+            ("Tahunan per kategori", RAW_BY_CATEGORY, EXPENSE_BY_CATEGORY_RANGE, tahun),
+        ]:
+            raw_ms = median_ms(lambda: db.fetch_all(raw, rentang), args.ulang)
+            rollup_ms = median_ms(lambda: db.fetch_all(rollup, rentang), args.ulang)
+            table.add_row(label, f"{raw_ms:.2f} ms", f"{rollup_ms:.2f} ms")
+        console.print(table)
+
+        cek_ms = median_ms(lambda: cek_konsistensi_rollup(db), args.ulang)
+        rebuild_ms = median_ms(lambda: rebuild_expense_rollup(db), args.ulang)
+        console.print(f"[dim]Cek konsistensi: {cek_ms:.0f} ms ({len(cek_konsistensi_rollup(db))} selisih), "
+                      f"hitung ulang ringkasan: {rebuild_ms:.0f} ms[/dim]")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
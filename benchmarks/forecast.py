@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark prakiraan saldo habis (estimasi_habis): muat riwayat + Monte Carlo.
+
+Mengisi database sementara dengan pengeluaran sintetis setahun terakhir
+(pola mingguan + hari besar sesekali), lalu mengukur muat_prakiraan()
+ditambah simulasi() untuk beberapa saldo, dengan NumPy (jika terpasang)
+dan dengan fallback Python murni. Target: di bawah 100 ms.
+
+    python benchmarks/forecast.py                    # 20 transaksi/hari
+    python benchmarks/forecast.py --per-hari 100 --ulang 20
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules import forecast
+from modules.database import Database
+from modules.expense_import import INSERT_EXPENSE
+from modules.expense_rollup import insert_massal
+
+console = Console()
+
+KATEGORI = ["Makanan", "Transportasi", "Belanja", "Hiburan", "Tagihan"]
+# Saldo dinyatakan dalam kelipatan rata-rata pengeluaran harian
+SALDO_HARI = [7, 30, 120, 400]
+
+
+def isi_pengeluaran(db: Database, per_hari: int, seed: int) -> float:
+    """Setahun ke belakang s/d hari ini; kembalikan rata-rata per hari"""
+    rng = random.Random(seed)
+    today = date.today()
+    rows = []
+    for mundur in range(365):
+        hari = today - timedelta(days=mundur)
+        skala = 1.6 if hari.weekday() >= 5 else 1.0
+        for _ in range(rng.randint(per_hari // 2, per_hari * 3 // 2)):
+            rows.append((hari.isoformat(), round(rng.expovariate(1 / 25000) * skala, -2),
+                         rng.choice(KATEGORI), ""))
+        if rng.random() < 0.03:
+            rows.append((hari.isoformat(), 1500000, "Tagihan", "Bayar kos"))
+    insert_massal(db, INSERT_EXPENSE, rows)
+    return sum(r[1] for r in rows) / 365
+
+
+def ukur(db: Database, saldo: float, ulang: int):
+    """Median ms muat riwayat + simulasi, dan median hari habis"""
+    waktu = []
+    for i in range(ulang + 1):
+        mulai = time.perf_counter()
+        hasil = forecast.muat_prakiraan(db).simulasi(saldo, seed=i)
+        waktu.append(time.perf_counter() - mulai)
+    return statistics.median(waktu[1:]) * 1000, hasil.persentil(50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-hari", type=int, default=20, help="rata-rata transaksi per hari")
+    parser.add_argument("--ulang", type=int, default=10, help="pengulangan per saldo (median)")
+    parser.add_argument("--seed", type=int, default=21)
+    args = parser.parse_args()
+
+    numpy_asli = forecast.np
+    mode = [("Python murni", None, forecast.JALUR_PYTHON)]
+    if numpy_asli is not None:
+        mode.insert(0, ("NumPy", numpy_asli, forecast.JALUR_NUMPY))
+
+    table = Table(title=f"📉 Prakiraan saldo habis, target < 100 ms (median {args.ulang}x)")
+    table.add_column("Saldo (x rata-rata harian)")
+    for label, _, jalur in mode:
+        table.add_column(f"{label} ({jalur:,} jalur)", justify="right")
+    table.add_column("Median habis", justify="right")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp))
+        rata = isi_pengeluaran(db, args.per_hari, args.seed)
+        try:
+            for kelipatan in SALDO_HARI:
+                kolom = []
+                for _, modul_np, _ in mode:
+                    forecast.np = modul_np
+                    ms, hari = ukur(db, rata * kelipatan, args.ulang)
+                    warna = "green" if ms < 100 else "red"
+                    kolom.append(f"[{warna}]{ms:.1f} ms[/{warna}]")
+                table.add_row(f"~{kelipatan} hari", *kolom, f"{hari} hari")
+        finally:
+            forecast.np = numpy_asli
+        db.close()
+    console.print(table)
+    if numpy_asli is None:
+        console.print("[dim]NumPy tidak terpasang, hanya fallback Python yang diukur[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark hitung streak kebiasaan: loop per hari (cara lama) vs satu kali lewat.
+
+Membuat database sementara berisi kebiasaan dengan log beberapa tahun
+(~80% hari tercentang, plus streak aktif 30-365 hari yang berakhir hari
+ini), lalu mengukur:
+- loop mundur per hari dengan satu fetch_one per hari per kebiasaan,
+- hitung ulang tabel habit_streaks dalam satu kali lewat (semua kebiasaan,
+  streak saat ini + terpanjang),
+- baca ringkasan yang sudah tersimpan, seperti lihat_streak sekarang.
+
+    python benchmarks/habit_streaks.py              # 50 kebiasaan x 3 tahun
+    python benchmarks/habit_streaks.py --habits 200 --tahun 5
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import Database
+from modules.habit_analytics import HabitAnalytics
+from modules.habit_streaks import rebuild_habit_streaks
+
+console = Console()
+
+
+def isi_log(db: Database, habits: int, tahun: int, seed: int) -> int:
+    rng = random.Random(seed)
+    today = date.today()
+    rows = []
+    for habit_id in range(1, habits + 1):
+        aktif = rng.randint(30, 365)
+        for mundur in range(tahun * 365):
+            if mundur < aktif or (mundur > aktif and rng.random() < 0.8):
+                rows.append((habit_id, (today - timedelta(days=mundur)).isoformat()))
+    with db.transaction() as conn:
+        conn.executemany("INSERT INTO habits (nama) VALUES (?)",
+                         [(f"Kebiasaan {i}",) for i in range(habits)])
+        conn.executemany("INSERT INTO habit_logs (habit_id, tanggal) VALUES (?, ?)", rows)
+    return len(rows)
+
+
+def streak_per_hari(db: Database, habits: int):
+    """Cara lama (_hitung_streak): satu query per hari sampai ketemu hari kosong"""
+    today = date.today()
+    queries = 0
+    for habit_id in range(1, habits + 1):
+        current = today
+        while True:
+            queries += 1
+            if not db.fetch_one("SELECT * FROM habit_logs WHERE habit_id = ? AND tanggal = ?",
+                                (habit_id, current.isoformat())):
+                break
+            current -= timedelta(days=1)
+    return queries
+
+
+def terbaik(fungsi, ulang: int):
+    """Waktu terbaik (ms) dari beberapa percobaan + hasil percobaan terakhir"""
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        waktu.append(time.perf_counter() - mulai)
+    return min(waktu) * 1000, hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--habits", type=int, default=50, help="jumlah kebiasaan")
+    parser.add_argument("--tahun", type=int, default=3, help="panjang riwayat log")
+    parser.add_argument("--ulang", type=int, default=5, help="percobaan, diambil yang tercepat")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp))
+        logs = isi_log(db, args.habits, args.tahun, args.seed)
+
+        table = Table(title=f"🔥 Streak {args.habits} kebiasaan x {args.tahun} tahun ({logs:,} log)")
+        table.add_column("Cara")
+        table.add_column("Waktu", justify="right")
+        table.add_column("Query", justify="right")
+
+        ms, queries = terbaik(lambda: streak_per_hari(db, args.habits), args.ulang)
+        table.add_row("Loop per hari (hanya streak saat ini)", f"{ms:.1f} ms", f"{queries:,}")
+        ms, _ = terbaik(lambda: rebuild_habit_streaks(db), args.ulang)
+        table.add_row("Satu kali lewat (saat ini + terpanjang)", f"{ms:.1f} ms", "1")
+        ms, _ = terbaik(lambda: HabitAnalytics(db).streaks(), args.ulang)
+        table.add_row("Baca ringkasan habit_streaks", f"{ms:.2f} ms", "1")
+        db.close()
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
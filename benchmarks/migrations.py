@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark index sekunder (migrasi 1 dan 2) pada database besar.
+
+Mengisi database sementara dengan data sintetis (default 1 juta log
+kebiasaan dan 1 juta pengeluaran), melepas index sekunder di tabel-tabel
+tersebut, lalu mengukur query yang sering dipakai sebelum dan sesudah
+index dipasang ulang lewat SQL migrasi 1 dan 2.
+
+    python benchmarks/migrations.py                 # 1.000.000 baris
+    python benchmarks/migrations.py --baris 200000 --ulang 50
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import MIGRATIONS, Database
+from modules.expense_import import INSERT_EXPENSE
+from modules.expense_rollup import insert_massal
+
+console = Console()
+
+TABEL = ("habit_logs", "expenses", "tasks", "study_sessions")
+HABITS = 500
+HARI = 2000
+
+QUERY = [
+    ("habit_logs per (habit_id, tanggal)",
+     "SELECT completed FROM habit_logs WHERE habit_id = ? AND tanggal = ?"),
+    ("SUM expenses satu hari",
+     "SELECT COALESCE(SUM(jumlah), 0) FROM expenses WHERE tanggal = ?"),
+    ("tasks pending, deadline terdekat",
+     "SELECT * FROM tasks WHERE status = 'pending' ORDER BY deadline LIMIT 10"),
+    ("study_sessions seminggu GROUP BY date",
+     "SELECT date, SUM(duration_minutes) FROM study_sessions WHERE date >= ? AND date < ? GROUP BY date"),
+]
+
+
+def isi_data(db: Database, baris: int, seed: int):
+    rng = random.Random(seed)
+    awal = date(2021, 1, 1)
+    hari = [(awal + timedelta(days=i)).isoformat() for i in range(HARI)]
+    per_habit = max(1, baris // HABITS)
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO habits (nama) VALUES (?)", [(f"Habit {i}",) for i in range(HABITS)]
+        )
+        conn.executemany(
+            "INSERT INTO habit_logs (habit_id, tanggal, completed) VALUES (?, ?, 1)",
+            ((h, hari[(h + i) % HARI]) for h in range(1, HABITS + 1) for i in range(per_habit)),
+        )
+        conn.executemany(
+            "INSERT INTO tasks (task, status, deadline) VALUES (?, ?, ?)",
+            ((f"Task {i}", "pending" if rng.random() < 0.05 else "done", rng.choice(hari))
+             for i in range(baris // 10)),
+        )
+        conn.executemany(
+            "INSERT INTO study_sessions (date, duration_minutes, subject) VALUES (?, ?, ?)",
+            ((rng.choice(hari), rng.randint(10, 120), "Matematika") for _ in range(baris // 10)),
+        )
+    insert_massal(db, INSERT_EXPENSE, [
+        (rng.choice(hari), rng.randint(1, 500) * 1000, rng.choice(["Makanan", "Transportasi", "Belanja"]), "")
+        for _ in range(baris)
+    ])
+    return hari
+
+
+def lepas_index(db: Database):
+    """Buang index sekunder supaya query kembali full scan seperti sebelum migrasi"""
+    placeholders = ", ".join("?" for _ in TABEL)
+    for row in db.fetch_all(
+        f"SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        f"AND tbl_name IN ({placeholders})", TABEL
+    ):
+        db.execute_query(f"DROP INDEX {row['name']}")
+
+
+def ukur_query(db: Database, hari, ulang: int, seed: int):
+    rng = random.Random(seed)
+    parameter = [
+        lambda: (rng.randint(1, HABITS), rng.choice(hari)),
+        lambda: (rng.choice(hari),),
+        lambda: (),
+        lambda: (lambda i: (hari[i], hari[i + 7]))(rng.randrange(HARI - 7)),
+    ]
+    hasil = []
+    for (_, sql), param in zip(QUERY, parameter):
+        db.fetch_all(sql, param())
+        mulai = time.perf_counter()
+        for _ in range(ulang):
+            db.fetch_all(sql, param())
+        hasil.append((time.perf_counter() - mulai) / ulang * 1000)
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=1000000,
+                        help="jumlah log kebiasaan dan pengeluaran (task & sesi belajar: 1/10)")
+    parser.add_argument("--ulang", type=int, default=20, help="pengulangan per query")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp))
+        mulai = time.perf_counter()
+        hari = isi_data(db, args.baris, args.seed)
+        lepas_index(db)
+        console.print(f"[dim]Isi data sintetis: {time.perf_counter() - mulai:.1f} s[/dim]")
+
+        sebelum = ukur_query(db, hari, args.ulang, args.seed)
+        mulai = time.perf_counter()
+        for steps in MIGRATIONS[:2]:
+            with db.transaction() as conn:
+                for sql in steps:
+                    conn.execute(sql)
+        lama_migrasi = time.perf_counter() - mulai
+        sesudah = ukur_query(db, hari, args.ulang, args.seed)
+        db.close()
+
+    table = Table(title=f"🗂️ Query pada {args.baris:,} baris, tanpa vs dengan index")
+    table.add_column("Query")
+    table.add_column("Tanpa index", justify="right")
+    table.add_column("Dengan index", justify="right")
+    for (label, _), a, b in zip(QUERY, sebelum, sesudah):
+        table.add_row(label, f"{a:.3f} ms", f"{b:.3f} ms")
+    console.print(table)
+    console.print(f"[dim]Migrasi 1-2 (buang duplikat + pasang index): {lama_migrasi:.1f} s, sekali jalan[/dim]")
+
+
+if __name__ == "__main__":
+    main()
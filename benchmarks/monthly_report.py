@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark filter bulanan: strftime('%Y-%m', tanggal) = ? vs rentang tanggal.
+
+Mengisi database sementara dengan pengeluaran sintetis selama beberapa
+tahun, lalu mengukur query laporan bulanan langsung dari tabel expenses
+dengan filter lama (fungsi di kolom, full scan) dan filter rentang
+`tanggal >= ? AND tanggal < ?` dari month_range() yang memakai index
+covering expenses(tanggal, kategori, jumlah).
+
+    python benchmarks/monthly_report.py              # 500.000 pengeluaran
+    python benchmarks/monthly_report.py --baris 100000 --ulang 20
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import Database, month_range
+from modules.expense_import import INSERT_EXPENSE
+from modules.expense_rollup import insert_massal
+
+console = Console()
+
+KATEGORI = ["Makanan", "Transportasi", "Belanja", "Hiburan", "Tagihan", "Kesehatan", "Pendidikan", "Lainnya"]
+HARI = 5 * 365
+
+# (label, SELECT ... FROM expenses, sisa query setelah WHERE)
+QUERY = [
+    ("Per kategori (statistik bulanan)",
+     "SELECT kategori, SUM(jumlah) as total, COUNT(*) as jumlah_transaksi FROM expenses",
+     "GROUP BY kategori ORDER BY total DESC"),
+    ("Rata-rata harian (estimasi habis)",
+     "SELECT COUNT(DISTINCT tanggal) as hari, COALESCE(SUM(jumlah), 0) as total FROM expenses",
+     ""),
+]
+
+
+def ukur(fungsi, ulang: int) -> float:
+    fungsi()
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        fungsi()
+    return (time.perf_counter() - mulai) / ulang * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=500000, help="jumlah pengeluaran")
+    parser.add_argument("--ulang", type=int, default=10, help="pengulangan per query")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    awal = date(2022, 1, 1)
+    rows = [
+        ((awal + timedelta(days=rng.randrange(HARI))).isoformat(), rng.randint(1, 500) * 1000,
+         rng.choice(KATEGORI), "")
+        for _ in range(args.baris)
+    ]
+    bulan = (awal + timedelta(days=HARI - 20)).strftime("%Y-%m")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp))
+        insert_massal(db, INSERT_EXPENSE, rows)
+
+        table = Table(title=f"📅 Laporan bulan {bulan} dari {args.baris:,} pengeluaran")
+        table.add_column("Query")
+        table.add_column("strftime() = ?", justify="right")
+        table.add_column("Rentang tanggal", justify="right")
+        for label, select, ekor in QUERY:
+            lama = f"{select} WHERE strftime('%Y-%m', tanggal) = ? {ekor}"
+            baru = f"{select} WHERE tanggal >= ? AND tanggal < ? {ekor}"
+            lama_ms = ukur(lambda: db.fetch_all(lama, (bulan,)), args.ulang)
+            baru_ms = ukur(lambda: db.fetch_all(baru, month_range(bulan)), args.ulang)
+            table.add_row(label, f"{lama_ms:.1f} ms", f"{baru_ms:.1f} ms")
+        db.close()
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
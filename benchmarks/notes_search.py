@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark pencarian catatan: LIKE (cara lama) vs index FTS5.
+
+Membuat database sementara berisi catatan sintetis (kosakata berdistribusi
+Zipf, jadi ada kata langka sampai kata yang muncul di hampir semua catatan),
+lalu mengukur waktu pencarian per kelompok frekuensi kata.
+
+    python benchmarks/notes_search.py                # 100.000 catatan
+    python benchmarks/notes_search.py --notes 20000 --ulang 10
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+from rich.table import Table
+
+from modules.database import Database
+from modules.notes_search import BATAS_HASIL, LIKE_SEARCH_QUERY, cari_catatan, fts5_didukung
+
+console = Console()
+
+# Target persentase catatan yang memuat kata, per kelompok
+KELOMPOK = [("langka", 0.1), ("sedang", 2), ("umum", 20), ("hampir semua", 90)]
+
+
+def buat_catatan(jumlah: int, seed: int):
+    rng = random.Random(seed)
+    huruf = "abcdeghijklmnoprstuwy"
+    kosakata = list({"".join(rng.choice(huruf) for _ in range(rng.randint(3, 9))) for _ in range(30000)})
+    bobot = list(itertools.accumulate(1 / (i + 1) for i in range(len(kosakata))))
+
+    def teks(n):
+        return " ".join(rng.choices(kosakata, cum_weights=bobot, k=n))
+
+    rows = [
+        (teks(rng.randint(2, 6)), teks(rng.randint(20, 150)),
+         json.dumps(rng.sample(kosakata[:200], rng.randint(0, 3))), rng.choice(["Umum", "Kerja", "Ide"]))
+        for _ in range(jumlah)
+    ]
+    return rows
+
+
+def pilih_kata(rows):
+    """Satu kata per kelompok frekuensi, dipilih dari frekuensi dokumen sebenarnya"""
+    df = Counter()
+    for judul, isi, _, _ in rows:
+        df.update(set(f"{judul} {isi}".split()))
+    hasil = []
+    for nama, persen in KELOMPOK:
+        target = len(rows) * persen / 100
+        kata, n = min(df.items(), key=lambda kv: (abs(kv[1] - target), kv[0]))
+        hasil.append((f"{nama} ({n / len(rows) * 100:.1f}%)", kata))
+    umum = hasil[2][1]
+    hasil.append(("awalan 2 huruf", umum[:2]))
+    hasil.append(("dua kata", f"{hasil[1][1]} {umum}"))
+    return hasil
+
+
+def ukur(fungsi, ulang: int):
+    fungsi()
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        hasil = fungsi()
+    return (time.perf_counter() - mulai) / ulang * 1000, len(hasil)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=100000, help="jumlah catatan")
+    parser.add_argument("--ulang", type=int, default=5, help="pengulangan per query")
+    parser.add_argument("--seed", type=int, default=4)
+    args = parser.parse_args()
+
+    if not fts5_didukung():
+        console.print("[red]SQLite ini tidak punya FTS5, tidak ada yang dibandingkan[/red]")
+        return
+
+    rows = buat_catatan(args.notes, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp))
+        mulai = time.perf_counter()
+        db.execute_many("INSERT INTO catatan (judul, isi, tags, kategori) VALUES (?, ?, ?, ?)", rows)
+        console.print(f"[dim]Insert {args.notes:,} catatan (termasuk index FTS): "
+                      f"{time.perf_counter() - mulai:.1f} s[/dim]")
+
+        table = Table(title=f"🔍 Pencarian {args.notes:,} catatan, {BATAS_HASIL} hasil teratas")
+        table.add_column("Query")
+        table.add_column("Kata", style="cyan")
+        table.add_column("LIKE", justify="right")
+        table.add_column("FTS5 (BM25)", justify="right")
+        for label, kata in pilih_kata(rows):
+            pola = f"%{kata}%"
+            like_ms, _ = ukur(lambda: db.fetch_all(LIKE_SEARCH_QUERY, (pola, pola, BATAS_HASIL)), args.ulang)
+            fts_ms, _ = ukur(lambda: cari_catatan(db, kata), args.ulang)
+            table.add_row(label, kata, f"{like_ms:.1f} ms", f"{fts_ms:.1f} ms")
+        db.close()
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,9 +24,14 @@ class ConfigManager:
             "theme": "dark",
             "notifications": False,
             "default_modules": ["jadwal", "notes", "tasks"],
-            "data_dir": str(self.config_dir / "data")
+            "data_dir": str(self.config_dir / "data"),
+            "db_durability": "balanced",
+            "db_checkpoint_interval": 500,
+            "profile_slow_ms": 20,
+            "dashboard_refresh_seconds": 5
         }
         self.save_config(default_config)
+        return default_config
     
     def detect_system_info(self) -> Dict[str, Any]:
         """Detect device and OS information"""
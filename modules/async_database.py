@@ -0,0 +1,84 @@
+import asyncio
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+DEFAULT_READERS = 4
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: BaseException = None):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class AsyncDatabase:
+    """Facade asyncio di atas Database supaya query tidak memblokir UI.
+    
+    - Baca (fetch_*, run) jalan di thread pool; tiap thread memakai koneksi
+      sendiri dari pool Database, jadi beberapa query bisa jalan bersamaan
+      (WAL mengizinkan banyak pembaca sekaligus).
+    - Tulis (execute_*, write) masuk antrean ke satu thread writer khusus,
+      sehingga urutan penulisan tetap terjaga dan tidak ada rebutan lock.
+    """
+    
+    def __init__(self, db, readers: int = DEFAULT_READERS):
+        self.db = db
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="rizz-db-reader")
+        self._write_queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="rizz-db-writer", daemon=True)
+        self._writer.start()
+        self._closed = False
+    
+    def _writer_loop(self):
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            loop, future, fn, args = item
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+            else:
+                loop.call_soon_threadsafe(_resolve, future, result)
+    
+    async def run(self, fn: Callable, *args) -> Any:
+        """Jalankan fungsi baca (sinkron) di thread pembaca"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(fn, *args))
+    
+    async def write(self, fn: Callable, *args) -> Any:
+        """Jalankan fungsi tulis (sinkron) di thread writer"""
+        if self._closed:
+            raise RuntimeError("AsyncDatabase sudah ditutup")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._write_queue.put((loop, future, fn, args))
+        return await future
+    
+    async def fetch_all(self, query: str, params: tuple = (), raw: bool = False):
+        return await self.run(self.db.fetch_all, query, params, raw)
+    
+    async def fetch_one(self, query: str, params: tuple = ()):
+        return await self.run(self.db.fetch_one, query, params)
+    
+    async def execute_query(self, query: str, params: tuple = ()):
+        return await self.write(self.db.execute_query, query, params)
+    
+    async def execute_many(self, query: str, seq_of_params: Iterable[tuple]) -> int:
+        return await self.write(self.db.execute_many, query, list(seq_of_params))
+    
+    def close(self):
+        """Selesaikan antrean tulis lalu hentikan semua thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_queue.put(None)
+        self._writer.join()
+        self._readers.shutdown(wait=True)
@@ -0,0 +1,268 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Budget bulanan (total & per kategori) dengan penghitung pengeluaran
+# bulan berjalan di tabel budget_mtd. Penghitung dan peringatan ambang
+# (budget_alerts) dijaga trigger (migrasi 7, migrate_budget_mtd): setiap
+# perubahan expenses -> expense_daily_rollup -> budget_mtd -> budget_alerts,
+# jadi membaca status budget cukup beberapa baris, tanpa menjumlah ulang.
+#
+# Baris budget dengan kategori NULL = budget total; di budget_mtd dan
+# budget_alerts total dicatat dengan kategori KATEGORI_TOTAL.
+
+KATEGORI_TOTAL = "*"
+# Persentase budget yang memicu peringatan
+AMBANG_PERINGATAN = (80, 100)
+
+MTD_FROM_ROLLUP = f'''
+    SELECT substr(tanggal, 1, 7) AS bulan, kategori, SUM(total), SUM(count)
+    FROM expense_daily_rollup
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT substr(tanggal, 1, 7), '{KATEGORI_TOTAL}', SUM(total), SUM(count)
+    FROM expense_daily_rollup
+    GROUP BY 1
+'''
+
+# Budget terakhir per kategori (budget lama tetap disimpan sebagai riwayat)
+BUDGET_BULAN_QUERY = '''
+    SELECT kategori, budget_bulanan FROM budget
+    WHERE id IN (SELECT MAX(id) FROM budget WHERE bulan = ? GROUP BY kategori)
+'''
+MTD_BULAN_QUERY = "SELECT kategori, terpakai, jumlah_transaksi FROM budget_mtd WHERE bulan = ?"
+PERINGATAN_BULAN_QUERY = "SELECT * FROM budget_alerts WHERE bulan = ? ORDER BY ambang DESC, kategori"
+
+
+def bulan_ini() -> str:
+    return datetime.now().strftime("%Y-%m")
+
+
+@dataclass(frozen=True)
+class StatusKategori:
+    kategori: Optional[str]  # None = total semua kategori
+    budget: Optional[float]
+    terpakai: float
+    transaksi: int
+
+    @property
+    def nama(self) -> str:
+        return self.kategori or "Total"
+
+    @property
+    def sisa(self) -> Optional[float]:
+        return None if self.budget is None else self.budget - self.terpakai
+
+    @property
+    def persen(self) -> Optional[float]:
+        if not self.budget:
+            return None
+        return self.terpakai / self.budget * 100
+
+
+@dataclass(frozen=True)
+class BudgetStatus:
+    """Budget & pengeluaran satu bulan (total + per kategori) beserta peringatannya"""
+    bulan: str
+    total: StatusKategori
+    kategori: Tuple[StatusKategori, ...]  # urut terpakai terbesar
+    peringatan: Tuple[Dict, ...]          # ambang tertinggi yang sedang terlewati per kategori
+
+    @classmethod
+    def load(cls, db, bulan: Optional[str] = None) -> "BudgetStatus":
+        bulan = bulan or bulan_ini()
+        budgets = {r['kategori'] or KATEGORI_TOTAL: r['budget_bulanan']
+                   for r in db.fetch_all(BUDGET_BULAN_QUERY, (bulan,), raw=True)}
+        mtd = {r['kategori']: r for r in db.fetch_all(MTD_BULAN_QUERY, (bulan,), raw=True)}
+
+        def status(kategori: str) -> StatusKategori:
+            row = mtd.get(kategori)
+            return StatusKategori(
+                None if kategori == KATEGORI_TOTAL else kategori,
+                budgets.get(kategori),
+                row['terpakai'] if row else 0.0,
+                row['jumlah_transaksi'] if row else 0,
+            )
+
+        per_kategori = [status(k) for k in (set(budgets) | set(mtd)) - {KATEGORI_TOTAL}]
+        per_kategori.sort(key=lambda s: (-s.terpakai, s.nama))
+        return cls(
+            bulan,
+            status(KATEGORI_TOTAL),
+            tuple(per_kategori),
+            tuple(_tertinggi(db.fetch_all(PERINGATAN_BULAN_QUERY, (bulan,)))),
+        )
+
+    def untuk(self, kategori: Optional[str]) -> StatusKategori:
+        """Status satu kategori (None = total)"""
+        if kategori is None:
+            return self.total
+        for s in self.kategori:
+            if s.kategori == kategori:
+                return s
+        return StatusKategori(kategori, None, 0.0, 0)
+
+
+def _tertinggi(rows: List[Dict]) -> List[Dict]:
+    """Satu peringatan per (bulan, kategori): ambang tertinggi yang terlewati"""
+    hasil = {}
+    for row in rows:
+        key = (row['bulan'], row['kategori'])
+        if key not in hasil or row['ambang'] > hasil[key]['ambang']:
+            hasil[key] = row
+    return sorted(hasil.values(), key=lambda r: (-r['ambang'], r['kategori']))
+
+
+def atur_budget(db, jumlah: float, kategori: Optional[str] = None, bulan: Optional[str] = None):
+    """Simpan budget baru; peringatan kategori itu dihitung ulang oleh trigger"""
+    db.execute_query(
+        "INSERT INTO budget (bulan, kategori, budget_bulanan) VALUES (?, ?, ?)",
+        (bulan or bulan_ini(), kategori, jumlah)
+    )
+
+
+def peringatan_baru(db) -> List[Dict]:
+    """Peringatan yang belum pernah ditampilkan, lalu tandai sudah dilihat"""
+    with db.transaction():
+        rows = db.fetch_all("SELECT * FROM budget_alerts WHERE dilihat = 0 ORDER BY ambang DESC, kategori")
+        if rows:
+            db.execute_query("UPDATE budget_alerts SET dilihat = 1 WHERE dilihat = 0")
+    return _tertinggi(rows)
+
+
+def format_peringatan(row: Dict) -> str:
+    nama = "Budget total" if row['kategori'] == KATEGORI_TOTAL else f"Budget {row['kategori']}"
+    if row['ambang'] >= 100:
+        return f"[red]⚠️ {nama} TERLAMPAUI: Rp {row['terpakai']:,.0f} dari Rp {row['budget']:,.0f}[/red]"
+    return (f"[yellow]⚠️ {nama} sudah {row['ambang']}%: "
+            f"Rp {row['terpakai']:,.0f} dari Rp {row['budget']:,.0f}[/yellow]")
+
+
+def migrate_budget_mtd(db):
+    """Migrasi 7: budget per kategori, budget_mtd, budget_alerts dan trigger-nya"""
+    # Budget per kategori; kategori NULL = budget total (semua baris lama)
+    db.execute_query("ALTER TABLE budget ADD COLUMN kategori TEXT")
+    db.execute_query("DROP INDEX IF EXISTS idx_budget_bulan")
+    db.execute_query("CREATE INDEX IF NOT EXISTS idx_budget_bulan_kategori ON budget(bulan, kategori, id)")
+    db.execute_query('''
+        CREATE TABLE IF NOT EXISTS budget_mtd (
+            bulan TEXT NOT NULL,
+            kategori TEXT NOT NULL,
+            terpakai REAL NOT NULL DEFAULT 0,
+            jumlah_transaksi INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (bulan, kategori)
+        ) WITHOUT ROWID
+    ''')
+    db.execute_query('''
+        CREATE TABLE IF NOT EXISTS budget_alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bulan TEXT NOT NULL,
+            kategori TEXT NOT NULL,
+            ambang INTEGER NOT NULL,
+            budget REAL NOT NULL,
+            terpakai REAL NOT NULL,
+            dilihat INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (bulan, kategori, ambang)
+        )
+    ''')
+    
+    # Perubahan ringkasan harian diteruskan sebagai selisih ke penghitung
+    # bulan (kategori itu + total)
+    upsert_mtd = f'''
+        INSERT INTO budget_mtd (bulan, kategori, terpakai, jumlah_transaksi)
+        VALUES (substr({{t}}.tanggal, 1, 7), {{t}}.kategori, {{total}}, {{count}}),
+               (substr({{t}}.tanggal, 1, 7), '{KATEGORI_TOTAL}', {{total}}, {{count}})
+        ON CONFLICT (bulan, kategori) DO UPDATE
+        SET terpakai = terpakai + excluded.terpakai,
+            jumlah_transaksi = jumlah_transaksi + excluded.jumlah_transaksi;
+    '''
+    db.execute_query(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_mtd_insert
+        AFTER INSERT ON expense_daily_rollup
+        BEGIN {upsert_mtd.format(t="NEW", total="NEW.total", count="NEW.count")} END
+    ''')
+    db.execute_query(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_mtd_update
+        AFTER UPDATE OF total, count ON expense_daily_rollup
+        BEGIN {upsert_mtd.format(t="NEW", total="NEW.total - OLD.total", count="NEW.count - OLD.count")} END
+    ''')
+    db.execute_query(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_mtd_delete
+        AFTER DELETE ON expense_daily_rollup
+        BEGIN {upsert_mtd.format(t="OLD", total="-OLD.total", count="-OLD.count")} END
+    ''')
+    
+    # Peringatan dievaluasi saat penghitung berubah: catat ambang yang baru
+    # terlewati, hapus yang tidak terlewati lagi (mis. pengeluaran dihapus)
+    ambang = " UNION ALL ".join(f"SELECT {a} AS ambang" for a in AMBANG_PERINGATAN)
+    budget_aktif = f'''
+        budget b, ({ambang}) a
+        WHERE b.id = (SELECT MAX(id) FROM budget
+                      WHERE bulan = NEW.bulan AND kategori IS NULLIF(NEW.kategori, '{KATEGORI_TOTAL}'))
+          AND b.budget_bulanan > 0
+    '''
+    db.execute_query(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_budget_mtd_alert_insert
+        AFTER INSERT ON budget_mtd
+        BEGIN
+            INSERT OR IGNORE INTO budget_alerts (bulan, kategori, ambang, budget, terpakai)
+            SELECT NEW.bulan, NEW.kategori, a.ambang, b.budget_bulanan, NEW.terpakai
+            FROM {budget_aktif}
+              AND NEW.terpakai >= b.budget_bulanan * a.ambang / 100.0;
+        END
+    ''')
+    db.execute_query(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_budget_mtd_alert_naik
+        AFTER UPDATE OF terpakai ON budget_mtd WHEN NEW.terpakai > OLD.terpakai
+        BEGIN
+            INSERT OR IGNORE INTO budget_alerts (bulan, kategori, ambang, budget, terpakai)
+            SELECT NEW.bulan, NEW.kategori, a.ambang, b.budget_bulanan, NEW.terpakai
+            FROM {budget_aktif}
+              AND OLD.terpakai < b.budget_bulanan * a.ambang / 100.0
+              AND NEW.terpakai >= b.budget_bulanan * a.ambang / 100.0;
+        END
+    ''')
+    db.execute_query('''
+        CREATE TRIGGER IF NOT EXISTS trg_budget_mtd_alert_turun
+        AFTER UPDATE OF terpakai ON budget_mtd WHEN NEW.terpakai < OLD.terpakai
+        BEGIN
+            DELETE FROM budget_alerts
+            WHERE bulan = NEW.bulan AND kategori = NEW.kategori
+              AND NEW.terpakai < budget * ambang / 100.0;
+        END
+    ''')
+    # Budget baru menggantikan peringatan lama kategori itu
+    db.execute_query(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_budget_alert_reset
+        AFTER INSERT ON budget
+        BEGIN
+            DELETE FROM budget_alerts
+            WHERE bulan = NEW.bulan AND kategori = COALESCE(NEW.kategori, '{KATEGORI_TOTAL}');
+            INSERT OR IGNORE INTO budget_alerts (bulan, kategori, ambang, budget, terpakai)
+            SELECT m.bulan, m.kategori, a.ambang, NEW.budget_bulanan, m.terpakai
+            FROM budget_mtd m, ({ambang}) a
+            WHERE m.bulan = NEW.bulan AND m.kategori = COALESCE(NEW.kategori, '{KATEGORI_TOTAL}')
+              AND NEW.budget_bulanan > 0
+              AND m.terpakai >= NEW.budget_bulanan * a.ambang / 100.0;
+        END
+    ''')
+    rebuild_budget_mtd(db)
+
+
+def rebuild_budget_mtd(db) -> int:
+    """Bangun ulang budget_mtd dari ringkasan harian, lalu buang peringatan basi"""
+    with db.transaction():
+        db.execute_query("DELETE FROM budget_mtd")
+        db.execute_query(
+            "INSERT INTO budget_mtd (bulan, kategori, terpakai, jumlah_transaksi) " + MTD_FROM_ROLLUP
+        )
+        db.execute_query('''
+            DELETE FROM budget_alerts WHERE NOT EXISTS (
+                SELECT 1 FROM budget_mtd m
+                WHERE m.bulan = budget_alerts.bulan AND m.kategori = budget_alerts.kategori
+                  AND m.terpakai >= budget_alerts.budget * budget_alerts.ambang / 100.0
+            )
+        ''')
+        row = db.fetch_one("SELECT COUNT(*) AS n FROM budget_mtd")
+    return row['n']
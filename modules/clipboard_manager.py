@@ -143,11 +143,7 @@ class ClipboardManager:
     
     def export_clipboard(self):
         """Export clipboard ke file"""
-        rows = self.db.fetch_all(
-            "SELECT * FROM clipboard_items ORDER BY is_pinned DESC, created_at DESC"
-        )
-        
-        if not rows:
+        if not self.db.fetch_one("SELECT 1 FROM clipboard_items LIMIT 1"):
             console.print("[yellow]Clipboard kosong[/yellow]")
             return
         
@@ -157,14 +153,20 @@ class ClipboardManager:
         
         filename = os.path.join(export_dir, f"clipboard_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
         
+        total = 0
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(f"=== Clipboard Export - {datetime.now().strftime('%Y-%m-%d %H:%M')} ===\n\n")
-            for row in rows:
-                pin = "[PINNED] " if row['is_pinned'] else ""
-                f.write(f"{pin}{row['content']}\n")
-                f.write("-" * 40 + "\n")
-        
-        console.print(f"[green]✓ {len(rows)} item berhasil diexport ke: {filename}[/green]")
+            separator = "-" * 40 + "\n"
+            for rows in self.db.stream(
+                "SELECT content, is_pinned FROM clipboard_items ORDER BY is_pinned DESC, created_at DESC"
+            ):
+                f.write("".join(
+                    f"{'[PINNED] ' if row['is_pinned'] else ''}{row['content']}\n{separator}"
+                    for row in rows
+                ))
+                total += len(rows)
+        
+        console.print(f"[green]✓ {total} item berhasil diexport ke: {filename}[/green]")
     
     def hapus_item(self):
         """Hapus item clipboard"""
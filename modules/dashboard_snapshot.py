@@ -0,0 +1,173 @@
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from modules.budget import BudgetStatus
+from modules.habit_analytics import HabitAnalytics, HABIT_TABLES
+
+TOP_TASKS_QUERY = '''
+    SELECT * FROM tasks
+    WHERE status != 'completed'
+    ORDER BY CASE priority
+        WHEN 'Tinggi' THEN 1 WHEN 'High' THEN 1
+        WHEN 'Sedang' THEN 2 WHEN 'Medium' THEN 2
+        WHEN 'Rendah' THEN 3 WHEN 'Low' THEN 3
+    END, deadline
+    LIMIT 3
+'''
+
+# Dua hitungan lewat index (status, ...) tanpa scan tabel tasks
+TASK_COUNTS_QUERY = '''
+    SELECT
+        (SELECT COUNT(*) FROM tasks WHERE status != 'completed') AS active,
+        (SELECT COUNT(*) FROM tasks
+         WHERE status = 'completed' AND updated_at >= ? AND updated_at < ?) AS completed_today
+'''
+
+# Total bulan berjalan dibaca dari BudgetStatus (penghitung budget_mtd)
+EXPENSE_TODAY_QUERY = '''
+    SELECT COALESCE(SUM(total), 0) AS total FROM expense_daily_rollup WHERE tanggal = ?
+'''
+
+STUDY_TODAY_QUERY = '''
+    SELECT COALESCE(SUM(duration_minutes), 0) AS total FROM study_sessions WHERE date = ?
+'''
+
+TOP_GOALS_QUERY = "SELECT * FROM future_goals ORDER BY deadline LIMIT 2"
+
+DASHBOARD_HABITS = 5
+
+# Bagian snapshot -> tabel yang dibacanya. Bagian hanya di-query ulang
+# kalau salah satu tabelnya berubah (atau hari berganti).
+SECTION_TABLES = {
+    "tasks": ("tasks",),
+    "money": ("budget", "expenses", "expense_daily_rollup", "budget_mtd", "budget_alerts"),
+    "study": ("study_sessions",),
+    "habits": HABIT_TABLES,
+    "goals": ("future_goals",),
+}
+SNAPSHOT_TABLES = tuple(t for tables in SECTION_TABLES.values() for t in tables)
+
+
+def _load_tasks(db, analytics, now):
+    today = now.strftime("%Y-%m-%d")
+    tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+    counts = db.fetch_one(TASK_COUNTS_QUERY, (today, tomorrow))
+    return {
+        "top_tasks": tuple(db.fetch_all(TOP_TASKS_QUERY)),
+        "active_tasks": counts['active'],
+        "completed_today": counts['completed_today'],
+    }
+
+
+def _load_money(db, analytics, now):
+    budget = BudgetStatus.load(db, now.strftime("%Y-%m"))
+    return {
+        "budget": budget,
+        "expense_month": budget.total.terpakai,
+        "expense_today": db.fetch_one(EXPENSE_TODAY_QUERY, (now.strftime("%Y-%m-%d"),))['total'],
+    }
+
+
+def _load_study(db, analytics, now):
+    study = db.fetch_one(STUDY_TODAY_QUERY, (now.strftime("%Y-%m-%d"),))
+    return {"study_minutes_today": study['total']}
+
+
+def _load_habits(db, analytics, now):
+    habits = analytics.habits()
+    streaks = analytics.streaks()
+    return {
+        "habits": tuple((h, streaks[h['id']]) for h in habits[:DASHBOARD_HABITS]),
+        "habits_total": len(habits),
+        "habits_done_today": len(analytics.done_today()),
+        "habit_week_rate": analytics.weekly_rate(),
+    }
+
+
+def _load_goals(db, analytics, now):
+    return {"goals": tuple(db.fetch_all(TOP_GOALS_QUERY))}
+
+
+SECTION_LOADERS = {
+    "tasks": _load_tasks,
+    "money": _load_money,
+    "study": _load_study,
+    "habits": _load_habits,
+    "goals": _load_goals,
+}
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Potret data dashboard & pelatih produktivitas pada satu waktu (read-only)"""
+    taken_at: datetime
+    top_tasks: Tuple[Dict, ...]
+    active_tasks: int
+    completed_today: int
+    budget: BudgetStatus
+    expense_month: float
+    expense_today: float
+    study_minutes_today: int
+    habits: Tuple[Tuple[Dict, int], ...]
+    habits_total: int
+    habits_done_today: int
+    habit_week_rate: float
+    goals: Tuple[Dict, ...]
+
+    @classmethod
+    def build(cls, db, analytics, now: Optional[datetime] = None,
+              sections: Optional[Iterable[str]] = None,
+              base: Optional["DashboardSnapshot"] = None) -> "DashboardSnapshot":
+        """Ambil data dalam satu koneksi & satu transaksi baca.
+        
+        sections + base: hanya query ulang bagian tertentu, sisanya diambil
+        dari snapshot lama (base).
+        """
+        now = now or datetime.now()
+        if sections is None or base is None:
+            sections = SECTION_LOADERS
+
+        fields = {"taken_at": now}
+        with db.transaction("DEFERRED"):
+            for name in sections:
+                fields.update(SECTION_LOADERS[name](db, analytics, now))
+
+        if base is not None:
+            return replace(base, **fields)
+        return cls(**fields)
+
+
+class SnapshotCache:
+    """Simpan DashboardSnapshot terakhir; bagian yang datanya berubah saja yang di-query ulang.
+    
+    Kunci tiap bagian = tanggal hari ini + versi data tabel-tabelnya, jadi
+    membuka dashboard berulang kali tanpa ada perubahan cukup satu
+    PRAGMA data_version.
+    """
+
+    def __init__(self, db, analytics=None):
+        self.db = db
+        self.analytics = analytics or HabitAnalytics(db)
+        self._keys: Dict[str, tuple] = {}
+        self._snapshot: Optional[DashboardSnapshot] = None
+
+    def _section_keys(self) -> Dict[str, tuple]:
+        today = datetime.now().strftime("%Y-%m-%d")
+        epoch, *versions = self.db.data_version(SNAPSHOT_TABLES)
+        by_table = dict(zip(SNAPSHOT_TABLES, versions))
+        return {
+            name: (today, epoch) + tuple(by_table[t] for t in tables)
+            for name, tables in SECTION_TABLES.items()
+        }
+
+    def get(self) -> Tuple[DashboardSnapshot, FrozenSet[str]]:
+        """Returns: (snapshot, nama bagian yang baru di-query; kosong = dari cache)"""
+        keys = self._section_keys()
+        changed = frozenset(name for name, key in keys.items() if self._keys.get(name) != key)
+        if changed:
+            self._snapshot = DashboardSnapshot.build(
+                self.db, self.analytics, sections=changed, base=self._snapshot
+            )
+            self._keys = keys
+        return self._snapshot, changed
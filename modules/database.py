@@ -1,192 +1,637 @@
+import importlib
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Union
+
+# PRAGMA yang dijalankan di setiap koneksi baru
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "temp_store": "MEMORY",
+    "cache_size": -8000,  # ~8 MB page cache per koneksi
+}
+
+# Profil durabilitas (config.json -> "db_durability").
+# Dengan WAL, synchronous=NORMAL tetap aman dari korupsi; yang bisa hilang
+# saat listrik mati hanya commit terakhir. "fast" tidak menunggu flush sama
+# sekali, cocok untuk import besar.
+DURABILITY_PROFILES = {
+    "safe": {"synchronous": "FULL"},
+    "balanced": {"synchronous": "NORMAL"},
+    "fast": {"synchronous": "OFF"},
+}
+DEFAULT_DURABILITY = "balanced"
+
+# Checkpoint WAL ke file utama setiap N penulisan
+DEFAULT_CHECKPOINT_INTERVAL = 500
+
+# Ukuran cache prepared statement per koneksi (default sqlite3: 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Tabel tujuan statement tulis, untuk penghitung versi per tabel
+WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+# Statement yang bisa mengubah isi tabel mana saja (skema, script)
+SCHEMA_CHANGE_RE = re.compile(r"^\s*(?:CREATE|DROP|ALTER|ATTACH|DETACH|VACUUM)\b", re.IGNORECASE)
+
+# Migrasi skema berversi, dilacak lewat PRAGMA user_version.
+# Versi = posisi di list (mulai 1). Tambahkan migrasi baru di akhir dan
+# jangan ubah migrasi yang sudah pernah dirilis. Tiap entri berupa list
+# SQL, fungsi yang menerima koneksi, atau referensi "modul:fungsi" ke
+# migrasi milik modul fiturnya (menerima Database, modulnya baru diimpor
+# saat migrasi dijalankan).
+MIGRATIONS = [
+    # 1: index sekunder untuk query yang sering dipakai
+    [
+        # Buang log ganda sebelum memasang UNIQUE
+        """DELETE FROM habit_logs WHERE id NOT IN (
+               SELECT MIN(id) FROM habit_logs GROUP BY habit_id, tanggal
+           )""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_habit_logs_habit_tanggal ON habit_logs(habit_id, tanggal)",
+        "CREATE INDEX IF NOT EXISTS idx_expenses_tanggal ON expenses(tanggal)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_deadline ON tasks(status, deadline)",
+        "CREATE INDEX IF NOT EXISTS idx_study_sessions_date ON study_sessions(date)",
+        "CREATE INDEX IF NOT EXISTS idx_budget_bulan ON budget(bulan, id)",
+        "CREATE INDEX IF NOT EXISTS idx_catatan_updated_at ON catatan(updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_clipboard_pinned_created ON clipboard_items(is_pinned, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_future_goals_deadline ON future_goals(deadline)",
+        "CREATE INDEX IF NOT EXISTS idx_goal_reflections_goal ON goal_reflections(goal_id)",
+    ],
+    # 2: index covering untuk laporan bulanan (filter rentang tanggal +
+    #    GROUP BY kategori tanpa membaca tabel). Menggantikan index tanggal.
+    [
+        "CREATE INDEX IF NOT EXISTS idx_expenses_tanggal_kategori ON expenses(tanggal, kategori, jumlah)",
+        "DROP INDEX IF EXISTS idx_expenses_tanggal",
+    ],
+    # 3: ringkasan streak per kebiasaan
+    "modules.habit_streaks:migrate_habit_streaks",
+    # 4: index untuk DashboardSnapshot (task selesai hari ini, log setahun)
+    [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks(status, updated_at)",
+        # riwayat setahun (HabitHistory) dibaca per rentang tanggal
+        "CREATE INDEX IF NOT EXISTS idx_habit_logs_tanggal ON habit_logs(tanggal, habit_id)",
+    ],
+    # 5: ringkasan harian pengeluaran per kategori
+    "modules.expense_rollup:migrate_expense_rollup",
+    # 6: cek duplikat saat import CSV/OFX (lihat modules/expense_import.py)
+    [
+        "CREATE INDEX IF NOT EXISTS idx_expenses_dedupe ON expenses(tanggal, jumlah, deskripsi)",
+    ],
+    # 7: budget per kategori + penghitung bulan berjalan & peringatan
+    "modules.budget:migrate_budget_mtd",
+    # 8: tag catatan ternormalisasi
+    "modules.note_tags:migrate_note_tags",
+]
+
+# Penyiapan yang dicek setiap database dibuka, setelah migrasi. Untuk fitur
+# yang bergantung pada kemampuan build SQLite (mis. FTS5): bisa terpasang
+# belakangan setelah SQLite di-upgrade, jadi tidak cocok jadi migrasi
+# sekali jalan. Fungsinya harus murah kalau sudah terpasang.
+SETUP_SAAT_BUKA = [
+    # index full-text catatan (FTS5); tanpa FTS5 pencarian memakai LIKE
+    "modules.notes_search:pasang_index_catatan",
+]
+
+def _resolve_ref(ref: str):
+    """Ambil fungsi dari referensi 'modul:fungsi'"""
+    module, _, name = ref.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+class NamedQuery(str):
+    """SQL yang terdaftar di QueryRegistry.
+    
+    Tetap sebuah str, jadi bisa langsung dioper ke execute_query/fetch_*;
+    bedanya Database mencatat jumlah panggilan dan waktunya per nama.
+    """
+    
+    def __new__(cls, name: str, sql: str):
+        obj = super().__new__(cls, sql)
+        obj.name = name
+        return obj
+
+
+class QueryRegistry:
+    """Daftar query bernama + statistik (jumlah panggilan, total waktu)"""
+    
+    def __init__(self):
+        self._queries: Dict[str, NamedQuery] = {}
+        self._stats: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name: str, sql: str) -> NamedQuery:
+        if name in self._queries:
+            raise ValueError(f"Query '{name}' sudah terdaftar")
+        query = NamedQuery(name, " ".join(sql.split()))
+        self._queries[name] = query
+        return query
+    
+    def __getitem__(self, name: str) -> NamedQuery:
+        return self._queries[name]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._queries
+    
+    def record(self, name: str, elapsed: float):
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                self._stats[name] = [1, elapsed]
+            else:
+                stat[0] += 1
+                stat[1] += elapsed
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Statistik per query, diurutkan dari total waktu terbesar"""
+        with self._lock:
+            rows = [
+                {"name": name, "calls": int(calls), "total_ms": total * 1000,
+                 "avg_ms": total * 1000 / calls}
+                for name, (calls, total) in self._stats.items()
+            ]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+    
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+QUERIES = QueryRegistry()
+
+# Query yang dipakai di banyak modul. Deklarasikan di sini, lalu import
+# konstantanya (mis. `from modules.database import HABITS_ALL`).
+HABITS_ALL = QUERIES.register(
+    "habits_all", "SELECT * FROM habits ORDER BY id"
+)
+# Kebiasaan + ringkasan streak-nya (tabel habit_streaks), satu baris per kebiasaan
+HABITS_WITH_STREAKS = QUERIES.register(
+    "habits_with_streaks",
+    """SELECT h.*, s.current_streak, s.longest_streak, s.last_date
+       FROM habits h
+       LEFT JOIN habit_streaks s ON s.habit_id = h.id
+       ORDER BY h.id"""
+)
+EXPENSE_DAILY_AVG_RANGE = QUERIES.register(
+    "expense_daily_avg_range",
+    """SELECT COUNT(DISTINCT tanggal) as hari, COALESCE(SUM(total), 0) as total
+       FROM expense_daily_rollup
+       WHERE tanggal >= ? AND tanggal < ?"""
+)
+# Total & jumlah transaksi per kategori dalam rentang tanggal, dari ringkasan harian
+EXPENSE_BY_CATEGORY_RANGE = QUERIES.register(
+    "expense_by_category_range",
+    """SELECT kategori, SUM(total) as total, SUM(count) as jumlah_transaksi
+       FROM expense_daily_rollup
+       WHERE tanggal >= ? AND tanggal < ?
+       GROUP BY kategori
+       ORDER BY total DESC"""
+)
+# Total pengeluaran per hari (hari tanpa pengeluaran tidak muncul), untuk prakiraan
+EXPENSE_DAILY_SERIES_RANGE = QUERIES.register(
+    "expense_daily_series_range",
+    """SELECT tanggal, SUM(total) as total
+       FROM expense_daily_rollup
+       WHERE tanggal >= ? AND tanggal < ?
+       GROUP BY tanggal
+       ORDER BY tanggal"""
+)
+# Total per hari per kategori, untuk skenario "kurangi kategori X"
+EXPENSE_DAILY_CATEGORY_SERIES_RANGE = QUERIES.register(
+    "expense_daily_category_series_range",
+    """SELECT tanggal, kategori, total
+       FROM expense_daily_rollup
+       WHERE tanggal >= ? AND tanggal < ?
+       ORDER BY tanggal"""
+)
+
+
+def month_range(bulan: str) -> Tuple[str, str]:
+    """Ubah 'YYYY-MM' jadi (awal, awal bulan berikutnya).
+    
+    Dipakai sebagai `tanggal >= ? AND tanggal < ?` supaya filter bulanan
+    bisa memakai index, tidak seperti strftime('%Y-%m', tanggal) = ?.
+    """
+    year, month = (int(part) for part in bulan.split("-"))
+    start = f"{year:04d}-{month:02d}-01"
+    if month == 12:
+        year, month = year + 1, 1
+    else:
+        month += 1
+    return start, f"{year:04d}-{month:02d}-01"
 
 class Database:
-    def __init__(self, config_dir: Path):
+    def __init__(self, config_dir: Path, pragmas: Optional[Dict[str, Any]] = None,
+                 durability: str = DEFAULT_DURABILITY,
+                 checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
         self.db_path = config_dir / "rizz_data.db"
+        
+        if durability not in DURABILITY_PROFILES:
+            durability = DEFAULT_DURABILITY
+        self.durability = durability
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        self.pragmas.update(DURABILITY_PROFILES[durability])
+        if pragmas:
+            self.pragmas.update(pragmas)
+        
+        self.checkpoint_interval = checkpoint_interval
+        self._writes_since_checkpoint = 0
+        
+        # Versi data per tabel (naik setiap ada tulis lewat execute_*) plus
+        # epoch global yang naik kalau tabel tujuannya tidak diketahui atau
+        # ada proses lain yang menulis (PRAGMA data_version)
+        self._table_versions: Dict[str, int] = {}
+        self._epoch = 0
+        self._versions_lock = threading.Lock()
+        
+        # Diisi QueryProfiler saat mode --profile aktif
+        self.profiler = None
+        
+        # Satu koneksi per thread (UI utama + thread timer/background)
+        self._local = threading.local()
+        self._connections = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        
         self.init_database()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread=False hanya supaya close() bisa menutup semua
+        # koneksi dari thread utama; tiap koneksi tetap dipakai satu thread.
+        # isolation_level=None: autocommit per statement, transaksi dibuka
+        # secara eksplisit lewat transaction()
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """Ambil koneksi milik thread saat ini (dibuat sekali, lalu dipakai ulang)"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Database sudah ditutup")
+        
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.tx_depth = 0
+            self._local.data_version = None
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def checkpoint(self, mode: str = "PASSIVE"):
+        """Pindahkan isi WAL ke file database utama"""
+        self._writes_since_checkpoint = 0
+        return self.get_connection().execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    
+    def _bump_version(self, query: str):
+        match = WRITE_TABLE_RE.match(query)
+        if match:
+            table = match.group(1).lower()
+            with self._versions_lock:
+                self._table_versions[table] = self._table_versions.get(table, 0) + 1
+        elif SCHEMA_CHANGE_RE.match(query):
+            with self._versions_lock:
+                self._epoch += 1
+    
+    def data_version(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Kunci versi untuk sekumpulan tabel; berubah kalau salah satunya ditulis.
+        
+        Tulisan dari proses lain (mis. `rizz habits checkin` dari cron) tidak
+        lewat execute_*, jadi dideteksi lewat PRAGMA data_version dan
+        dianggap mengubah semua tabel.
+        """
+        conn = self.get_connection()
+        current = conn.execute("PRAGMA data_version").fetchone()[0]
+        with self._versions_lock:
+            seen = self._local.data_version
+            if seen is not None and seen != current:
+                self._epoch += 1
+            self._local.data_version = current
+            return (self._epoch,) + tuple(self._table_versions.get(t, 0) for t in tables)
+    
+    def _after_write(self, query: str):
+        self._bump_version(query)
+        if self.checkpoint_interval <= 0 or self._local.tx_depth:
+            return
+        self._writes_since_checkpoint += 1
+        if self._writes_since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+    
+    def close(self):
+        """Tutup semua koneksi di pool"""
+        if not self._closed:
+            try:
+                # Kosongkan WAL supaya file -wal tidak tertinggal besar
+                self.checkpoint("TRUNCATE")
+            except sqlite3.Error:
+                pass
+        
+        with self._pool_lock:
+            connections, self._connections = self._connections, []
+            self._closed = True
+        
+        for conn in connections:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+    
+    @contextmanager
+    def transaction(self, mode: str = "IMMEDIATE"):
+        """Jalankan beberapa statement dalam satu commit (atomic).
+        
+        Bisa bersarang; transaksi dalam memakai SAVEPOINT sehingga hanya
+        transaksi terluar yang melakukan commit ke disk. mode="DEFERRED"
+        untuk baca saja: semua query melihat snapshot data yang sama tanpa
+        mengunci penulis lain.
+        """
+        conn = self.get_connection()
+        depth = self._local.tx_depth
+        savepoint = f"sp_{depth}"
+        
+        if depth == 0:
+            conn.execute(f"BEGIN {mode}")
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        self._local.tx_depth = depth + 1
+        
+        try:
+            yield conn
+        except BaseException:
+            self._local.tx_depth = depth
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            self._local.tx_depth = depth
+            if depth == 0:
+                conn.execute("COMMIT")
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+    
     def init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        # Jadwal pelajaran table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS jadwal (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hari TEXT NOT NULL,
-                mata_pelajaran TEXT NOT NULL,
-                waktu_mulai TEXT NOT NULL,
-                waktu_selesai TEXT NOT NULL,
-                ruangan TEXT,
-                pengajar TEXT,
-                color_code TEXT DEFAULT '#3498db',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Catatan table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS catatan (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                judul TEXT NOT NULL,
-                isi TEXT NOT NULL,
-                tags TEXT,
-                kategori TEXT,
-                is_favorite BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tasks table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task TEXT NOT NULL,
-                priority TEXT DEFAULT 'Medium',
-                status TEXT DEFAULT 'pending',
-                deadline TEXT,
-                estimated_hours REAL,
-                actual_hours REAL,
-                category TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Study sessions (for Pomodoro)
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS study_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE DEFAULT CURRENT_DATE,
-                duration_minutes INTEGER,
-                subject TEXT,
-                productivity_score INTEGER,
-                distractions TEXT
-            )
-        ''')
-        
-        # File conversion history
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS conversions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                original_file TEXT,
-                output_file TEXT,
-                conversion_type TEXT,
-                file_size_mb REAL,
-                duration_seconds REAL,
-                converted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Expense tracker table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                tanggal DATE DEFAULT CURRENT_DATE,
-                jumlah REAL NOT NULL,
-                kategori TEXT DEFAULT 'Lainnya',
-                deskripsi TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Budget table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS budget (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bulan TEXT NOT NULL,
-                budget_bulanan REAL NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Clipboard manager table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS clipboard_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                content TEXT NOT NULL,
-                is_pinned BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Habits table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS habits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nama TEXT NOT NULL,
-                emoji TEXT DEFAULT '✅',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Habit logs table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS habit_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit_id INTEGER NOT NULL,
-                tanggal DATE DEFAULT CURRENT_DATE,
-                completed BOOLEAN DEFAULT 1,
-                FOREIGN KEY (habit_id) REFERENCES habits(id)
-            )
-        ''')
-        
-        # Future goals table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS future_goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                target TEXT NOT NULL,
-                deadline DATE NOT NULL,
-                progress INTEGER DEFAULT 0,
-                catatan TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Goal reflections table
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS goal_reflections (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                goal_id INTEGER NOT NULL,
-                pertanyaan TEXT,
-                jawaban TEXT,
-                tanggal DATE DEFAULT CURRENT_DATE,
-                FOREIGN KEY (goal_id) REFERENCES future_goals(id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            c = conn.cursor()
+            
+            # Jadwal pelajaran table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS jadwal (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    hari TEXT NOT NULL,
+                    mata_pelajaran TEXT NOT NULL,
+                    waktu_mulai TEXT NOT NULL,
+                    waktu_selesai TEXT NOT NULL,
+                    ruangan TEXT,
+                    pengajar TEXT,
+                    color_code TEXT DEFAULT '#3498db',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Catatan table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS catatan (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    judul TEXT NOT NULL,
+                    isi TEXT NOT NULL,
+                    tags TEXT,
+                    kategori TEXT,
+                    is_favorite BOOLEAN DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Tasks table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task TEXT NOT NULL,
+                    priority TEXT DEFAULT 'Medium',
+                    status TEXT DEFAULT 'pending',
+                    deadline TEXT,
+                    estimated_hours REAL,
+                    actual_hours REAL,
+                    category TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Study sessions (for Pomodoro)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS study_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date DATE DEFAULT CURRENT_DATE,
+                    duration_minutes INTEGER,
+                    subject TEXT,
+                    productivity_score INTEGER,
+                    distractions TEXT
+                )
+            ''')
+            
+            # File conversion history
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS conversions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    original_file TEXT,
+                    output_file TEXT,
+                    conversion_type TEXT,
+                    file_size_mb REAL,
+                    duration_seconds REAL,
+                    converted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Expense tracker table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS expenses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tanggal DATE DEFAULT CURRENT_DATE,
+                    jumlah REAL NOT NULL,
+                    kategori TEXT DEFAULT 'Lainnya',
+                    deskripsi TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Budget table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS budget (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bulan TEXT NOT NULL,
+                    budget_bulanan REAL NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Clipboard manager table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS clipboard_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    is_pinned BOOLEAN DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Habits table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS habits (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nama TEXT NOT NULL,
+                    emoji TEXT DEFAULT '✅',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Habit logs table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS habit_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    habit_id INTEGER NOT NULL,
+                    tanggal DATE DEFAULT CURRENT_DATE,
+                    completed BOOLEAN DEFAULT 1,
+                    FOREIGN KEY (habit_id) REFERENCES habits(id)
+                )
+            ''')
+            
+            # Future goals table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS future_goals (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    target TEXT NOT NULL,
+                    deadline DATE NOT NULL,
+                    progress INTEGER DEFAULT 0,
+                    catatan TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Goal reflections table
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS goal_reflections (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    goal_id INTEGER NOT NULL,
+                    pertanyaan TEXT,
+                    jawaban TEXT,
+                    tanggal DATE DEFAULT CURRENT_DATE,
+                    FOREIGN KEY (goal_id) REFERENCES future_goals(id)
+                )
+            ''')
+        
+        self.migrate()
+        for ref in SETUP_SAAT_BUKA:
+            _resolve_ref(ref)(self)
+    
+    def schema_version(self) -> int:
+        return self.get_connection().execute("PRAGMA user_version").fetchone()[0]
+    
+    def migrate(self):
+        """Jalankan migrasi yang belum diterapkan, masing-masing dalam satu transaksi"""
+        current = self.schema_version()
+        
+        for version, steps in enumerate(MIGRATIONS, start=1):
+            if version <= current:
+                continue
+            with self.transaction() as conn:
+                if isinstance(steps, str):
+                    _resolve_ref(steps)(self)
+                elif callable(steps):
+                    steps(conn)
+                else:
+                    for sql in steps:
+                        conn.execute(sql)
+                conn.execute(f"PRAGMA user_version = {version}")
+    
+    def _record(self, query: str, start: float, params: Any = (), explain: bool = True):
+        elapsed = time.perf_counter() - start
+        if isinstance(query, NamedQuery):
+            QUERIES.record(query.name, elapsed)
+        if self.profiler is not None:
+            self.profiler.record(self.get_connection(), query, params, elapsed, explain)
     
     def execute_query(self, query: str, params: tuple = ()):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(query, params)
-        conn.commit()
-        last_id = c.lastrowid
-        conn.close()
-        return last_id
-    
-    def fetch_all(self, query: str, params: tuple = ()) -> List[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
-        c.execute(query, params)
-        rows = c.fetchall()
-        conn.close()
+        start = time.perf_counter()
+        c = self.get_connection().execute(query, params)
+        self._record(query, start, params)
+        self._after_write(query)
+        return c.lastrowid
+    
+    def execute_many(self, query: str, seq_of_params: Iterable[tuple]) -> int:
+        """Jalankan query untuk banyak baris sekaligus dalam satu transaksi"""
+        start = time.perf_counter()
+        with self.transaction() as conn:
+            c = conn.executemany(query, seq_of_params)
+        self._record(query, start, explain=False)
+        self._after_write(query)
+        return c.rowcount
+    
+    def fetch_all(self, query: str, params: tuple = (), raw: bool = False) -> List[Union[Dict, sqlite3.Row]]:
+        """Ambil semua baris.
+        
+        raw=True mengembalikan sqlite3.Row apa adanya (akses row['kolom'] tetap
+        sama) tanpa menyalin tiap baris ke dict baru.
+        """
+        start = time.perf_counter()
+        rows = self.get_connection().execute(query, params).fetchall()
+        self._record(query, start, params)
+        if raw:
+            return rows
         return [dict(row) for row in rows]
     
+    def stream(self, query: str, params: tuple = (), batch_size: int = 500) -> Iterator[List[sqlite3.Row]]:
+        """Generator batch baris (fetchmany) untuk export/scan besar.
+        
+        Batch pertama langsung tersedia setelah query jalan, dan memori yang
+        dipakai hanya sebesar satu batch.
+        """
+        start = time.perf_counter()
+        c = self.get_connection().execute(query, params)
+        self._record(query, start, params)
+        try:
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            c.close()
+    
+    def iter_rows(self, query: str, params: tuple = (), batch_size: int = 500) -> Iterator[sqlite3.Row]:
+        """Iterasi baris satu per satu tanpa memuat seluruh tabel ke memori"""
+        for rows in self.stream(query, params, batch_size):
+            yield from rows
+    
     def fetch_one(self, query: str, params: tuple = ()):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        c = conn.cursor()
-        c.execute(query, params)
-        row = c.fetchone()
-        conn.close()
-        return dict(row) if row else None
\ No newline at end of file
+        start = time.perf_counter()
+        row = self.get_connection().execute(query, params).fetchone()
+        self._record(query, start, params)
+        return dict(row) if row else None
@@ -0,0 +1,370 @@
+import csv
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.expense_rollup import insert_massal
+
+# Import pengeluaran dari CSV (export e-wallet/bank) dan OFX secara bertahap:
+# file dibaca per batch, kategori ditebak dari deskripsi, baris yang sudah
+# ada di database dilewati, lalu tiap batch disimpan dalam satu transaksi.
+
+BATCH_SIZE = 5000
+
+# Kata kunci deskripsi -> kategori ExpenseTracker.kategori_list.
+# Dicocokkan per kata utuh (tanpa beda huruf besar/kecil), jadi "kai" tidak
+# ikut cocok di "pakaian"
+KATEGORI_RULES = {
+    "Makanan": ["makan", "makanan", "minuman", "resto", "restoran", "warung", "kopi", "coffee", "cafe", "gofood",
+                "grabfood", "shopeefood", "bakso", "mie", "nasi", "ayam", "pizza", "burger", "kfc",
+                "mcd", "starbucks", "janji jiwa", "roti", "snack", "minum"],
+    "Transportasi": ["gojek", "goride", "gocar", "grab", "ojek", "maxim", "bensin", "pertamina",
+                     "shell", "spbu", "parkir", "tol", "krl", "mrt", "lrt", "transjakarta",
+                     "kereta", "kai", "bus", "travel", "tiket pesawat"],
+    "Belanja": ["tokopedia", "shopee", "lazada", "bukalapak", "blibli", "indomaret", "alfamart",
+                "alfamidi", "supermarket", "hypermart", "belanja", "mart", "toko"],
+    "Hiburan": ["netflix", "spotify", "youtube", "disney", "vidio", "bioskop", "cgv", "xxi",
+                "cinema", "game", "steam", "playstation", "karaoke", "konser"],
+    "Tagihan": ["pln", "listrik", "token", "pdam", "pulsa", "paket data", "kuota", "internet",
+                "indihome", "wifi", "telkomsel", "xl", "tagihan", "cicilan", "kos", "sewa"],
+    "Kesehatan": ["apotek", "apotik", "kimia farma", "klinik", "dokter", "rumah sakit", "rs",
+                  "halodoc", "obat", "bpjs", "vitamin"],
+    "Pendidikan": ["buku", "kursus", "sekolah", "kuliah", "spp", "ukt", "udemy", "coursera",
+                   "les", "seminar", "fotokopi"],
+}
+KATEGORI_DEFAULT = "Lainnya"
+
+# Nama kolom CSV yang dikenali (huruf kecil)
+KOLOM_TANGGAL = ("tanggal", "tgl", "date", "transaction date", "tanggal transaksi", "waktu", "time")
+KOLOM_JUMLAH = ("jumlah", "nominal", "amount", "total", "nilai", "harga")
+KOLOM_DEBIT = ("debit", "keluar", "pengeluaran", "withdrawal")
+KOLOM_DESKRIPSI = ("deskripsi", "keterangan", "description", "memo", "catatan", "merchant", "nama", "name")
+KOLOM_KATEGORI = ("kategori", "category")
+
+FORMAT_TANGGAL = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d/%m/%y", "%d %b %Y", "%Y%m%d")
+
+_BELUM = object()
+
+INSERT_EXPENSE = "INSERT INTO expenses (tanggal, jumlah, kategori, deskripsi) VALUES (?, ?, ?, ?)"
+
+
+@dataclass
+class HasilImport:
+    dibaca: int = 0
+    baru: int = 0
+    duplikat: int = 0
+    dilewati: int = 0
+
+
+class PenebakKategori:
+    """Cocokkan deskripsi ke kategori dengan satu regex gabungan
+
+    >>> penebak = PenebakKategori(list(KATEGORI_RULES) + [KATEGORI_DEFAULT])
+    >>> penebak.tebak("Beli pakaian anak"), penebak.tebak("Beli botol minum")
+    ('Lainnya', 'Makanan')
+    >>> penebak.tebak("Kosmetik wajah"), penebak.tebak("Bayar KOS bulan Oktober")
+    ('Lainnya', 'Tagihan')
+    >>> penebak.tebak("GOJEK GoRide"), penebak.tebak("Tiket KAI Bandung")
+    ('Transportasi', 'Transportasi')
+    """
+
+    def __init__(self, kategori_list: List[str], rules: Optional[Dict[str, List[str]]] = None):
+        self.kategori_list = kategori_list
+        self._by_lower = {k.lower(): k for k in kategori_list}
+        rules = rules or KATEGORI_RULES
+
+        groups = []
+        self._group_kategori = {}
+        for i, (kategori, keywords) in enumerate(rules.items()):
+            if kategori not in kategori_list or not keywords:
+                continue
+            name = f"k{i}"
+            self._group_kategori[name] = kategori
+            groups.append(rf"(?P<{name}>\b(?:{'|'.join(re.escape(k) for k in keywords)})\b)")
+        self._pattern = re.compile("|".join(groups), re.IGNORECASE) if groups else None
+        self._default = KATEGORI_DEFAULT if KATEGORI_DEFAULT in kategori_list else kategori_list[-1]
+        # Mutasi rekening banyak berulang (merchant yang sama), jadi hasil disimpan
+        self._cache: Dict[Tuple[str, str], str] = {}
+
+    def tebak(self, deskripsi: str, kategori_file: str = "") -> str:
+        key = (deskripsi, kategori_file)
+        kategori = self._cache.get(key)
+        if kategori is None:
+            kategori = self._tebak(deskripsi, kategori_file)
+            if len(self._cache) < 50000:
+                self._cache[key] = kategori
+        return kategori
+
+    def _tebak(self, deskripsi: str, kategori_file: str) -> str:
+        if kategori_file:
+            kategori = self._by_lower.get(kategori_file.strip().lower())
+            if kategori:
+                return kategori
+        if self._pattern and deskripsi:
+            match = self._pattern.search(deskripsi)
+            if match:
+                return self._group_kategori[match.lastgroup]
+        return self._default
+
+
+class _ParserTanggal:
+    """Parse tanggal ke YYYY-MM-DD; format yang berhasil dipakai duluan berikutnya"""
+
+    def __init__(self):
+        self._cache: Dict[str, Optional[str]] = {}
+        self._formats = list(FORMAT_TANGGAL)
+
+    def __call__(self, raw: str) -> Optional[str]:
+        raw = raw.strip()
+        hasil = self._cache.get(raw)
+        if hasil is not None or raw in self._cache:
+            return hasil
+
+        # Buang jam kalau ada (2026-10-17 08:30:00 / 17/10/2026 08:30)
+        teks = raw.split(" ")[0] if ":" in raw else raw
+        hasil = None
+        for i, fmt in enumerate(self._formats):
+            try:
+                hasil = datetime.strptime(teks, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+            if i:
+                self._formats.insert(0, self._formats.pop(i))
+            break
+
+        if len(self._cache) < 10000:
+            self._cache[raw] = hasil
+        return hasil
+
+
+def parse_jumlah(raw: str) -> Optional[float]:
+    """'Rp 15.000', '-15,000.50', '15.000,50' -> float (None kalau kosong/tidak valid)"""
+    teks = raw.strip().replace("Rp", "").replace("IDR", "").replace(" ", "")
+    if not teks:
+        return None
+    negatif = teks.startswith("-") or (teks.startswith("(") and teks.endswith(")"))
+    teks = teks.strip("-()+")
+
+    if "," in teks and "." in teks:
+        # Pemisah desimal = yang muncul paling akhir
+        if teks.rfind(",") > teks.rfind("."):
+            teks = teks.replace(".", "").replace(",", ".")
+        else:
+            teks = teks.replace(",", "")
+    elif "," in teks:
+        bagian = teks.split(",")
+        teks = teks.replace(",", "." if len(bagian) == 2 and len(bagian[1]) != 3 else "")
+    elif teks.count(".") > 1 or (teks.count(".") == 1 and len(teks.split(".")[1]) == 3):
+        teks = teks.replace(".", "")
+
+    try:
+        nilai = float(teks)
+    except ValueError:
+        return None
+    return -nilai if negatif else nilai
+
+
+def _cari_kolom(header: List[str], kandidat: Tuple[str, ...]) -> Optional[int]:
+    lower = [h.strip().lower() for h in header]
+    for nama in kandidat:
+        if nama in lower:
+            return lower.index(nama)
+    return None
+
+
+def _baris_csv(reader) -> Iterator[List[str]]:
+    """Baris dari csv.reader; csv.Error (mis. field melebihi batas) diubah jadi
+    ValueError dengan nomor barisnya"""
+    try:
+        yield from reader
+    except csv.Error as e:
+        raise ValueError(f"CSV tidak valid di baris {reader.line_num}: {e}") from e
+
+
+def baca_csv(path: Path, batch_size: int = BATCH_SIZE) -> Iterator[List[Tuple[str, str, str, str]]]:
+    """Generator batch baris mentah (tanggal, jumlah, deskripsi, kategori) dari CSV.
+
+    Kolom jumlah bisa dipisah debit/kredit (hanya baris dengan debit terisi
+    yang diambil) atau satu kolom bertanda: kalau batch pertama memuat angka
+    negatif, hanya baris negatif (uang keluar) yang dianggap pengeluaran.
+    Baris yang tidak dipakai dikirim kosong supaya tetap terhitung dilewati.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = _baris_csv(csv.reader(f, dialect))
+        header = next(reader, None)
+        if not header:
+            return
+
+        i_tanggal = _cari_kolom(header, KOLOM_TANGGAL)
+        i_jumlah = _cari_kolom(header, KOLOM_DEBIT)
+        bertanda = i_jumlah is None
+        if bertanda:
+            i_jumlah = _cari_kolom(header, KOLOM_JUMLAH)
+        i_deskripsi = _cari_kolom(header, KOLOM_DESKRIPSI)
+        i_kategori = _cari_kolom(header, KOLOM_KATEGORI)
+        if i_tanggal is None or i_jumlah is None:
+            raise ValueError(
+                "Kolom tanggal/jumlah tidak ditemukan di header CSV: " + ", ".join(header)
+            )
+
+        kosong = ("", "", "", "")
+        hanya_negatif = None
+        batch = []
+        for row in reader:
+            if len(row) <= max(i_tanggal, i_jumlah):
+                batch.append(kosong)
+            else:
+                batch.append((
+                    row[i_tanggal],
+                    row[i_jumlah],
+                    row[i_deskripsi] if i_deskripsi is not None and i_deskripsi < len(row) else "",
+                    row[i_kategori] if i_kategori is not None and i_kategori < len(row) else "",
+                ))
+            if len(batch) >= batch_size:
+                if hanya_negatif is None:
+                    hanya_negatif = bertanda and _ada_negatif(batch)
+                yield _saring_negatif(batch, kosong) if hanya_negatif else batch
+                batch = []
+        if batch:
+            if hanya_negatif is None:
+                hanya_negatif = bertanda and _ada_negatif(batch)
+            yield _saring_negatif(batch, kosong) if hanya_negatif else batch
+
+
+def _ada_negatif(batch) -> bool:
+    return any(r[1].lstrip().startswith(("-", "(")) for r in batch)
+
+
+def _saring_negatif(batch, kosong):
+    return [r if r[1].lstrip().startswith(("-", "(")) else kosong for r in batch]
+
+
+OFX_TAG_RE = re.compile(r"<(DTPOSTED|TRNAMT|NAME|MEMO)>([^<\r\n]*)", re.IGNORECASE)
+
+
+def baca_ofx(path: Path, batch_size: int = BATCH_SIZE) -> Iterator[List[Tuple[str, str, str, str]]]:
+    """Generator batch transaksi dari OFX 1.x (SGML) maupun 2.x (XML).
+
+    Hanya transaksi dengan TRNAMT negatif (uang keluar) yang dianggap pengeluaran.
+    """
+    batch = []
+    blok = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            upper = line.upper()
+            if "<STMTTRN>" in upper:
+                blok = []
+            if blok is not None:
+                blok.append(line)
+            if "</STMTTRN>" in upper and blok is not None:
+                fields = {k.upper(): v.strip() for k, v in OFX_TAG_RE.findall("".join(blok))}
+                blok = None
+                jumlah = fields.get("TRNAMT", "")
+                if not jumlah.strip().startswith("-"):
+                    continue
+                deskripsi = " ".join(x for x in (fields.get("NAME", ""), fields.get("MEMO", "")) if x)
+                batch.append((fields.get("DTPOSTED", "")[:8], jumlah, deskripsi, ""))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def _kunci(tanggal: str, jumlah: float, deskripsi: Optional[str]) -> Tuple[str, float, str]:
+    return tanggal, round(jumlah, 2), deskripsi or ""
+
+
+class ImporterPengeluaran:
+    def __init__(self, db, kategori_list: List[str], rules: Optional[Dict[str, List[str]]] = None):
+        self.db = db
+        self.penebak = PenebakKategori(kategori_list, rules)
+        self._parse_tanggal = _ParserTanggal()
+        self._jumlah_cache: Dict[str, Optional[float]] = {}
+        # Jumlah baris per (tanggal, jumlah, deskripsi) yang sudah ada di DB,
+        # dimuat per tanggal lewat index idx_expenses_dedupe
+        self._existing: Counter = Counter()
+        self._tanggal_dimuat = set()
+
+    def _muat_existing(self, tanggal_baru: Iterable[str]):
+        tanggal_baru = [t for t in set(tanggal_baru) if t not in self._tanggal_dimuat]
+        for i in range(0, len(tanggal_baru), 500):
+            chunk = tanggal_baru[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self.db.iter_rows(
+                f"SELECT tanggal, jumlah, deskripsi FROM expenses WHERE tanggal IN ({placeholders})",
+                tuple(chunk), batch_size=2000
+            ):
+                self._existing[_kunci(*row)] += 1
+        self._tanggal_dimuat.update(tanggal_baru)
+
+    def import_batches(self, batches: Iterable[List[Tuple[str, str, str, str]]],
+                       progress=None) -> HasilImport:
+        """Simpan batch baris mentah; tiap batch satu transaksi"""
+        hasil = HasilImport()
+        # Duplikat di dalam file dihitung juga: transaksi kembar yang sah
+        # (mis. dua kopi di hari yang sama) tetap masuk semua, tapi import
+        # ulang file yang sama tidak menambah apa-apa
+        seen: Counter = Counter()
+        jumlah_cache = self._jumlah_cache
+
+        for batch in batches:
+            rows = []
+            for raw_tanggal, raw_jumlah, deskripsi, kategori in batch:
+                hasil.dibaca += 1
+                tanggal = self._parse_tanggal(raw_tanggal) if raw_tanggal else None
+                jumlah = jumlah_cache.get(raw_jumlah, _BELUM) if raw_jumlah else None
+                if jumlah is _BELUM:
+                    jumlah = parse_jumlah(raw_jumlah)
+                    if len(jumlah_cache) < 50000:
+                        jumlah_cache[raw_jumlah] = jumlah
+                if tanggal is None or not jumlah:
+                    hasil.dilewati += 1
+                    continue
+                deskripsi = deskripsi.strip()
+                rows.append((tanggal, abs(jumlah), self.penebak.tebak(deskripsi, kategori), deskripsi or None))
+
+            self._muat_existing(r[0] for r in rows)
+
+            to_insert = []
+            for row in rows:
+                key = _kunci(row[0], row[1], row[3])
+                seen[key] += 1
+                if seen[key] <= self._existing[key]:
+                    hasil.duplikat += 1
+                else:
+                    to_insert.append(row)
+
+            if to_insert:
+                # Urut per (tanggal, kategori): halaman index yang disentuh
+                # jadi berurutan. Ringkasan harian ditambah sekali per batch,
+                # bukan lewat trigger per baris.
+                to_insert.sort(key=lambda r: (r[0], r[2]))
+                insert_massal(self.db, INSERT_EXPENSE, to_insert)
+                hasil.baru += len(to_insert)
+            if progress:
+                progress(hasil)
+
+        # Setelah import, isi DB per kunci = yang terbanyak dari keduanya
+        for key, n in seen.items():
+            if n > self._existing[key]:
+                self._existing[key] = n
+        return hasil
+
+    def import_file(self, path: Path, progress=None) -> HasilImport:
+        path = Path(path)
+        if path.suffix.lower() in (".ofx", ".qfx"):
+            batches = baca_ofx(path)
+        else:
+            batches = baca_csv(path)
+        return self.import_batches(batches, progress)
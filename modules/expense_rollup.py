@@ -0,0 +1,156 @@
+from typing import Dict, List, Sequence
+
+# Ringkasan harian pengeluaran per kategori di tabel expense_daily_rollup,
+# dijaga trigger pada tabel expenses (migrasi 5, migrate_expense_rollup).
+# Laporan bulanan/kategori membaca ringkasan ini, bukan baris mentah.
+# Kategori NULL dicatat sebagai 'Lainnya'; baris tanpa tanggal dilewati.
+
+ROLLUP_FROM_EXPENSES = '''
+    SELECT tanggal, COALESCE(kategori, 'Lainnya') AS kategori,
+           SUM(jumlah) AS total, COUNT(*) AS count
+    FROM expenses
+    WHERE tanggal IS NOT NULL
+    GROUP BY 1, 2
+'''
+
+# Tambahkan baris expenses dengan id > ? ke ringkasan (insert massal)
+ROLLUP_ADD_SINCE = '''
+    INSERT INTO expense_daily_rollup (tanggal, kategori, total, count)
+    SELECT tanggal, COALESCE(kategori, 'Lainnya'), SUM(jumlah), COUNT(*)
+    FROM expenses
+    WHERE id > ? AND tanggal IS NOT NULL
+    GROUP BY 1, 2
+    ON CONFLICT (tanggal, kategori) DO UPDATE
+    SET total = total + excluded.total, count = count + excluded.count
+'''
+
+# Tambah/kurangi ringkasan (tanggal, kategori) setiap baris expenses berubah
+ROLLUP_TRIGGERS = {
+    "trg_expenses_rollup_insert": '''
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_rollup_insert
+        AFTER INSERT ON expenses WHEN NEW.tanggal IS NOT NULL
+        BEGIN
+            INSERT INTO expense_daily_rollup (tanggal, kategori, total, count)
+            VALUES (NEW.tanggal, COALESCE(NEW.kategori, 'Lainnya'), NEW.jumlah, 1)
+            ON CONFLICT (tanggal, kategori) DO UPDATE
+            SET total = total + excluded.total, count = count + 1;
+        END
+    ''',
+    "trg_expenses_rollup_delete": '''
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_rollup_delete
+        AFTER DELETE ON expenses WHEN OLD.tanggal IS NOT NULL
+        BEGIN
+            UPDATE expense_daily_rollup
+            SET total = total - OLD.jumlah, count = count - 1
+            WHERE tanggal = OLD.tanggal AND kategori = COALESCE(OLD.kategori, 'Lainnya');
+            DELETE FROM expense_daily_rollup
+            WHERE tanggal = OLD.tanggal AND kategori = COALESCE(OLD.kategori, 'Lainnya')
+              AND count <= 0;
+        END
+    ''',
+    "trg_expenses_rollup_update": '''
+        CREATE TRIGGER IF NOT EXISTS trg_expenses_rollup_update
+        AFTER UPDATE OF tanggal, kategori, jumlah ON expenses
+        BEGIN
+            UPDATE expense_daily_rollup
+            SET total = total - OLD.jumlah, count = count - 1
+            WHERE OLD.tanggal IS NOT NULL
+              AND tanggal = OLD.tanggal AND kategori = COALESCE(OLD.kategori, 'Lainnya');
+            DELETE FROM expense_daily_rollup
+            WHERE OLD.tanggal IS NOT NULL
+              AND tanggal = OLD.tanggal AND kategori = COALESCE(OLD.kategori, 'Lainnya')
+              AND count <= 0;
+            INSERT INTO expense_daily_rollup (tanggal, kategori, total, count)
+            SELECT NEW.tanggal, COALESCE(NEW.kategori, 'Lainnya'), NEW.jumlah, 1
+            WHERE NEW.tanggal IS NOT NULL
+            ON CONFLICT (tanggal, kategori) DO UPDATE
+            SET total = total + excluded.total, count = count + 1;
+        END
+    ''',
+}
+
+# Selisih ringkasan vs hasil agregasi ulang dari expenses
+ROLLUP_MISMATCH_QUERY = f'''
+    SELECT tanggal, kategori,
+           SUM(raw_total) AS raw_total, SUM(raw_count) AS raw_count,
+           SUM(r_total) AS rollup_total, SUM(r_count) AS rollup_count
+    FROM (
+        SELECT tanggal, kategori, total AS raw_total, count AS raw_count,
+               0 AS r_total, 0 AS r_count
+        FROM ({ROLLUP_FROM_EXPENSES})
+        UNION ALL
+        SELECT tanggal, kategori, 0, 0, total, count FROM expense_daily_rollup
+    )
+    GROUP BY tanggal, kategori
+    HAVING raw_count != rollup_count OR ABS(raw_total - rollup_total) > 0.005
+    ORDER BY tanggal, kategori
+'''
+
+
+def migrate_expense_rollup(db):
+    """Migrasi 5: tabel expense_daily_rollup, trigger-nya, lalu isi awal"""
+    db.execute_query('''
+        CREATE TABLE IF NOT EXISTS expense_daily_rollup (
+            tanggal DATE NOT NULL,
+            kategori TEXT NOT NULL,
+            total REAL NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tanggal, kategori)
+        ) WITHOUT ROWID
+    ''')
+    for sql in ROLLUP_TRIGGERS.values():
+        db.execute_query(sql)
+    rebuild_expense_rollup(db)
+
+
+def rebuild_expense_rollup(db) -> int:
+    """Samakan expense_daily_rollup dengan seluruh tabel expenses.
+    
+    Bukan DELETE lalu INSERT ulang: hanya ringkasan yang berbeda yang ditulis,
+    jadi trigger budget_mtd/peringatan hanya terpicu untuk selisih yang nyata
+    dan peringatan yang sudah dilihat tidak muncul lagi.
+    """
+    with db.transaction():
+        db.execute_query('''
+            DELETE FROM expense_daily_rollup WHERE NOT EXISTS (
+                SELECT 1 FROM expenses e
+                WHERE e.tanggal = expense_daily_rollup.tanggal
+                  AND COALESCE(e.kategori, 'Lainnya') = expense_daily_rollup.kategori
+            )
+        ''')
+        # WHERE wajib ada: tanpa itu SQLite membaca ON CONFLICT sebagai bagian join
+        db.execute_query(f'''
+            INSERT INTO expense_daily_rollup (tanggal, kategori, total, count)
+            SELECT * FROM ({ROLLUP_FROM_EXPENSES}) WHERE 1
+            ON CONFLICT (tanggal, kategori) DO UPDATE
+            SET total = excluded.total, count = excluded.count
+            WHERE count != excluded.count OR ABS(total - excluded.total) > 0.005
+        ''')
+        row = db.fetch_one("SELECT COUNT(*) AS n FROM expense_daily_rollup")
+    return row['n']
+
+
+def insert_massal(db, query: str, rows: Sequence[tuple]):
+    """Insert banyak baris expenses tanpa trigger ringkasan per baris.
+    
+    Trigger insert dilepas selama executemany lalu dipasang lagi, kemudian
+    baris baru dijumlahkan per (tanggal, kategori) dan ditambahkan ke
+    ringkasan dengan satu statement. Semua di dalam satu transaksi, jadi
+    koneksi lain tidak pernah melihat tabel tanpa trigger dan kalau gagal
+    semuanya di-rollback.
+    """
+    with db.transaction() as conn:
+        # Lewat koneksi langsung: skema akhirnya sama, jadi versi semua tabel
+        # tidak perlu dinaikkan seperti DDL biasa
+        conn.execute("DROP TRIGGER IF EXISTS trg_expenses_rollup_insert")
+        # id AUTOINCREMENT selalu naik dan transaksi ini memegang lock tulis,
+        # jadi baris baru = id di atas nilai ini
+        id_awal = db.fetch_one("SELECT COALESCE(MAX(id), 0) AS id FROM expenses")['id']
+        db.execute_many(query, rows)
+        conn.execute(ROLLUP_TRIGGERS["trg_expenses_rollup_insert"])
+        db.execute_query(ROLLUP_ADD_SINCE, (id_awal,))
+
+
+def cek_konsistensi_rollup(db) -> List[Dict]:
+    """Daftar (tanggal, kategori) yang ringkasannya tidak cocok dengan expenses"""
+    return db.fetch_all(ROLLUP_MISMATCH_QUERY)
@@ -5,6 +5,10 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm, IntPrompt
 
+from modules.budget import BudgetStatus, atur_budget, format_peringatan, peringatan_baru, rebuild_budget_mtd
+from modules.expense_import import ImporterPengeluaran
+from modules.expense_rollup import cek_konsistensi_rollup, rebuild_expense_rollup
+
 console = Console()
 
 class ExpenseTracker:
@@ -44,6 +48,12 @@ class ExpenseTracker:
         ''', (jumlah, kategori, deskripsi))
         
         console.print(f"[green]✓ Pengeluaran Rp {jumlah:,.0f} ({kategori}) berhasil dicatat![/green]")
+        self._tampilkan_peringatan()
+    
+    def _tampilkan_peringatan(self):
+        """Tampilkan peringatan budget yang baru terpicu (dicatat trigger saat menulis)"""
+        for row in peringatan_baru(self.db):
+            console.print(format_peringatan(row))
     
     def lihat_hari_ini(self):
         """Tampilkan pengeluaran hari ini"""
@@ -78,74 +88,86 @@ class ExpenseTracker:
     
     def statistik_bulanan(self):
         """Tampilkan statistik bulanan"""
-        bulan = datetime.now().strftime("%Y-%m")
-        
-        rows = self.db.fetch_all('''
-            SELECT kategori, SUM(jumlah) as total, COUNT(*) as jumlah_transaksi
-            FROM expenses 
-            WHERE strftime('%Y-%m', tanggal) = ?
-            GROUP BY kategori
-            ORDER BY total DESC
-        ''', (bulan,))
+        status = BudgetStatus.load(self.db)
         
-        if not rows:
+        if not status.total.transaksi:
             console.print("[yellow]Belum ada pengeluaran bulan ini[/yellow]")
             return
         
-        grand_total = sum(r['total'] for r in rows)
+        grand_total = status.total.terpakai
         
-        table = Table(title=f"📊 Statistik Bulan {bulan}")
+        table = Table(title=f"📊 Statistik Bulan {status.bulan}")
         table.add_column("Kategori", style="cyan")
         table.add_column("Total", style="green", justify="right")
         table.add_column("Transaksi", style="yellow", justify="right")
         table.add_column("Persentase", style="magenta", justify="right")
         table.add_column("Grafik", style="blue")
+        table.add_column("Budget", justify="right")
         
-        for row in rows:
-            persen = (row['total'] / grand_total * 100) if grand_total > 0 else 0
+        for row in status.kategori:
+            if not row.transaksi:
+                continue
+            persen = (row.terpakai / grand_total * 100) if grand_total > 0 else 0
             bar_len = int(persen / 5)
             bar = "█" * bar_len + "░" * (20 - bar_len)
             
             table.add_row(
-                row['kategori'],
-                f"Rp {row['total']:,.0f}",
-                str(row['jumlah_transaksi']),
+                row.kategori,
+                f"Rp {row.terpakai:,.0f}",
+                str(row.transaksi),
                 f"{persen:.1f}%",
-                bar
+                bar,
+                self._format_budget(row)
             )
         
         console.print(table)
         console.print(f"\n[bold]Total Pengeluaran Bulan Ini: [red]Rp {grand_total:,.0f}[/red][/bold]")
         
         # Cek budget
-        budget = self.db.fetch_one(
-            "SELECT * FROM budget WHERE bulan = ? ORDER BY id DESC LIMIT 1",
-            (bulan,)
-        )
-        if budget:
-            sisa = budget['budget_bulanan'] - grand_total
+        if status.total.budget is not None:
+            sisa = status.total.sisa
             if sisa > 0:
                 console.print(f"[green]💰 Sisa Budget: Rp {sisa:,.0f}[/green]")
             else:
                 console.print(f"[red]⚠️ Budget TERLAMPAUI! Rp {abs(sisa):,.0f} melebihi budget[/red]")
+        for row in status.peringatan:
+            console.print(format_peringatan(row))
+    
+    @staticmethod
+    def _format_budget(row) -> str:
+        if row.persen is None:
+            return "[dim]-[/dim]"
+        warna = "green" if row.persen < 80 else ("yellow" if row.persen < 100 else "red")
+        return f"[{warna}]{row.persen:.0f}% dari Rp {row.budget:,.0f}[/{warna}]"
     
     def set_budget(self):
-        """Atur budget bulanan"""
-        bulan = datetime.now().strftime("%Y-%m")
-        console.print(f"[bold cyan]💰 Atur Budget Bulan {bulan}[/bold cyan]")
+        """Atur budget bulanan (total atau per kategori)"""
+        status = BudgetStatus.load(self.db)
+        console.print(f"[bold cyan]💰 Atur Budget Bulan {status.bulan}[/bold cyan]")
         
-        jumlah = Prompt.ask("[yellow]Budget bulanan (Rp)[/yellow]")
+        console.print("\n[cyan]Budget untuk:[/cyan]")
+        console.print(f"  0. Total bulanan {self._format_budget(status.total)}")
+        for i, kat in enumerate(self.kategori_list, 1):
+            console.print(f"  {i}. {kat} {self._format_budget(status.untuk(kat))}")
+        
+        kat_choice = Prompt.ask("Pilih", default="0")
+        try:
+            pilihan = int(kat_choice)
+            kategori = self.kategori_list[pilihan - 1] if pilihan else None
+        except (ValueError, IndexError):
+            console.print("[red]Pilihan tidak valid![/red]")
+            return
+        
+        jumlah = Prompt.ask(f"[yellow]Budget {kategori or 'bulanan'} (Rp)[/yellow]")
         try:
             jumlah = float(jumlah.replace('.', '').replace(',', '.'))
         except ValueError:
             console.print("[red]Jumlah harus angka![/red]")
             return
         
-        self.db.execute_query(
-            "INSERT INTO budget (bulan, budget_bulanan) VALUES (?, ?)",
-            (bulan, jumlah)
-        )
-        console.print(f"[green]✓ Budget bulan {bulan} diset: Rp {jumlah:,.0f}[/green]")
+        atur_budget(self.db, jumlah, kategori, status.bulan)
+        console.print(f"[green]✓ Budget {kategori or 'bulan'} {status.bulan} diset: Rp {jumlah:,.0f}[/green]")
+        self._tampilkan_peringatan()
     
     def hapus_pengeluaran(self):
         """Hapus pengeluaran"""
@@ -161,6 +183,64 @@ class ExpenseTracker:
             self.db.execute_query("DELETE FROM expenses WHERE id = ?", (exp_id,))
             console.print("[green]✓ Pengeluaran berhasil dihapus![/green]")
     
+    def cek_ringkasan(self):
+        """Cocokkan ringkasan harian dengan data pengeluaran mentah"""
+        console.print("[bold cyan]🔍 Cek Konsistensi Ringkasan Pengeluaran[/bold cyan]")
+        
+        selisih = cek_konsistensi_rollup(self.db)
+        if not selisih:
+            console.print("[green]✓ Ringkasan cocok dengan semua data pengeluaran[/green]")
+            return
+        
+        table = Table(title=f"⚠️ {len(selisih)} Ringkasan Tidak Cocok")
+        table.add_column("Tanggal", style="cyan")
+        table.add_column("Kategori", style="magenta")
+        table.add_column("Data Asli", style="green", justify="right")
+        table.add_column("Ringkasan", style="red", justify="right")
+        
+        for row in selisih[:20]:
+            table.add_row(
+                row['tanggal'], row['kategori'],
+                f"Rp {row['raw_total']:,.0f} ({row['raw_count']}x)",
+                f"Rp {row['rollup_total']:,.0f} ({row['rollup_count']}x)"
+            )
+        console.print(table)
+        
+        if Confirm.ask("Bangun ulang ringkasan dari data pengeluaran?"):
+            jumlah = rebuild_expense_rollup(self.db)
+            rebuild_budget_mtd(self.db)
+            console.print(f"[green]✓ {jumlah} ringkasan harian berhasil dibangun ulang![/green]")
+    
+    def import_file(self):
+        """Import pengeluaran dari file CSV (e-wallet/bank) atau OFX"""
+        console.print("[bold cyan]📥 Import Pengeluaran dari CSV/OFX[/bold cyan]")
+        console.print("[dim]Kategori ditebak dari deskripsi; transaksi yang sudah tercatat dilewati[/dim]\n")
+        
+        path = os.path.expanduser(Prompt.ask("[yellow]Path file[/yellow]").strip().strip('"'))
+        if not os.path.isfile(path):
+            console.print("[red]File tidak ditemukan![/red]")
+            return
+        
+        importer = ImporterPengeluaran(self.db, self.kategori_list)
+        try:
+            with console.status("Mengimport...") as status:
+                hasil = importer.import_file(
+                    path, progress=lambda h: status.update(f"Mengimport... {h.dibaca:,} baris dibaca")
+                )
+        except (ValueError, UnicodeDecodeError) as e:
+            console.print(f"[red]Gagal membaca file: {e}[/red]")
+            return
+        
+        table = Table(title="📥 Hasil Import", show_header=False)
+        table.add_column("Keterangan", style="cyan")
+        table.add_column("Jumlah", style="green", justify="right")
+        table.add_row("Baris dibaca", f"{hasil.dibaca:,}")
+        table.add_row("Pengeluaran baru", f"{hasil.baru:,}")
+        table.add_row("Sudah tercatat (dilewati)", f"{hasil.duplikat:,}")
+        table.add_row("Bukan pengeluaran / tidak valid", f"{hasil.dilewati:,}")
+        console.print(table)
+        self._tampilkan_peringatan()
+    
     def run(self):
         """Antarmuka utama expense tracker"""
         while True:
@@ -177,6 +257,8 @@ class ExpenseTracker:
                 ("3", "📊 Statistik Bulanan"),
                 ("4", "💰 Atur Budget"),
                 ("5", "🗑️ Hapus Pengeluaran"),
+                ("6", "🔍 Cek Konsistensi Ringkasan"),
+                ("7", "📥 Import CSV/OFX"),
                 ("0", "🔙 Kembali")
             ]
             
@@ -185,7 +267,7 @@ class ExpenseTracker:
             
             console.print(menu)
             
-            choice = Prompt.ask("Pilihan", choices=["0", "1", "2", "3", "4", "5"], default="0")
+            choice = Prompt.ask("Pilihan", choices=["0", "1", "2", "3", "4", "5", "6", "7"], default="0")
             
             if choice == "0":
                 break
@@ -199,6 +281,10 @@ class ExpenseTracker:
                 self.set_budget()
             elif choice == "5":
                 self.hapus_pengeluaran()
+            elif choice == "6":
+                self.cek_ringkasan()
+            elif choice == "7":
+                self.import_file()
             
             if choice != "0":
                 console.print("[dim]Tekan Enter untuk melanjutkan...[/dim]")
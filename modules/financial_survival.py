@@ -1,16 +1,45 @@
+import csv
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, IntPrompt
 
+from modules.database import EXPENSE_BY_CATEGORY_RANGE, month_range
+from modules.forecast import (
+    HORIZON, NAMA_HARI, PrakiraanPengeluaran, muat_deret_kategori, muat_prakiraan, simulasi_skenario
+)
+
 console = Console()
 
 class FinancialSurvival:
     def __init__(self, db):
         self.db = db
     
+    def _prakiraan(self):
+        """Model prakiraan dari riwayat pengeluaran; kalau kosong, tanya rata-rata harian"""
+        prakiraan = muat_prakiraan(self.db)
+        if prakiraan is not None:
+            console.print(
+                f"[dim]Dari {prakiraan.hari_data} hari data terakhir: rata-rata Rp {prakiraan.rata_rata:,.0f}/hari, "
+                f"tren terbaru Rp {prakiraan.ewma:,.0f}/hari[/dim]"
+            )
+            return prakiraan
+        
+        console.print("[yellow]Belum ada data pengeluaran di database.[/yellow]")
+        rata_rata_input = Prompt.ask("[yellow]Rata-rata pengeluaran harian kamu (Rp)[/yellow]", default="50000")
+        try:
+            rata_rata_harian = float(rata_rata_input.replace('.', '').replace(',', '.'))
+        except ValueError:
+            console.print("[red]Angka tidak valid, menggunakan Rp 50.000[/red]")
+            rata_rata_harian = 50000
+        return PrakiraanPengeluaran([rata_rata_harian], date.today())
+    
+    @staticmethod
+    def _format_hari(hari: int) -> str:
+        return f"≥ {HORIZON}" if hari >= HORIZON else str(hari)
+    
     def simulasi_bertahan(self):
         """Simulasi bertahan N hari dengan saldo tersisa"""
         console.print("[bold cyan]💀 Mode Bertahan Hidup Finansial[/bold cyan]")
@@ -25,39 +54,19 @@ class FinancialSurvival:
         
         hari_target = IntPrompt.ask("[yellow]Berapa hari harus bertahan?[/yellow]", default=30)
         
-        # Hitung rata-rata pengeluaran harian dari data
-        bulan_ini = datetime.now().strftime("%Y-%m")
-        stats = self.db.fetch_one('''
-            SELECT COUNT(DISTINCT tanggal) as hari, COALESCE(SUM(jumlah), 0) as total
-            FROM expenses 
-            WHERE strftime('%Y-%m', tanggal) = ?
-        ''', (bulan_ini,))
-        
-        if stats and stats['hari'] > 0 and stats['total'] > 0:
-            rata_rata_harian = stats['total'] / stats['hari']
-            console.print(f"[dim]Rata-rata dari data pengeluaranmu: Rp {rata_rata_harian:,.0f}/hari[/dim]")
-        else:
-            console.print("[yellow]Belum ada data pengeluaran di database.[/yellow]")
-            rata_rata_input = Prompt.ask("[yellow]Rata-rata pengeluaran harian kamu (Rp)[/yellow]", default="50000")
-            try:
-                rata_rata_harian = float(rata_rata_input.replace('.', '').replace(',', '.'))
-            except ValueError:
-                console.print("[red]Angka tidak valid, menggunakan Rp 50.000[/red]")
-                rata_rata_harian = 50000
+        prakiraan = self._prakiraan()
+        rata_rata_harian = prakiraan.ewma
+        hasil = prakiraan.simulasi(saldo)
         
         # Simulasi
         budget_harian = saldo / hari_target if hari_target > 0 else 0
-        hari_bisa_bertahan = int(saldo / rata_rata_harian) if rata_rata_harian > 0 else 999
+        hari_bisa_bertahan = hasil.persentil(50)
+        peluang = hasil.peluang_bertahan(hari_target)
+        kebutuhan = sum(prakiraan.proyeksi(date.today(), hari_target))
         
         # Detail per kategori
-        kategori_stats = self.db.fetch_all('''
-            SELECT kategori, AVG(jumlah) as avg_per_transaksi, 
-                   SUM(jumlah) as total, COUNT(*) as jml
-            FROM expenses 
-            WHERE strftime('%Y-%m', tanggal) = ?
-            GROUP BY kategori 
-            ORDER BY total DESC
-        ''', (bulan_ini,))
+        bulan_ini = datetime.now().strftime("%Y-%m")
+        kategori_stats = self.db.fetch_all(EXPENSE_BY_CATEGORY_RANGE, month_range(bulan_ini))
         
         result = f"""
 [bold]💰 Saldo Saat Ini: Rp {saldo:,.0f}[/bold]
@@ -68,25 +77,38 @@ class FinancialSurvival:
 [bold cyan]📊 Analisa:[/bold cyan]
   💵 Budget Harian Maksimal   : Rp {budget_harian:,.0f}
   📈 Rata-rata Pengeluaran/hari: Rp {rata_rata_harian:,.0f}
-  📅 Estimasi Bisa Bertahan   : {hari_bisa_bertahan} hari
+  📅 Estimasi Bisa Bertahan   : {self._format_hari(hari_bisa_bertahan)} hari
+     [dim](terburuk {self._format_hari(hasil.persentil(10))} · terbaik {self._format_hari(hasil.persentil(90))} hari)[/dim]
+  🎲 Peluang Bertahan {hari_target} hari : {peluang * 100:.0f}%
 """
         
-        if hari_bisa_bertahan >= hari_target:
+        if peluang >= 0.8:
             result += f"\n[bold green]🟢 AMAN! Kamu bisa bertahan {hari_target} hari.[/bold green]\n"
-            result += f"[green]  Bahkan masih bisa bertahan {hari_bisa_bertahan - hari_target} hari lebih![/green]\n"
-        elif hari_bisa_bertahan >= hari_target * 0.7:
+            if hari_bisa_bertahan > hari_target:
+                result += f"[green]  Bahkan masih bisa bertahan {self._format_hari(hari_bisa_bertahan - hari_target)} hari lebih![/green]\n"
+        elif peluang >= 0.4:
             result += f"\n[bold yellow]🟡 KETAT! Perlu hemat lebih.[/bold yellow]\n"
-            kurang = saldo - (rata_rata_harian * hari_target)
-            result += f"[yellow]  Estimasi kurang: Rp {abs(kurang):,.0f}[/yellow]\n"
+            result += f"[yellow]  Perkiraan kebutuhan {hari_target} hari: Rp {kebutuhan:,.0f}[/yellow]\n"
         else:
             result += f"\n[bold red]🔴 BAHAYA! Uang tidak cukup![/bold red]\n"
-            kurang = (rata_rata_harian * hari_target) - saldo
-            result += f"[red]  Kekurangan: Rp {kurang:,.0f}[/red]\n"
+            kurang = kebutuhan - saldo
+            if kurang > 0:
+                result += f"[red]  Kekurangan: Rp {kurang:,.0f}[/red]\n"
         
         console.print(Panel(result, title="💀 Hasil Simulasi", border_style="cyan", width=60))
         
+        # Budget harian mengikuti pola mingguan: hari yang biasanya boros dapat jatah lebih
+        if prakiraan.hari_data >= 14 and budget_harian > 0:
+            table = Table(title="📅 Budget per Hari (ikut pola mingguan)")
+            table.add_column("Hari", style="cyan")
+            table.add_column("Biasanya", style="yellow", justify="right")
+            table.add_column("Budget", style="green", justify="right")
+            for nama, faktor in zip(NAMA_HARI, prakiraan.musiman):
+                table.add_row(nama, f"Rp {rata_rata_harian * faktor:,.0f}", f"Rp {budget_harian * faktor:,.0f}")
+            console.print(table)
+        
         # Saran penghematan
-        if hari_bisa_bertahan < hari_target:
+        if peluang < 0.8:
             self._saran_hemat(budget_harian, kategori_stats)
     
     def _saran_hemat(self, budget_harian, kategori_stats):
@@ -112,7 +134,8 @@ class FinancialSurvival:
         if kategori_stats:
             console.print("\n[bold cyan]📊 Pengeluaran Terbesar (kurangi ini):[/bold cyan]")
             for i, kat in enumerate(kategori_stats[:3], 1):
-                console.print(f"  {i}. {kat['kategori']}: Rp {kat['total']:,.0f} (rata-rata Rp {kat['avg_per_transaksi']:,.0f}/transaksi)")
+                rata_rata = kat['total'] / kat['jumlah_transaksi'] if kat['jumlah_transaksi'] else 0
+                console.print(f"  {i}. {kat['kategori']}: Rp {kat['total']:,.0f} (rata-rata Rp {rata_rata:,.0f}/transaksi)")
     
     def estimasi_habis(self):
         """Estimasi kapan saldo habis"""
@@ -125,21 +148,14 @@ class FinancialSurvival:
             console.print("[red]Masukkan angka yang valid![/red]")
             return
         
-        # Hitung rata-rata pengeluaran harian
-        bulan_ini = datetime.now().strftime("%Y-%m")
-        stats = self.db.fetch_one('''
-            SELECT COUNT(DISTINCT tanggal) as hari, COALESCE(SUM(jumlah), 0) as total
-            FROM expenses 
-            WHERE strftime('%Y-%m', tanggal) = ?
-        ''', (bulan_ini,))
-        
-        if stats and stats['hari'] > 0 and stats['total'] > 0:
-            rata_rata = stats['total'] / stats['hari']
-        else:
-            rata_rata = float(Prompt.ask("Rata-rata pengeluaran harian (Rp)", default="50000"))
+        prakiraan = self._prakiraan()
+        rata_rata = prakiraan.ewma
+        hasil = prakiraan.simulasi(saldo)
         
-        hari_tersisa = int(saldo / rata_rata) if rata_rata > 0 else 999
-        tanggal_habis = datetime.now() + timedelta(days=hari_tersisa)
+        hari_tersisa = hasil.persentil(50)
+        tanggal_habis = hasil.tanggal(50)
+        hemat_20 = prakiraan.simulasi(saldo / 0.8).persentil(50)
+        hemat_50 = prakiraan.simulasi(saldo / 0.5).persentil(50)
         
         # Visual countdown
         console.print(Panel(f"""
@@ -149,12 +165,123 @@ class FinancialSurvival:
 {'─' * 40}
 
   📅 Estimasi saldo habis: [bold]{tanggal_habis.strftime('%d %B %Y')}[/bold]
-  ⏳ Itu [bold]{hari_tersisa} hari[/bold] lagi dari sekarang
+     [dim]8 dari 10 simulasi: {hasil.tanggal(10).strftime('%d %b')} – {hasil.tanggal(90).strftime('%d %b %Y')}[/dim]
+  ⏳ Itu [bold]{self._format_hari(hari_tersisa)} hari[/bold] lagi dari sekarang
 
-  [dim]Hemat Rp {rata_rata * 0.2:,.0f}/hari → bisa bertahan {int(saldo / (rata_rata * 0.8))} hari[/dim]
-  [dim]Hemat Rp {rata_rata * 0.5:,.0f}/hari → bisa bertahan {int(saldo / (rata_rata * 0.5))} hari[/dim]
+  [dim]Hemat Rp {rata_rata * 0.2:,.0f}/hari → bisa bertahan {self._format_hari(hemat_20)} hari[/dim]
+  [dim]Hemat Rp {rata_rata * 0.5:,.0f}/hari → bisa bertahan {self._format_hari(hemat_50)} hari[/dim]
         """, title="📉 Estimasi Habis Saldo", border_style="red", width=60))
     
+    @staticmethod
+    def _parse_rupiah(teks: str) -> float:
+        return float(teks.replace('.', '').replace(',', '.'))
+    
+    def _parse_potongan(self, teks: str, kategori_data) -> list:
+        """'Makanan:30 Hiburan:50+Belanja:20' -> [{}, {Makanan: 30}, {Hiburan: 50, Belanja: 20}]"""
+        by_lower = {k.lower(): k for k in kategori_data}
+        daftar = [{}]
+        for token in teks.split():
+            potongan = {}
+            for bagian in token.split('+'):
+                nama, _, persen = bagian.partition(':')
+                kategori = by_lower.get(nama.strip().lower())
+                try:
+                    persen = min(max(float(persen.replace(',', '.')), 0), 100)
+                except ValueError:
+                    console.print(f"[yellow]Format '{bagian}' tidak dikenal (contoh: Makanan:30), dilewati[/yellow]")
+                    continue
+                if kategori is None:
+                    console.print(f"[yellow]Kategori '{nama}' tidak ada di data pengeluaran, dilewati[/yellow]")
+                    continue
+                potongan[kategori] = persen
+            if potongan and potongan not in daftar:
+                daftar.append(potongan)
+        return daftar
+    
+    def bandingkan_skenario(self):
+        """Simulasikan banyak kombinasi saldo/gajian/penghematan sekaligus"""
+        console.print("[bold cyan]🧪 Bandingkan Banyak Skenario[/bold cyan]")
+        console.print("[dim]Semua kombinasi disimulasikan sekaligus dari riwayat pengeluaranmu[/dim]\n")
+        
+        start, per_kategori = muat_deret_kategori(self.db)
+        if start is None:
+            console.print("[yellow]Belum ada data pengeluaran di database.[/yellow]")
+            return
+        
+        try:
+            saldo_list = [self._parse_rupiah(x) for x in
+                          Prompt.ask("[yellow]Daftar saldo (Rp, pisahkan spasi)[/yellow]", default="1.000.000 2.000.000").split()]
+        except ValueError:
+            console.print("[red]Masukkan angka yang valid![/red]")
+            return
+        if not saldo_list:
+            console.print("[red]Masukkan minimal satu saldo![/red]")
+            return
+        
+        gajian_list = [(0, 0.0)]
+        tanggal_input = Prompt.ask("[yellow]Tanggal gajian yang dibandingkan (1-31, pisahkan spasi, kosong = tanpa gajian)[/yellow]", default="")
+        if tanggal_input.strip():
+            try:
+                tanggal_list = sorted({min(max(int(x), 1), 31) for x in tanggal_input.split()})
+                gajian = self._parse_rupiah(Prompt.ask("[yellow]Jumlah gajian per bulan (Rp)[/yellow]"))
+            except ValueError:
+                console.print("[red]Masukkan angka yang valid![/red]")
+                return
+            gajian_list += [(t, gajian) for t in tanggal_list]
+        
+        console.print(f"[dim]Kategori: {', '.join(sorted(per_kategori))}[/dim]")
+        potongan_list = self._parse_potongan(
+            Prompt.ask("[yellow]Skenario hemat (contoh: Makanan:30 Hiburan:50+Belanja:20)[/yellow]", default=""),
+            per_kategori
+        )
+        hari_target = IntPrompt.ask("[yellow]Target bertahan (hari)[/yellow]", default=30)
+        
+        hasil = simulasi_skenario(start, per_kategori, saldo_list, gajian_list, potongan_list)
+        
+        judul = f"🧪 {len(hasil)} Skenario"
+        if len(gajian_list) > 1:
+            judul += f" (gajian Rp {gajian_list[1][1]:,.0f}/bulan)"
+        table = Table(title=judul)
+        table.add_column("Saldo", style="cyan", justify="right", no_wrap=True)
+        table.add_column("Gajian", style="magenta")
+        table.add_column("Hemat", style="yellow")
+        table.add_column("Median", justify="right")
+        table.add_column("Terburuk", justify="right")
+        table.add_column(f"Peluang {hari_target} hr", justify="right")
+        table.add_column("Habis", style="dim")
+        
+        maks_baris = 40
+        for skenario, h in hasil[:maks_baris]:
+            peluang = h.peluang_bertahan(hari_target)
+            warna = "green" if peluang >= 0.8 else "yellow" if peluang >= 0.4 else "red"
+            table.add_row(
+                f"Rp {skenario.saldo:,.0f}", skenario.label_gajian(), skenario.label_potongan(),
+                f"{self._format_hari(h.persentil(50))} hr", f"{self._format_hari(h.persentil(10))} hr",
+                f"[{warna}]{peluang * 100:.0f}%[/{warna}]",
+                h.tanggal(50).strftime('%d %b') if h.persentil(50) < HORIZON else "-"
+            )
+        console.print(table)
+        if len(hasil) > maks_baris:
+            console.print(f"[dim]... dan {len(hasil) - maks_baris} skenario lain (lihat CSV)[/dim]")
+        
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        export_dir = os.path.join(base_dir, "exports")
+        os.makedirs(export_dir, exist_ok=True)
+        filename = os.path.join(export_dir, f"skenario_bertahan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([
+                "saldo", "tanggal_gajian", "gajian", "hemat", "hari_median", "hari_p10", "hari_p90",
+                f"peluang_{hari_target}_hari", "tanggal_habis_median"
+            ])
+            for skenario, h in hasil:
+                writer.writerow([
+                    skenario.saldo, skenario.tanggal_gajian, skenario.gajian, skenario.label_potongan(),
+                    h.persentil(50), h.persentil(10), h.persentil(90),
+                    round(h.peluang_bertahan(hari_target), 3), h.tanggal(50).isoformat()
+                ])
+        console.print(f"[green]✓ CSV disimpan: {filename}[/green]")
+    
     def run(self):
         """Antarmuka utama financial survival"""
         while True:
@@ -168,6 +295,7 @@ class FinancialSurvival:
             menu_items = [
                 ("1", "💀 Simulasi Bertahan"),
                 ("2", "📉 Estimasi Saldo Habis"),
+                ("3", "🧪 Bandingkan Banyak Skenario"),
                 ("0", "🔙 Kembali")
             ]
             
@@ -176,7 +304,7 @@ class FinancialSurvival:
             
             console.print(menu)
             
-            choice = Prompt.ask("Pilihan", choices=["0","1","2"], default="0")
+            choice = Prompt.ask("Pilihan", choices=["0","1","2","3"], default="0")
             
             if choice == "0":
                 break
@@ -184,6 +312,8 @@ class FinancialSurvival:
                 self.simulasi_bertahan()
             elif choice == "2":
                 self.estimasi_habis()
+            elif choice == "3":
+                self.bandingkan_skenario()
             
             if choice != "0":
                 console.print("[dim]Tekan Enter untuk melanjutkan...[/dim]")
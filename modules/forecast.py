@@ -0,0 +1,337 @@
+import random
+from bisect import bisect_left
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # simulasi tetap jalan dengan Python murni, hanya lebih sedikit jalur
+    np = None
+
+from modules.database import EXPENSE_DAILY_CATEGORY_SERIES_RANGE, EXPENSE_DAILY_SERIES_RANGE
+
+# Prakiraan pengeluaran harian dari ringkasan expense_daily_rollup:
+# level = rata-rata berbobot eksponensial (EWMA), dikali faktor hari dalam
+# minggu (Senin..Minggu). Tanggal saldo habis disimulasikan Monte Carlo:
+# tiap jalur mengambil ulang (bootstrap) hari-hari di riwayat yang sudah
+# disesuaikan ke level & pola mingguan saat ini.
+
+HARI_RIWAYAT = 90
+HALFLIFE = 14
+HORIZON = 365
+JALUR_NUMPY = 4000
+JALUR_PYTHON = 500
+# Simulasi banyak skenario sekaligus: jalur per skenario lebih sedikit
+JALUR_SKENARIO_NUMPY = 1000
+JALUR_SKENARIO_PYTHON = 100
+NAMA_HARI = ("Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu")
+
+
+def _rentang_riwayat(hari: int, today: date) -> Tuple[str, str]:
+    return (today - timedelta(days=hari)).isoformat(), (today + timedelta(days=1)).isoformat()
+
+
+def _panjang_deret(start: date, today: date) -> int:
+    """Deret s/d kemarin; hari ini (belum selesai) hanya kalau belum ada data sebelumnya"""
+    end = today - timedelta(days=1) if start < today else today
+    return (end - start).days + 1
+
+
+def muat_deret_harian(db, hari: int = HARI_RIWAYAT,
+                      today: Optional[date] = None) -> Tuple[Optional[date], List[float]]:
+    """Total pengeluaran per hari, dari hari pertama ada data s/d kemarin.
+
+    Hari tanpa pengeluaran diisi 0.
+    Returns: (tanggal awal, list total) atau (None, []) kalau kosong.
+    """
+    today = today or date.today()
+    rows = db.fetch_all(EXPENSE_DAILY_SERIES_RANGE, _rentang_riwayat(hari, today), raw=True)
+    if not rows:
+        return None, []
+
+    start = date.fromisoformat(rows[0]['tanggal'])
+    values = [0.0] * _panjang_deret(start, today)
+    for row in rows:
+        i = (date.fromisoformat(row['tanggal']) - start).days
+        if i < len(values):
+            values[i] = row['total']
+    return start, values
+
+
+def muat_deret_kategori(db, hari: int = HARI_RIWAYAT,
+                        today: Optional[date] = None) -> Tuple[Optional[date], Dict[str, List[float]]]:
+    """Seperti muat_deret_harian, tapi satu deret per kategori (panjang sama)"""
+    today = today or date.today()
+    rows = db.fetch_all(EXPENSE_DAILY_CATEGORY_SERIES_RANGE, _rentang_riwayat(hari, today), raw=True)
+    if not rows:
+        return None, {}
+
+    start = date.fromisoformat(rows[0]['tanggal'])
+    n = _panjang_deret(start, today)
+    per_kategori: Dict[str, List[float]] = {}
+    for row in rows:
+        i = (date.fromisoformat(row['tanggal']) - start).days
+        if i < n:
+            per_kategori.setdefault(row['kategori'], [0.0] * n)[i] = row['total']
+    return start, per_kategori
+
+
+def _ewma(values: Sequence[float], halflife: float) -> float:
+    """Rata-rata berbobot, bobot hari ke-k dari belakang = 0.5 ** (k / halflife)"""
+    decay = 0.5 ** (1 / halflife)
+    bobot = 1.0
+    total = jumlah_bobot = 0.0
+    for v in reversed(values):
+        total += bobot * v
+        jumlah_bobot += bobot
+        bobot *= decay
+    return total / jumlah_bobot if jumlah_bobot else 0.0
+
+
+def _faktor_hari(values: Sequence[float], start: date) -> Tuple[float, ...]:
+    """Faktor pengali per hari dalam minggu (rata-rata faktor = 1).
+
+    Riwayat yang baru beberapa minggu ditarik ke 1 supaya satu hari
+    belanja besar tidak langsung jadi pola.
+    """
+    rata_rata = sum(values) / len(values) if values else 0
+    if rata_rata <= 0:
+        return (1.0,) * 7
+
+    total = [0.0] * 7
+    jumlah = [0] * 7
+    w0 = start.weekday()
+    for i, v in enumerate(values):
+        total[(w0 + i) % 7] += v
+        jumlah[(w0 + i) % 7] += 1
+
+    faktor = []
+    for t, k in zip(total, jumlah):
+        if not k:
+            faktor.append(1.0)
+            continue
+        bobot = k / (k + 2)
+        faktor.append(bobot * (t / k / rata_rata) + (1 - bobot))
+    skala = sum(faktor) / 7
+    return tuple(f / skala for f in faktor)
+
+
+@dataclass
+class HasilSimulasi:
+    """Sebaran jumlah hari sampai saldo habis di semua jalur simulasi"""
+    mulai: date
+    horizon: int
+    hari_habis: List[int]  # terurut; == horizon artinya tidak habis dalam horizon
+
+    def persentil(self, p: float) -> int:
+        i = round(p / 100 * (len(self.hari_habis) - 1))
+        return self.hari_habis[i]
+
+    def tanggal(self, p: float) -> date:
+        return self.mulai + timedelta(days=self.persentil(p))
+
+    def peluang_bertahan(self, hari: int) -> float:
+        """Proporsi jalur yang saldonya cukup untuk `hari` hari penuh"""
+        return 1 - bisect_left(self.hari_habis, hari) / len(self.hari_habis)
+
+
+class PrakiraanPengeluaran:
+    def __init__(self, values: Sequence[float], start: date, halflife: float = HALFLIFE):
+        self.start = start
+        self.hari_data = len(values)
+        self.rata_rata = sum(values) / len(values) if values else 0.0
+        self.ewma = _ewma(values, halflife)
+        self.musiman = _faktor_hari(values, start)
+
+        # Bahan bootstrap: riwayat tanpa pola mingguan, diskalakan ke level EWMA
+        w0 = start.weekday()
+        polos = [v / self.musiman[(w0 + i) % 7] for i, v in enumerate(values)]
+        rata_polos = sum(polos) / len(polos) if polos else 0
+        skala = self.ewma / rata_polos if rata_polos else 0
+        self._sampel = [v * skala for v in polos] or [0.0]
+
+    def proyeksi(self, mulai: date, hari: int) -> List[float]:
+        """Perkiraan pengeluaran per hari untuk `hari` hari mulai tanggal `mulai`"""
+        w0 = mulai.weekday()
+        return [self.ewma * self.musiman[(w0 + i) % 7] for i in range(hari)]
+
+    def simulasi(self, saldo: float, mulai: Optional[date] = None, jalur: Optional[int] = None,
+                 horizon: int = HORIZON, seed: Optional[int] = None) -> HasilSimulasi:
+        """Monte Carlo: berapa hari saldo cukup, untuk tiap jalur pengeluaran acak"""
+        mulai = mulai or date.today()
+        if np is not None:
+            hari = self._simulasi_numpy(saldo, mulai, jalur or JALUR_NUMPY, horizon, seed)
+        else:
+            hari = self._simulasi_python(saldo, mulai, jalur or JALUR_PYTHON, horizon, seed)
+        hari.sort()
+        return HasilSimulasi(mulai, horizon, hari)
+
+    def _simulasi_numpy(self, saldo, mulai, jalur, horizon, seed) -> List[int]:
+        rng = np.random.default_rng(seed)
+        sampel = np.asarray(self._sampel)
+        musiman = np.asarray(self.musiman)[(mulai.weekday() + np.arange(horizon)) % 7]
+        pengeluaran = sampel[rng.integers(0, len(sampel), size=(jalur, horizon))]
+        pengeluaran *= musiman
+        kumulatif = np.cumsum(pengeluaran, axis=1)
+        # Kumulatif naik terus, jadi jumlah hari yang masih < saldo = hari bertahan
+        return (kumulatif < saldo).sum(axis=1).tolist()
+
+    def _simulasi_python(self, saldo, mulai, jalur, horizon, seed) -> List[int]:
+        rng = random.Random(seed)
+        sampel = self._sampel
+        n = len(sampel)
+        w0 = mulai.weekday()
+        musiman = [self.musiman[(w0 + i) % 7] for i in range(horizon)]
+        hasil = []
+        for _ in range(jalur):
+            total = 0.0
+            hari = horizon
+            for i in range(horizon):
+                total += sampel[int(rng.random() * n)] * musiman[i]
+                if total >= saldo:
+                    hari = i
+                    break
+            hasil.append(hari)
+        return hasil
+
+
+def muat_prakiraan(db, hari: int = HARI_RIWAYAT,
+                   today: Optional[date] = None) -> Optional[PrakiraanPengeluaran]:
+    """Model prakiraan dari riwayat `hari` hari terakhir; None kalau belum ada data"""
+    start, values = muat_deret_harian(db, hari, today)
+    if start is None or sum(values) <= 0:
+        return None
+    return PrakiraanPengeluaran(values, start)
+
+
+@dataclass(frozen=True)
+class Skenario:
+    saldo: float
+    tanggal_gajian: int = 0  # tanggal pemasukan tiap bulan, 0 = tanpa pemasukan
+    gajian: float = 0.0
+    potongan: Tuple[Tuple[str, float], ...] = ()  # (kategori, persen dikurangi)
+
+    def label_gajian(self) -> str:
+        return f"tgl {self.tanggal_gajian}" if self.tanggal_gajian else "-"
+
+    def label_potongan(self) -> str:
+        return ", ".join(f"{k} -{p:g}%" for k, p in self.potongan) or "-"
+
+
+def _pemasukan_kumulatif(tanggal_gajian: int, gajian: float, mulai: date, horizon: int) -> List[float]:
+    """Total pemasukan yang sudah diterima s/d tiap hari (mulai besok).
+
+    Tanggal gajian melewati akhir bulan (mis. 31) jatuh di hari terakhir bulan itu.
+    """
+    total = 0.0
+    hasil = []
+    for i in range(horizon):
+        d = mulai + timedelta(days=i)
+        if i and tanggal_gajian:
+            akhir = monthrange(d.year, d.month)[1]
+            if d.day == min(tanggal_gajian, akhir):
+                total += gajian
+        hasil.append(total)
+    return hasil
+
+
+def simulasi_skenario(start: date, per_kategori: Dict[str, List[float]],
+                      saldo_list: Sequence[float],
+                      gajian_list: Sequence[Tuple[int, float]],
+                      potongan_list: Sequence[Dict[str, float]],
+                      mulai: Optional[date] = None, jalur: Optional[int] = None,
+                      horizon: int = HORIZON, seed: Optional[int] = None) -> List[Tuple[Skenario, HasilSimulasi]]:
+    """Simulasikan semua kombinasi saldo x gajian x potongan kategori sekaligus.
+
+    Riwayat per kategori dibaca sekali; tiap potongan jadi satu model
+    prakiraan, dan semua skenario memakai jalur acak (hari bootstrap) yang
+    sama supaya perbandingan antar skenario tidak tertutup noise.
+    Returns: [(skenario, hasil)] berurutan saldo -> gajian -> potongan;
+    list kosong kalau salah satu daftar (atau riwayat kategori) kosong.
+    """
+    if not per_kategori or not saldo_list or not gajian_list or not potongan_list:
+        return []
+    mulai = mulai or date.today()
+    kategori = sorted(per_kategori)
+    n = len(per_kategori[kategori[0]])
+    models = []
+    for potongan in potongan_list:
+        faktor = [1 - potongan.get(k, 0) / 100 for k in kategori]
+        total = [sum(per_kategori[k][d] * f for k, f in zip(kategori, faktor)) for d in range(n)]
+        models.append(PrakiraanPengeluaran(total, start))
+    pemasukan = [_pemasukan_kumulatif(t, g, mulai, horizon) for t, g in gajian_list]
+
+    if np is not None:
+        hari = _skenario_numpy(models, pemasukan, saldo_list, mulai, jalur or JALUR_SKENARIO_NUMPY, horizon, seed)
+    else:
+        hari = _skenario_python(models, pemasukan, saldo_list, mulai, jalur or JALUR_SKENARIO_PYTHON, horizon, seed)
+
+    hasil = []
+    for b, saldo in enumerate(saldo_list):
+        for g, (tanggal_gajian, gajian) in enumerate(gajian_list):
+            for c, potongan in enumerate(potongan_list):
+                skenario = Skenario(saldo, tanggal_gajian, gajian if tanggal_gajian else 0.0,
+                                    tuple(potongan.items()))
+                hasil.append((skenario, HasilSimulasi(mulai, horizon, hari[c, g, b])))
+    return hasil
+
+
+def _skenario_numpy(models, pemasukan, saldo_list, mulai, jalur, horizon, seed):
+    rng = np.random.default_rng(seed)
+    n = len(models[0]._sampel)
+    hari_ke = rng.integers(0, n, size=(jalur, horizon))
+    minggu = (mulai.weekday() + np.arange(horizon)) % 7
+    saldo = np.asarray(saldo_list, dtype=float)[None, :, None]  # (1, B, 1)
+    masuk_list = [np.asarray(masuk) for masuk in pemasukan]
+    hasil = {}
+    # Satu model (potongan) per putaran, jadi memori tetap sebesar P x H
+    # (dan P x B x H untuk perbandingan saldo), berapa pun jumlah skenario
+    for c, model in enumerate(models):
+        pengeluaran = np.take(np.asarray(model._sampel), hari_ke)  # (P, H)
+        pengeluaran *= np.asarray(model.musiman)[minggu]
+        kumulatif = np.cumsum(pengeluaran, axis=1)
+        for g, masuk in enumerate(masuk_list):
+            bersih = kumulatif - masuk
+            if masuk[-1]:
+                # Dengan pemasukan, saldo bisa naik lagi; yang dihitung tetap
+                # hari pertama saldo habis
+                np.maximum.accumulate(bersih, axis=1, out=bersih)
+            # Tiap baris naik terus, jadi jumlah hari < saldo = hari habis
+            hari = (bersih[:, None, :] < saldo).sum(axis=2)  # (P, B)
+            hari.sort(axis=0)
+            for b in range(len(saldo_list)):
+                hasil[c, g, b] = hari[:, b].tolist()
+    return hasil
+
+
+def _skenario_python(models, pemasukan, saldo_list, mulai, jalur, horizon, seed):
+    rng = random.Random(seed)
+    n = len(models[0]._sampel)
+    w0 = mulai.weekday()
+    musiman = [[m.musiman[(w0 + i) % 7] for i in range(horizon)] for m in models]
+    hasil = {(c, g, b): [] for c in range(len(models))
+             for g in range(len(pemasukan)) for b in range(len(saldo_list))}
+
+    for _ in range(jalur):
+        hari_ke = [int(rng.random() * n) for _ in range(horizon)]
+        for c, m in enumerate(models):
+            sampel, mus = m._sampel, musiman[c]
+            kumulatif = []
+            total = 0.0
+            for i in range(horizon):
+                total += sampel[hari_ke[i]] * mus[i]
+                kumulatif.append(total)
+            for g, masuk in enumerate(pemasukan):
+                puncak = []
+                tertinggi = float("-inf")
+                for k, p in zip(kumulatif, masuk):
+                    tertinggi = max(tertinggi, k - p)
+                    puncak.append(tertinggi)
+                for b, saldo in enumerate(saldo_list):
+                    hasil[c, g, b].append(bisect_left(puncak, saldo))
+
+    for hari in hasil.values():
+        hari.sort()
+    return hasil
@@ -225,8 +225,9 @@ class FutureYou:
             return
         
         if Confirm.ask(f"Yakin hapus target ID {goal_id}?"):
-            self.db.execute_query("DELETE FROM goal_reflections WHERE goal_id = ?", (goal_id,))
-            self.db.execute_query("DELETE FROM future_goals WHERE id = ?", (goal_id,))
+            with self.db.transaction():
+                self.db.execute_query("DELETE FROM goal_reflections WHERE goal_id = ?", (goal_id,))
+                self.db.execute_query("DELETE FROM future_goals WHERE id = ?", (goal_id,))
             console.print("[green]✓ Target berhasil dihapus![/green]")
     
     def run(self):
@@ -0,0 +1,141 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from modules.database import HABITS_WITH_STREAKS
+from modules.habit_history import HabitHistory
+from modules.habit_streaks import streak_aktif
+
+# Satu instance dipakai bersama oleh HabitTracker, LifeDashboard dan
+# ProductivityCoach. Daftar kebiasaan + streak dibaca sekali per hari
+# (dari habit_streaks), riwayat harian dari bitmask HabitHistory.
+# Cache dibuang otomatis kalau versi data tabel kebiasaan berubah
+# (Database.data_version), termasuk tulisan dari proses lain.
+
+HABIT_TABLES = ("habits", "habit_logs", "habit_streaks")
+
+
+class HabitAnalytics:
+    def __init__(self, db):
+        self.db = db
+        self.history = HabitHistory(db)
+        self._lock = threading.RLock()
+        self._day: Optional[str] = None
+        self._habits: Optional[List[Dict]] = None
+        self._week_rate: Optional[float] = None
+        self._version = None
+
+    def _sync(self):
+        """Buang cache kalau ada tulisan ke tabel kebiasaan sejak terakhir dicek"""
+        version = self.db.data_version(HABIT_TABLES)
+        if version != self._version:
+            self._habits = None
+            self._week_rate = None
+            self.history.invalidate()
+            self._version = version
+
+    def invalidate(self):
+        """Buang semua cache setelah kebiasaan/log berubah"""
+        with self._lock:
+            self._habits = None
+            self._week_rate = None
+            self.history.invalidate()
+
+    def data_version(self):
+        """Versi data tabel kebiasaan saat ini (untuk record_checkins)"""
+        return self.db.data_version(HABIT_TABLES)
+
+    def record_checkins(self, pairs, sebelum, sesudah):
+        """Perbarui cache setelah log (habit_id, tanggal) baru disimpan.
+
+        sebelum/sesudah = data_version() tepat sebelum dan sesudah tulisan
+        itu, diambil di dalam transaksinya. Bitmask hanya ditandai kalau
+        cache memang mewakili data versi `sebelum`; kalau ada tulisan lain
+        yang belum terbaca, cache riwayat dibuang dan dibaca ulang.
+        """
+        with self._lock:
+            self._habits = None
+            self._week_rate = None
+            if self._version == sebelum:
+                for habit_id, tanggal in pairs:
+                    self.history.mark(habit_id, tanggal)
+                self._version = sesudah
+            else:
+                self.history.invalidate()
+
+    def _today(self) -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def habits(self) -> List[Dict]:
+        """Semua kebiasaan + current_streak, longest_streak, last_date (memo per hari)"""
+        today = self._today()
+        with self._lock:
+            self._sync()
+            if self._habits is None or self._day != today:
+                self._habits = self.db.fetch_all(HABITS_WITH_STREAKS)
+                self._week_rate = None
+                self._day = today
+            return self._habits
+
+    def streaks(self) -> Dict[int, int]:
+        """Streak aktif per kebiasaan: {habit_id: hari}"""
+        today = self._today()
+        return {
+            h['id']: streak_aktif(h['current_streak'], h['last_date'], today)
+            for h in self.habits()
+        }
+
+    def done_today(self) -> Set[int]:
+        """ID kebiasaan yang sudah dicheckin hari ini"""
+        today = self._today()
+        return {h['id'] for h in self.habits() if h['last_date'] == today}
+
+    def days(self, habit_id: int, start: date, end: date) -> List[bool]:
+        """Status checkin per hari untuk rentang [start, end]"""
+        with self._lock:
+            self._sync()
+            return self.history.days(habit_id, start, end)
+
+    def last_7_days(self, habit_id: int) -> List[bool]:
+        today = datetime.now().date()
+        return self.days(habit_id, today - timedelta(days=6), today)
+
+    def daily_totals(self, habit_ids: List[int], year: int) -> List[int]:
+        """Jumlah kebiasaan yang dicheckin per hari dalam setahun"""
+        with self._lock:
+            self._sync()
+            return self.history.daily_totals(habit_ids, year)
+
+    def weekly_rate(self, habit_ids: Optional[List[int]] = None, week_start: Optional[date] = None) -> float:
+        """Persentase checkin minggu ini (Senin s/d hari ini) untuk kebiasaan terpilih"""
+        if habit_ids is None and week_start is None:
+            # Versi default (semua kebiasaan, minggu ini) di-memo per hari
+            self.habits()
+            with self._lock:
+                if self._week_rate is None:
+                    self._week_rate = self._hitung_weekly_rate(None, None)
+                return self._week_rate
+        return self._hitung_weekly_rate(habit_ids, week_start)
+
+    def _hitung_weekly_rate(self, habit_ids: Optional[List[int]], week_start: Optional[date]) -> float:
+        today = datetime.now().date()
+        if week_start is None:
+            week_start = today - timedelta(days=today.weekday())
+        week_end = min(week_start + timedelta(days=6), today)
+        if habit_ids is None:
+            habit_ids = [h['id'] for h in self.habits()]
+        if not habit_ids or week_end < week_start:
+            return 0.0
+        
+        if self.history.is_loaded(week_start.year) and self.history.is_loaded(week_end.year):
+            done = sum(self.history.count(hid, week_start, week_end) for hid in habit_ids)
+        else:
+            # Belum ada bitmask di cache: satu COUNT lewat index tanggal lebih
+            # murah daripada memuat riwayat setahun hanya untuk 7 hari
+            placeholders = ",".join("?" * len(habit_ids))
+            done = self.db.fetch_one(
+                f"SELECT COUNT(*) AS n FROM habit_logs "
+                f"WHERE tanggal >= ? AND tanggal <= ? AND habit_id IN ({placeholders})",
+                (week_start.isoformat(), week_end.isoformat(), *habit_ids)
+            )['n']
+        return done / (len(habit_ids) * ((week_end - week_start).days + 1)) * 100
@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+# Riwayat checkin disimpan sebagai bitmask int per (kebiasaan, tahun):
+# bit ke-n = hari ke-n dalam tahun (1 Januari = bit 0). Satu tahun penuh
+# cukup satu query, setelah itu bar mingguan, heatmap dan persentase
+# dihitung dengan operasi bit di memori.
+
+
+def _bit(d: date) -> int:
+    return d.timetuple().tm_yday - 1
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+class HabitHistory:
+    def __init__(self, db):
+        self.db = db
+        self._years: Dict[int, Dict[int, int]] = {}
+
+    def invalidate(self, year: Optional[int] = None):
+        """Buang cache (semua tahun atau satu tahun) setelah ada penulisan log"""
+        if year is None:
+            self._years.clear()
+        else:
+            self._years.pop(year, None)
+
+    def is_loaded(self, year: int) -> bool:
+        return year in self._years
+
+    def mark(self, habit_id: int, tanggal: str):
+        """Set bit untuk log baru kalau tahunnya sudah ada di cache"""
+        d = date.fromisoformat(tanggal[:10])
+        masks = self._years.get(d.year)
+        if masks is not None:
+            masks[habit_id] = masks.get(habit_id, 0) | (1 << _bit(d))
+
+    def _load_year(self, year: int) -> Dict[int, int]:
+        masks = self._years.get(year)
+        if masks is not None:
+            return masks
+
+        masks = {}
+        rows = self.db.iter_rows(
+            "SELECT habit_id, tanggal FROM habit_logs WHERE tanggal >= ? AND tanggal < ?",
+            (f"{year}-01-01", f"{year + 1}-01-01"),
+            batch_size=2000
+        )
+        jan1 = date(year, 1, 1).toordinal()
+        # Tanggal yang sama muncul sekali per kebiasaan; parse cukup sekali
+        bits = {}
+        for habit_id, tanggal in rows:
+            bit = bits.get(tanggal)
+            if bit is None:
+                bit = bits[tanggal] = 1 << (date.fromisoformat(tanggal[:10]).toordinal() - jan1)
+            masks[habit_id] = masks.get(habit_id, 0) | bit
+
+        self._years[year] = masks
+        return masks
+
+    def mask(self, habit_id: int, year: int) -> int:
+        """Bitmask satu tahun untuk satu kebiasaan"""
+        return self._load_year(year).get(habit_id, 0)
+
+    def bits(self, habit_id: int, start: date, end: date) -> int:
+        """Bitmask rentang [start, end]; bit 0 = start (boleh lintas tahun)"""
+        result = 0
+        shift = 0
+        cursor = start
+        while cursor <= end:
+            year_end = min(end, date(cursor.year, 12, 31))
+            width = (year_end - cursor).days + 1
+            chunk = self.mask(habit_id, cursor.year) >> _bit(cursor)
+            result |= (chunk & ((1 << width) - 1)) << shift
+            shift += width
+            cursor = year_end + timedelta(days=1)
+        return result
+
+    def days(self, habit_id: int, start: date, end: date) -> List[bool]:
+        """Status per hari untuk rentang [start, end]"""
+        b = self.bits(habit_id, start, end)
+        return [bool(b >> i & 1) for i in range((end - start).days + 1)]
+
+    def count(self, habit_id: int, start: date, end: date) -> int:
+        """Jumlah hari checkin dalam rentang [start, end]"""
+        return _popcount(self.bits(habit_id, start, end))
+
+    def completion_rate(self, habit_id: int, start: date, end: date) -> float:
+        """Persentase hari checkin dalam rentang [start, end]"""
+        total = (end - start).days + 1
+        if total <= 0:
+            return 0.0
+        return self.count(habit_id, start, end) / total * 100
+
+    def daily_totals(self, habit_ids: List[int], year: int) -> List[int]:
+        """Jumlah kebiasaan yang dicheckin per hari dalam setahun"""
+        masks = self._load_year(year)
+        n_days = date(year, 12, 31).timetuple().tm_yday
+        totals = [0] * n_days
+        for habit_id in habit_ids:
+            m = masks.get(habit_id, 0)
+            while m:
+                low = m & -m
+                totals[low.bit_length() - 1] += 1
+                m ^= low
+        return totals
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+# Ringkasan streak per kebiasaan disimpan di tabel habit_streaks:
+#   current_streak = panjang rangkaian hari berurutan yang berakhir di last_date
+#   longest_streak = rangkaian terpanjang sepanjang sejarah
+#   last_date      = tanggal log terakhir
+# Nilainya tidak bergantung pada "hari ini"; streak aktif dihitung saat
+# tampil dengan streak_aktif().
+
+
+def _ordinal(tanggal: str) -> int:
+    return datetime.strptime(tanggal[:10], "%Y-%m-%d").toordinal()
+
+
+def hitung_rangkaian(rows: Iterable) -> Dict[int, Tuple[int, int, str]]:
+    """Hitung ringkasan streak dari baris (habit_id, tanggal) yang sudah urut.
+    
+    Satu kali lewat. Returns: {habit_id: (current_streak, longest_streak, last_date)}
+    """
+    ordinals = {}
+    result = {}
+    prev_habit = prev_day = prev_tanggal = None
+    run = longest = 0
+    
+    for habit_id, tanggal in rows:
+        day = ordinals.get(tanggal)
+        if day is None:
+            day = ordinals[tanggal] = _ordinal(tanggal)
+        
+        if habit_id != prev_habit:
+            if prev_habit is not None:
+                result[prev_habit] = (run, longest, prev_tanggal)
+            prev_habit = habit_id
+            run = longest = 1
+        elif day == prev_day + 1:
+            run += 1
+            longest = max(longest, run)
+        elif day != prev_day:
+            run = 1
+        prev_day, prev_tanggal = day, tanggal
+    
+    if prev_habit is not None:
+        result[prev_habit] = (run, longest, prev_tanggal)
+    return result
+
+
+def migrate_habit_streaks(db):
+    """Migrasi 3: buat tabel habit_streaks dan isi dari habit_logs"""
+    db.execute_query('''
+        CREATE TABLE IF NOT EXISTS habit_streaks (
+            habit_id INTEGER PRIMARY KEY,
+            current_streak INTEGER NOT NULL DEFAULT 0,
+            longest_streak INTEGER NOT NULL DEFAULT 0,
+            last_date DATE,
+            FOREIGN KEY (habit_id) REFERENCES habits(id)
+        )
+    ''')
+    rebuild_habit_streaks(db)
+
+
+def rebuild_habit_streaks(db, habit_id: Optional[int] = None) -> int:
+    """Hitung ulang tabel habit_streaks dari habit_logs (semua atau satu kebiasaan)"""
+    with db.transaction():
+        if habit_id is None:
+            db.execute_query("DELETE FROM habit_streaks")
+            rows = db.iter_rows(
+                "SELECT habit_id, tanggal FROM habit_logs ORDER BY habit_id, tanggal",
+                batch_size=2000
+            )
+        else:
+            db.execute_query("DELETE FROM habit_streaks WHERE habit_id = ?", (habit_id,))
+            rows = db.iter_rows(
+                "SELECT habit_id, tanggal FROM habit_logs WHERE habit_id = ? ORDER BY tanggal",
+                (habit_id,), batch_size=2000
+            )
+        
+        summary = hitung_rangkaian(rows)
+        if summary:
+            db.execute_many(
+                "INSERT INTO habit_streaks (habit_id, current_streak, longest_streak, last_date) "
+                "VALUES (?, ?, ?, ?)",
+                [(hid, cur, longest, last) for hid, (cur, longest, last) in summary.items()]
+            )
+    return len(summary)
+
+
+def catat_checkin(db, habit_id: int, tanggal: str):
+    """Perbarui habit_streaks untuk satu log baru (panggil dalam transaksi yang sama)"""
+    row = db.fetch_one(
+        "SELECT current_streak, longest_streak, last_date FROM habit_streaks WHERE habit_id = ?",
+        (habit_id,)
+    )
+    
+    if row is None or row['last_date'] is None:
+        rebuild_habit_streaks(db, habit_id)
+        return
+    
+    last_date = row['last_date']
+    if tanggal == last_date:
+        return
+    
+    if tanggal < last_date:
+        # Isi mundur di tengah sejarah: bisa menyambung dua rangkaian,
+        # jadi hitung ulang kebiasaan ini saja
+        rebuild_habit_streaks(db, habit_id)
+        return
+    
+    if _ordinal(tanggal) == _ordinal(last_date) + 1:
+        current = row['current_streak'] + 1
+    else:
+        current = 1
+    
+    db.execute_query(
+        "UPDATE habit_streaks SET current_streak = ?, longest_streak = ?, last_date = ? "
+        "WHERE habit_id = ?",
+        (current, max(row['longest_streak'], current), tanggal, habit_id)
+    )
+
+
+def streak_aktif(current_streak: Optional[int], last_date: Optional[str], today: str) -> int:
+    """Streak yang masih berjalan: hanya dihitung kalau log terakhir = hari ini"""
+    if not current_streak or last_date != today:
+        return 0
+    return current_streak
@@ -1,15 +1,32 @@
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from rich.text import Text
 from rich.prompt import Prompt, Confirm
 
+from modules.habit_analytics import HabitAnalytics
+from modules.habit_streaks import catat_checkin, rebuild_habit_streaks
+
 console = Console()
 
+NAMA_BULAN = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agu", "Sep", "Okt", "Nov", "Des"]
+# Warna heatmap dari 0 checkin sampai semua kebiasaan selesai
+HEATMAP_LEVELS = ["grey30", "dark_green", "green4", "green3", "bright_green"]
+
+def rentang_tanggal(dari: str, sampai: str) -> list:
+    """Daftar tanggal YYYY-MM-DD dari 'dari' sampai 'sampai' (inklusif)"""
+    start = datetime.strptime(dari, "%Y-%m-%d").date()
+    end = datetime.strptime(sampai, "%Y-%m-%d").date()
+    if end < start:
+        raise ValueError("Tanggal akhir lebih awal dari tanggal mulai")
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
 class HabitTracker:
-    def __init__(self, db):
+    def __init__(self, db, analytics=None):
         self.db = db
+        self.analytics = analytics or HabitAnalytics(db)
     
     def tambah_kebiasaan(self):
         """Tambah kebiasaan baru"""
@@ -22,45 +39,140 @@ class HabitTracker:
             "INSERT INTO habits (nama, emoji) VALUES (?, ?)",
             (nama, emoji)
         )
+        self.analytics.invalidate()
         console.print(f"[green]✓ Kebiasaan '{emoji} {nama}' berhasil ditambahkan![/green]")
     
     def checkin_hari_ini(self):
         """Checkin kebiasaan hari ini"""
-        habits = self.db.fetch_all("SELECT * FROM habits ORDER BY id")
+        habits = self.analytics.habits()
         
         if not habits:
             console.print("[yellow]Belum ada kebiasaan. Tambahkan dulu![/yellow]")
             return
         
         today = datetime.now().strftime("%Y-%m-%d")
+        done_today = self.analytics.done_today()
         
         console.print(f"[bold cyan]📋 Checkin Hari Ini ({today})[/bold cyan]\n")
         
+        # Dikumpulkan dulu, lalu disimpan sekaligus dalam satu commit
+        to_insert = []
         for habit in habits:
-            # Cek apakah sudah checkin hari ini
-            existing = self.db.fetch_one(
-                "SELECT * FROM habit_logs WHERE habit_id = ? AND tanggal = ?",
-                (habit['id'], today)
-            )
-            
-            if existing:
+            if habit['id'] in done_today:
                 console.print(f"  {habit['emoji']} {habit['nama']} — [green]✅ Sudah![/green]")
             else:
                 done = Confirm.ask(f"  {habit['emoji']} {habit['nama']} — sudah dilakukan?", default=False)
                 if done:
-                    self.db.execute_query(
-                        "INSERT INTO habit_logs (habit_id, tanggal) VALUES (?, ?)",
-                        (habit['id'], today)
-                    )
+                    to_insert.append((habit['id'], today))
                     console.print(f"    [green]✓ Tercatat![/green]")
                 else:
                     console.print(f"    [dim]Belum — semangat ya![/dim]")
         
+        if to_insert:
+            self.checkin_bulk([habit_id for habit_id, _ in to_insert], [today])
+        
         console.print("\n[bold green]✓ Checkin selesai![/bold green]")
     
+    def checkin_bulk(self, habit_ids, dates):
+        """Checkin banyak kebiasaan x banyak tanggal sekaligus (juga untuk isi mundur).
+        
+        Returns: (jumlah baru, jumlah yang sudah ada)
+        Raises: ValueError kalau ada ID kebiasaan tidak dikenal atau tanggal di masa depan
+        """
+        habit_ids = sorted(set(habit_ids))
+        dates = sorted(set(dates))
+        if not habit_ids or not dates:
+            return 0, 0
+        
+        today = datetime.now().strftime("%Y-%m-%d")
+        if dates[-1] > today:
+            raise ValueError(f"Tidak bisa checkin untuk tanggal di masa depan ({dates[-1]})")
+        
+        # Satu query: ID yang valid + log yang sudah ada di rentang tanggal
+        placeholders = ",".join("?" * len(habit_ids))
+        rows = self.db.fetch_all(f'''
+            SELECT h.id AS habit_id, l.tanggal
+            FROM habits h
+            LEFT JOIN habit_logs l
+                ON l.habit_id = h.id AND l.tanggal >= ? AND l.tanggal <= ?
+            WHERE h.id IN ({placeholders})
+        ''', (dates[0], dates[-1], *habit_ids), raw=True)
+        
+        known = {r['habit_id'] for r in rows}
+        unknown = [hid for hid in habit_ids if hid not in known]
+        if unknown:
+            raise ValueError(f"ID kebiasaan tidak ditemukan: {', '.join(map(str, unknown))}")
+        
+        existing = {(r['habit_id'], r['tanggal']) for r in rows if r['tanggal']}
+        to_insert = [(hid, d) for hid in habit_ids for d in dates if (hid, d) not in existing]
+        
+        if to_insert:
+            # Versi diambil di dalam transaksi (lock tulis dipegang), jadi
+            # selisihnya hanya tulisan ini
+            with self.db.transaction():
+                sebelum = self.analytics.data_version()
+                self.db.execute_many(
+                    "INSERT OR IGNORE INTO habit_logs (habit_id, tanggal) VALUES (?, ?)",
+                    to_insert
+                )
+                if len(dates) == 1:
+                    for habit_id, tanggal in to_insert:
+                        catat_checkin(self.db, habit_id, tanggal)
+                else:
+                    # Isi mundur banyak hari: hitung ulang sekali per kebiasaan
+                    for habit_id in {hid for hid, _ in to_insert}:
+                        rebuild_habit_streaks(self.db, habit_id)
+                sesudah = self.analytics.data_version()
+            self.analytics.record_checkins(to_insert, sebelum, sesudah)
+        
+        return len(to_insert), len(habit_ids) * len(dates) - len(to_insert)
+    
+    def checkin_massal(self):
+        """Checkin massal / isi mundur hari yang terlewat"""
+        habits = self.analytics.habits()
+        
+        if not habits:
+            console.print("[yellow]Belum ada kebiasaan. Tambahkan dulu![/yellow]")
+            return
+        
+        console.print("[bold cyan]🗂️ Checkin Massal / Isi Mundur[/bold cyan]\n")
+        
+        table = Table(title="📋 Daftar Kebiasaan")
+        table.add_column("ID", style="cyan")
+        table.add_column("Kebiasaan", style="green")
+        for h in habits:
+            table.add_row(str(h['id']), f"{h['emoji']} {h['nama']}")
+        console.print(table)
+        
+        today = datetime.now().strftime("%Y-%m-%d")
+        pilihan = Prompt.ask("[yellow]ID kebiasaan (pisahkan koma, kosongkan = semua)[/yellow]", default="")
+        dari = Prompt.ask("[yellow]Dari tanggal (YYYY-MM-DD)[/yellow]", default=today)
+        sampai = Prompt.ask("[yellow]Sampai tanggal (YYYY-MM-DD)[/yellow]", default=dari)
+        
+        try:
+            if pilihan.strip():
+                habit_ids = [int(x) for x in pilihan.split(",") if x.strip()]
+            else:
+                habit_ids = [h['id'] for h in habits]
+            dates = rentang_tanggal(dari, sampai)
+        except ValueError as e:
+            console.print(f"[red]Input tidak valid: {e}[/red]")
+            return
+        
+        if not Confirm.ask(f"Checkin {len(habit_ids)} kebiasaan x {len(dates)} hari?"):
+            return
+        
+        try:
+            baru, sudah = self.checkin_bulk(habit_ids, dates)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        
+        console.print(f"[green]✓ {baru} checkin baru tercatat[/green] [dim]({sudah} sudah ada)[/dim]")
+    
     def lihat_streak(self):
         """Tampilkan streak untuk setiap kebiasaan"""
-        habits = self.db.fetch_all("SELECT * FROM habits ORDER BY id")
+        habits = self.analytics.habits()
         
         if not habits:
             console.print("[yellow]Belum ada kebiasaan[/yellow]")
@@ -68,8 +180,11 @@ class HabitTracker:
         
         console.print("[bold cyan]🔥 Streak Kebiasaan[/bold cyan]\n")
         
+        streaks = self.analytics.streaks()
+        
         for habit in habits:
-            streak = self._hitung_streak(habit['id'])
+            streak = streaks[habit['id']]
+            terpanjang = habit['longest_streak'] or 0
             
             # Tampilan streak
             if streak >= 30:
@@ -90,48 +205,17 @@ class HabitTracker:
             
             console.print(f"  {habit['emoji']} [bold]{habit['nama']}[/bold]")
             console.print(f"     Streak: {streak_display}")
+            console.print(f"     Terpanjang: {terpanjang} hari")
             console.print(f"     7 Hari: {week_bar}\n")
     
-    def _hitung_streak(self, habit_id):
-        """Hitung streak berturut-turut"""
-        today = datetime.now().date()
-        streak = 0
-        
-        current_date = today
-        while True:
-            log = self.db.fetch_one(
-                "SELECT * FROM habit_logs WHERE habit_id = ? AND tanggal = ?",
-                (habit_id, current_date.strftime("%Y-%m-%d"))
-            )
-            if log:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-        
-        return streak
-    
     def _get_week_bar(self, habit_id):
         """Tampilkan bar 7 hari terakhir"""
-        today = datetime.now().date()
-        bars = []
-        
-        for i in range(6, -1, -1):
-            date = today - timedelta(days=i)
-            log = self.db.fetch_one(
-                "SELECT * FROM habit_logs WHERE habit_id = ? AND tanggal = ?",
-                (habit_id, date.strftime("%Y-%m-%d"))
-            )
-            if log:
-                bars.append("[green]■[/green]")
-            else:
-                bars.append("[dim]□[/dim]")
-        
-        return " ".join(bars)
+        days = self.analytics.last_7_days(habit_id)
+        return " ".join("[green]■[/green]" if done else "[dim]□[/dim]" for done in days)
     
     def statistik_mingguan(self):
         """Statistik mingguan"""
-        habits = self.db.fetch_all("SELECT * FROM habits ORDER BY id")
+        habits = self.analytics.habits()
         
         if not habits:
             console.print("[yellow]Belum ada kebiasaan[/yellow]")
@@ -151,32 +235,27 @@ class HabitTracker:
         table.add_column("Min", style="green", justify="center", width=3)
         table.add_column("Total", style="yellow", justify="right")
         
+        week_end = week_start + timedelta(days=6)
         for habit in habits:
             row_data = [f"{habit['emoji']} {habit['nama']}"]
-            total_done = 0
+            days = self.analytics.days(habit['id'], week_start, week_end)
             
-            for day_offset in range(7):
-                date = week_start + timedelta(days=day_offset)
-                log = self.db.fetch_one(
-                    "SELECT * FROM habit_logs WHERE habit_id = ? AND tanggal = ?",
-                    (habit['id'], date.strftime("%Y-%m-%d"))
-                )
-                if log:
+            for day_offset, done in enumerate(days):
+                if done:
                     row_data.append("✅")
-                    total_done += 1
-                elif date <= today:
+                elif week_start + timedelta(days=day_offset) <= today:
                     row_data.append("❌")
                 else:
                     row_data.append("·")
             
-            row_data.append(f"{total_done}/7")
+            row_data.append(f"{sum(days)}/7")
             table.add_row(*row_data)
         
         console.print(table)
     
     def hapus_kebiasaan(self):
         """Hapus kebiasaan"""
-        habits = self.db.fetch_all("SELECT * FROM habits ORDER BY id")
+        habits = self.analytics.habits()
         
         if not habits:
             console.print("[yellow]Belum ada kebiasaan[/yellow]")
@@ -198,10 +277,104 @@ class HabitTracker:
             return
         
         if Confirm.ask(f"Yakin hapus kebiasaan ID {h_id}? (data log juga akan terhapus)"):
-            self.db.execute_query("DELETE FROM habit_logs WHERE habit_id = ?", (h_id,))
-            self.db.execute_query("DELETE FROM habits WHERE id = ?", (h_id,))
+            with self.db.transaction():
+                self.db.execute_query("DELETE FROM habit_logs WHERE habit_id = ?", (h_id,))
+                self.db.execute_query("DELETE FROM habit_streaks WHERE habit_id = ?", (h_id,))
+                self.db.execute_query("DELETE FROM habits WHERE id = ?", (h_id,))
+            self.analytics.invalidate()
             console.print("[green]✓ Kebiasaan berhasil dihapus![/green]")
     
+    def heatmap_tahunan(self):
+        """Heatmap setahun ala GitHub (satu kebiasaan atau gabungan semua)"""
+        habits = self.analytics.habits()
+        
+        if not habits:
+            console.print("[yellow]Belum ada kebiasaan[/yellow]")
+            return
+        
+        today = datetime.now().date()
+        pilihan = Prompt.ask("[yellow]ID kebiasaan (kosongkan = semua)[/yellow]", default="")
+        try:
+            year = int(Prompt.ask("[yellow]Tahun[/yellow]", default=str(today.year)))
+        except ValueError:
+            console.print("[red]Tahun harus angka![/red]")
+            return
+        if not 1 <= year <= today.year:
+            console.print(f"[red]Tahun harus antara 1 dan {today.year}![/red]")
+            return
+        
+        if pilihan:
+            habits = [h for h in habits if str(h['id']) == pilihan]
+            if not habits:
+                console.print("[red]Kebiasaan tidak ditemukan![/red]")
+                return
+            judul = f"{habits[0]['emoji']} {habits[0]['nama']}"
+        else:
+            judul = f"Semua Kebiasaan ({len(habits)})"
+        
+        habit_ids = [h['id'] for h in habits]
+        totals = self.analytics.daily_totals(habit_ids, year)
+        jan1 = date(year, 1, 1)
+        last_day = min(date(year, 12, 31), today) if year >= today.year else date(year, 12, 31)
+        
+        # Kolom = minggu (Senin-Minggu), baris = hari
+        grid_start = jan1 - timedelta(days=jan1.weekday())
+        n_weeks = (date(year, 12, 31) - grid_start).days // 7 + 1
+        
+        header = Text("    ")
+        bulan_terakhir = None
+        for w in range(n_weeks):
+            d = grid_start + timedelta(weeks=w, days=6)
+            if d.year == year and d.month != bulan_terakhir and len(header) <= w + 4:
+                bulan_terakhir = d.month
+                header.append(NAMA_BULAN[d.month - 1], style="dim")
+            elif len(header) <= w + 4:
+                header.append(" ")
+        
+        rows = [header]
+        max_level = len(HEATMAP_LEVELS) - 1
+        for weekday, label in enumerate(["Sen", "", "Rab", "", "Jum", "", "Min"]):
+            line = Text(f"{label:<4}", style="dim")
+            for w in range(n_weeks):
+                d = grid_start + timedelta(weeks=w, days=weekday)
+                if d.year != year or d > last_day:
+                    line.append(" ")
+                    continue
+                done = totals[(d - jan1).days]
+                level = 0 if not done else max(1, -(-done * max_level // len(habit_ids)))
+                line.append("■", style=HEATMAP_LEVELS[level])
+            rows.append(line)
+        
+        console.print(Panel(Text("\n").join(rows), title=f"🗓️ Heatmap {year} — {judul}", border_style="green"))
+        
+        # Persentase per bulan
+        table = Table(show_header=True, box=None)
+        row = []
+        for month in range(1, 13):
+            table.add_column(NAMA_BULAN[month - 1], justify="right")
+            start = date(year, month, 1)
+            end = min(date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1), last_day)
+            if start > end:
+                row.append("[dim]·[/dim]")
+                continue
+            done = sum(totals[(start - jan1).days:(end - jan1).days + 1])
+            rate = done / (((end - start).days + 1) * len(habit_ids)) * 100
+            row.append(f"{rate:.0f}%")
+        table.add_row(*row)
+        console.print(table)
+        
+        if last_day >= jan1:
+            total_days = (last_day - jan1).days + 1
+            rate = sum(totals[:total_days]) / (total_days * len(habit_ids)) * 100
+            console.print(f"\n  Tingkat penyelesaian {year}: [bold]{rate:.1f}%[/bold]")
+    
+    def hitung_ulang_streak(self):
+        """Bangun ulang ringkasan streak dari seluruh log (untuk perbaikan data)"""
+        console.print("[bold cyan]🔧 Hitung Ulang Streak[/bold cyan]")
+        jumlah = rebuild_habit_streaks(self.db)
+        self.analytics.invalidate()
+        console.print(f"[green]✓ Streak {jumlah} kebiasaan berhasil dihitung ulang![/green]")
+    
     def run(self):
         """Antarmuka utama habit tracker"""
         while True:
@@ -218,6 +391,9 @@ class HabitTracker:
                 ("3", "📊 Statistik Mingguan"),
                 ("4", "➕ Tambah Kebiasaan"),
                 ("5", "🗑️ Hapus Kebiasaan"),
+                ("6", "🗓️ Heatmap Tahunan"),
+                ("7", "🗂️ Checkin Massal / Isi Mundur"),
+                ("8", "🔧 Hitung Ulang Streak"),
                 ("0", "🔙 Kembali")
             ]
             
@@ -226,7 +402,7 @@ class HabitTracker:
             
             console.print(menu)
             
-            choice = Prompt.ask("Pilihan", choices=["0","1","2","3","4","5"], default="0")
+            choice = Prompt.ask("Pilihan", choices=["0","1","2","3","4","5","6","7","8"], default="0")
             
             if choice == "0":
                 break
@@ -240,6 +416,12 @@ class HabitTracker:
                 self.tambah_kebiasaan()
             elif choice == "5":
                 self.hapus_kebiasaan()
+            elif choice == "6":
+                self.heatmap_tahunan()
+            elif choice == "7":
+                self.checkin_massal()
+            elif choice == "8":
+                self.hitung_ulang_streak()
             
             if choice != "0":
                 console.print("[dim]Tekan Enter untuk melanjutkan...[/dim]")
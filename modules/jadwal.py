@@ -8,6 +8,8 @@ from rich.prompt import Prompt, Confirm, IntPrompt
 from rich.text import Text
 import json
 
+from modules.streaming_export import write_json_stream
+
 console = Console()
 
 class JadwalManager:
@@ -144,9 +146,10 @@ class JadwalManager:
 
     def export_jadwal(self):
         """Export jadwal ke JSON dan Excel"""
-        rows = self.db.fetch_all("SELECT * FROM jadwal ORDER BY hari, waktu_mulai")
+        query = "SELECT * FROM jadwal ORDER BY hari, waktu_mulai"
+        total = self.db.fetch_one("SELECT COUNT(*) AS n FROM jadwal")['n']
         
-        if not rows:
+        if not total:
             console.print("[yellow]Tidak ada jadwal untuk diexport[/yellow]")
             return
         
@@ -166,25 +169,28 @@ class JadwalManager:
         
         if fmt in ["1", "3"]:
             # Export JSON
-            export_data = {
-                "export_date": datetime.now().isoformat(),
-                "total_jadwal": len(rows),
-                "jadwal": rows
-            }
             json_file = os.path.join(export_dir, f"jadwal_export_{timestamp}.json")
             with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+                write_json_stream(
+                    f,
+                    {"export_date": datetime.now().isoformat(), "total_jadwal": total},
+                    "jadwal",
+                    self.db.stream(query)
+                )
             console.print(f"[green]✓ JSON disimpan: {json_file}[/green]")
         
         if fmt in ["2", "3"]:
             # Export Excel
             try:
                 from openpyxl import Workbook
+                from openpyxl.cell import WriteOnlyCell
                 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+                from openpyxl.utils import get_column_letter
                 
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Jadwal Pelajaran"
+                # Mode write-only: baris langsung ditulis ke file, tidak
+                # disimpan semua di memori
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet("Jadwal Pelajaran")
                 
                 # Header style
                 header_font = Font(bold=True, color="FFFFFF", size=12)
@@ -195,26 +201,43 @@ class JadwalManager:
                 )
                 
                 headers = ["ID", "Hari", "Mata Pelajaran", "Waktu Mulai", "Waktu Selesai", "Ruangan", "Pengajar"]
+                
+                # Auto-width columns: lebar dihitung di SQL karena di mode
+                # write-only lebar kolom harus diset sebelum baris ditulis
+                widths = self.db.fetch_one('''
+                    SELECT MAX(LENGTH(CAST(id AS TEXT))) AS c1, MAX(LENGTH(hari)) AS c2,
+                           MAX(LENGTH(mata_pelajaran)) AS c3, MAX(LENGTH(waktu_mulai)) AS c4,
+                           MAX(LENGTH(waktu_selesai)) AS c5,
+                           MAX(LENGTH(COALESCE(NULLIF(ruangan, ''), '-'))) AS c6,
+                           MAX(LENGTH(COALESCE(NULLIF(pengajar, ''), '-'))) AS c7
+                    FROM jadwal
+                ''')
                 for col, header in enumerate(headers, 1):
-                    cell = ws.cell(row=1, column=col, value=header)
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal='center')
+                    max_length = max(len(header), widths[f"c{col}"] or 0)
+                    ws.column_dimensions[get_column_letter(col)].width = max_length + 4
+                
+                def styled(value, header=False):
+                    cell = WriteOnlyCell(ws, value=value)
                     cell.border = thin_border
+                    if header:
+                        cell.font = header_font
+                        cell.fill = header_fill
+                        cell.alignment = Alignment(horizontal='center')
+                    return cell
                 
-                for row_idx, row in enumerate(rows, 2):
-                    ws.cell(row=row_idx, column=1, value=row['id']).border = thin_border
-                    ws.cell(row=row_idx, column=2, value=row['hari']).border = thin_border
-                    ws.cell(row=row_idx, column=3, value=row['mata_pelajaran']).border = thin_border
-                    ws.cell(row=row_idx, column=4, value=row['waktu_mulai']).border = thin_border
-                    ws.cell(row=row_idx, column=5, value=row['waktu_selesai']).border = thin_border
-                    ws.cell(row=row_idx, column=6, value=row['ruangan'] or "-").border = thin_border
-                    ws.cell(row=row_idx, column=7, value=row['pengajar'] or "-").border = thin_border
+                ws.append([styled(header, header=True) for header in headers])
                 
-                # Auto-width columns
-                for col in ws.columns:
-                    max_length = max(len(str(cell.value or "")) for cell in col)
-                    ws.column_dimensions[col[0].column_letter].width = max_length + 4
+                for rows in self.db.stream(query):
+                    for row in rows:
+                        ws.append([
+                            styled(row['id']),
+                            styled(row['hari']),
+                            styled(row['mata_pelajaran']),
+                            styled(row['waktu_mulai']),
+                            styled(row['waktu_selesai']),
+                            styled(row['ruangan'] or "-"),
+                            styled(row['pengajar'] or "-"),
+                        ])
                 
                 excel_file = os.path.join(export_dir, f"jadwal_export_{timestamp}.xlsx")
                 wb.save(excel_file)
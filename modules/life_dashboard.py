@@ -1,41 +1,120 @@
 import os
-from datetime import datetime, timedelta
-from rich.console import Console
+import time
+from datetime import datetime
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
 from rich.columns import Columns
 from rich.text import Text
+from rich.live import Live
+
+from modules.budget import KATEGORI_TOTAL
+from modules.dashboard_snapshot import SnapshotCache
 
 console = Console()
 
+DEFAULT_LIVE_INTERVAL = 5
+
+# Panel dashboard -> bagian snapshot yang datanya dipakai. Panel tanpa
+# bagian (header, waktu, footer) hanya bergantung pada jam.
+PANEL_SECTIONS = {
+    "header": None,
+    "tasks": "tasks",
+    "waktu": None,
+    "budget": "money",
+    "habits": "habits",
+    "goals": "goals",
+    "footer": None,
+}
+
 class LifeDashboard:
-    def __init__(self, db):
+    def __init__(self, db, snapshots=None):
         self.db = db
+        self.snapshots = snapshots or SnapshotCache(db)
     
     def tampilkan(self):
         """Tampilkan life dashboard dalam satu layar"""
         os.system('cls' if os.name == 'nt' else 'clear')
         
+        snap, changed = self.snapshots.get()
         now = datetime.now()
-        today = now.strftime("%Y-%m-%d")
-        bulan = now.strftime("%Y-%m")
-        
-        console.print(f"\n[bold cyan]{'═' * 60}[/bold cyan]")
-        console.print(f"[bold cyan]   🧠 DASHBOARD KEHIDUPAN — {now.strftime('%A, %d %B %Y')}[/bold cyan]")
-        console.print(f"[bold cyan]{'═' * 60}[/bold cyan]\n")
         
+        for name in PANEL_SECTIONS:
+            panel = self._panel(name, snap, now, cached=not changed)
+            if panel is not None:
+                console.print(panel)
+    
+    def live(self, interval: float = DEFAULT_LIVE_INTERVAL):
+        """Dashboard yang memperbarui dirinya sendiri (Ctrl+C untuk keluar).
+        
+        Tiap interval hanya ada satu cek versi data; bagian yang tabelnya
+        berubah saja yang di-query ulang, dan layar digambar ulang hanya
+        kalau ada panel yang berubah atau menit berganti.
+        """
+        if not console.is_terminal:
+            # Output dialihkan ke file/pipe: cukup cetak sekali
+            self.tampilkan()
+            return
+        
+        panels = {}
+        menit_terakhir = None
+        
+        with Live(console=console, auto_refresh=False, screen=True) as live:
+            try:
+                while True:
+                    snap, changed = self.snapshots.get()
+                    now = datetime.now()
+                    menit = now.strftime("%Y-%m-%d %H:%M")
+                    
+                    dirty = [
+                        name for name, section in PANEL_SECTIONS.items()
+                        if name not in panels
+                        or (section is None and menit != menit_terakhir)
+                        or section in changed
+                    ]
+                    if dirty:
+                        for name in dirty:
+                            panels[name] = self._panel(name, snap, now, live_interval=interval)
+                        menit_terakhir = menit
+                        live.update(Group(*(p for p in panels.values() if p is not None)), refresh=True)
+                    
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                pass
+    
+    def _panel(self, name, snap, now, cached=False, live_interval=None):
+        if name == "header":
+            return self._render_header(now, snap, cached)
+        if name == "tasks":
+            return self._render_tasks(snap.top_tasks)
+        if name == "waktu":
+            return self._render_waktu(now)
+        if name == "budget":
+            return self._render_budget(snap.budget)
+        if name == "habits":
+            return self._render_habits(snap.habits, snap.habit_week_rate)
+        if name == "goals":
+            return self._render_goals(snap.goals, now)
+        return self._render_footer(now, live_interval)
+    
+    def _render_header(self, now, snap, cached):
+        header = (
+            f"\n[bold cyan]{'═' * 60}[/bold cyan]\n"
+            f"[bold cyan]   🧠 DASHBOARD KEHIDUPAN — {now.strftime('%A, %d %B %Y')}[/bold cyan]\n"
+            f"[bold cyan]{'═' * 60}[/bold cyan]\n"
+        )
+        if self.db.profiler and cached:
+            header += f"[dim]⚡ cached (data {snap.taken_at.strftime('%H:%M:%S')})[/dim]\n"
+        return header
+    
+    def _render_footer(self, now, live_interval):
+        if live_interval:
+            return (f"\n[dim]Jam sekarang: {now.strftime('%H:%M')} — diperbarui otomatis "
+                    f"tiap {live_interval:g} detik, Ctrl+C untuk keluar[/dim]")
+        return f"\n[dim]Jam sekarang: {now.strftime('%H:%M:%S')} — Semangat! 💪[/dim]"
+    
+    def _render_tasks(self, top_tasks):
         # === 1. TOP 3 TASK ===
-        top_tasks = self.db.fetch_all('''
-            SELECT * FROM tasks 
-            WHERE status != 'completed' 
-            ORDER BY CASE priority 
-                WHEN 'Tinggi' THEN 1 WHEN 'High' THEN 1
-                WHEN 'Sedang' THEN 2 WHEN 'Medium' THEN 2
-                WHEN 'Rendah' THEN 3 WHEN 'Low' THEN 3
-            END, deadline
-            LIMIT 3
-        ''')
-        
         task_text = "[bold yellow]📌 3 Task Terpenting:[/bold yellow]\n"
         if top_tasks:
             for i, t in enumerate(top_tasks, 1):
@@ -45,8 +124,9 @@ class LifeDashboard:
         else:
             task_text += "   [dim]Tidak ada task aktif[/dim]\n"
         
-        console.print(Panel(task_text, border_style="yellow", width=60))
-        
+        return Panel(task_text, border_style="yellow", width=60)
+    
+    def _render_waktu(self, now):
         # === 2. SISA WAKTU PRODUKTIF ===
         jam_sekarang = now.hour
         if jam_sekarang < 6:
@@ -63,54 +143,50 @@ class LifeDashboard:
         else:
             waktu_msg = "🌙 Waktunya istirahat! Produktivitas terbaik saat cukup tidur."
         
-        console.print(f"  {waktu_msg}\n")
-        
+        return f"  {waktu_msg}\n"
+    
+    def _render_budget(self, budget):
         # === 3. BUDGET BULAN INI ===
-        budget = self.db.fetch_one(
-            "SELECT * FROM budget WHERE bulan = ? ORDER BY id DESC LIMIT 1",
-            (bulan,)
-        )
-        total_expense = self.db.fetch_one(
-            "SELECT COALESCE(SUM(jumlah), 0) as total FROM expenses WHERE strftime('%Y-%m', tanggal) = ?",
-            (bulan,)
-        )
-        
-        expense_total = total_expense['total'] if total_expense else 0
-        
-        if budget:
-            sisa_budget = budget['budget_bulanan'] - expense_total
-            persen_terpakai = (expense_total / budget['budget_bulanan'] * 100) if budget['budget_bulanan'] > 0 else 0
+        total = budget.total
+        expense_total = total.terpakai
+        if total.budget is not None:
+            sisa_budget = total.sisa
+            persen_terpakai = total.persen or 0
             
             if sisa_budget > 0:
-                budget_msg = f"  💰 Budget: Rp {budget['budget_bulanan']:,.0f} | Terpakai: Rp {expense_total:,.0f} | [green]Sisa: Rp {sisa_budget:,.0f}[/green]"
+                budget_msg = f"  💰 Budget: Rp {total.budget:,.0f} | Terpakai: Rp {expense_total:,.0f} | [green]Sisa: Rp {sisa_budget:,.0f}[/green]"
             else:
-                budget_msg = f"  💰 Budget: Rp {budget['budget_bulanan']:,.0f} | [red]TERLAMPAUI Rp {abs(sisa_budget):,.0f}![/red]"
+                budget_msg = f"  💰 Budget: Rp {total.budget:,.0f} | [red]TERLAMPAUI Rp {abs(sisa_budget):,.0f}![/red]"
             
             bar_len = min(int(persen_terpakai / 5), 20)
             bar_color = "green" if persen_terpakai < 70 else ("yellow" if persen_terpakai < 90 else "red")
             bar = f"[{bar_color}]{'█' * bar_len}{'░' * (20 - bar_len)}[/{bar_color}] {persen_terpakai:.0f}%"
             budget_msg += f"\n  {bar}"
         else:
-            budget_msg = f"  💰 Total Pengeluaran Bulan Ini: Rp {expense_total:,.0f}\n  [dim]Belum ada budget — atur di Pencatat Pengeluaran[/dim]"
-        
-        console.print(budget_msg + "\n")
-        
+            budget_msg = f"  💰 Total Pengeluaran Bulan Ini: Rp {expense_total:,.0f}"
+            if not any(k.budget is not None for k in budget.kategori):
+                budget_msg += "\n  [dim]Belum ada budget — atur di Pencatat Pengeluaran[/dim]"
+        
+        # Kategori yang sudah melewati ambang peringatan
+        for row in budget.peringatan:
+            if row['kategori'] != KATEGORI_TOTAL:
+                warna = "red" if row['ambang'] >= 100 else "yellow"
+                budget_msg += (f"\n  [{warna}]⚠️ {row['kategori']}: Rp {row['terpakai']:,.0f} / "
+                               f"Rp {row['budget']:,.0f} (≥{row['ambang']}%)[/{warna}]")
+        
+        return budget_msg + "\n"
+    
+    def _render_habits(self, habit_streaks, week_rate):
         # === 4. HABIT STREAK ===
-        habits = self.db.fetch_all("SELECT * FROM habits ORDER BY id LIMIT 5")
-        
-        if habits:
-            habit_text = "[bold magenta]🔥 Streak Kebiasaan:[/bold magenta]\n"
-            for h in habits:
-                streak = self._hitung_streak(h['id'])
+        if habit_streaks:
+            habit_text = f"[bold magenta]🔥 Streak Kebiasaan:[/bold magenta] [dim](minggu ini {week_rate:.0f}%)[/dim]\n"
+            for h, streak in habit_streaks:
                 fire = "🔥" * min(streak // 3 + (1 if streak > 0 else 0), 5)
                 habit_text += f"   {h['emoji']} {h['nama']}: {streak} hari {fire}\n"
-            console.print(Panel(habit_text, border_style="magenta", width=60))
-        
+            return Panel(habit_text, border_style="magenta", width=60)
+    
+    def _render_goals(self, goals, now):
         # === 5. TARGET MASA DEPAN ===
-        goals = self.db.fetch_all(
-            "SELECT * FROM future_goals ORDER BY deadline LIMIT 2"
-        )
-        
         if goals:
             goal_text = "[bold blue]🎯 Target Utama:[/bold blue]\n"
             for g in goals:
@@ -122,28 +198,7 @@ class LifeDashboard:
                     goal_text += f"   • {g['target'][:35]} ({days_left} hari lagi)\n     {bar}\n"
                 except:
                     goal_text += f"   • {g['target'][:35]}\n"
-            console.print(Panel(goal_text, border_style="blue", width=60))
-        
-        console.print(f"\n[dim]Jam sekarang: {now.strftime('%H:%M:%S')} — Semangat! 💪[/dim]")
-    
-    def _hitung_streak(self, habit_id):
-        """Hitung streak kebiasaan"""
-        today = datetime.now().date()
-        streak = 0
-        current_date = today
-        
-        while True:
-            log = self.db.fetch_one(
-                "SELECT * FROM habit_logs WHERE habit_id = ? AND tanggal = ?",
-                (habit_id, current_date.strftime("%Y-%m-%d"))
-            )
-            if log:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-        
-        return streak
+            return Panel(goal_text, border_style="blue", width=60)
     
     def run(self):
         """Tampilkan dashboard"""
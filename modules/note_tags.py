@@ -0,0 +1,114 @@
+import json
+from typing import Dict, Iterable, List, Optional
+
+# Tag catatan dalam tabel note_tags (satu baris per catatan-tag, migrasi 8
+# migrate_note_tags), jadi filter per tag dan awan tag cukup satu
+# query berindex. Kolom catatan.tags (JSON) tetap ditulis untuk kompatibilitas
+# dengan data/export lama; yang dibaca aplikasi adalah note_tags.
+# Tag dibandingkan tanpa membedakan huruf besar/kecil (COLLATE NOCASE).
+
+# Pemisah tag di hasil group_concat; tag tidak bisa memuat koma karena
+# input tag dipisah dengan koma
+PEMISAH = ","
+
+# Kolom tambahan berisi tag catatan (urut abjad) untuk query SELECT ... FROM catatan
+TAG_LIST_COLUMN = f'''
+    (SELECT group_concat(tag, '{PEMISAH}') FROM note_tags t WHERE t.note_id = catatan.id) AS tag_list
+'''
+NOTES_BY_TAG_QUERY = f'''
+    SELECT catatan.*, {TAG_LIST_COLUMN}
+    FROM note_tags nt
+    JOIN catatan ON catatan.id = nt.note_id
+    WHERE nt.tag = ?
+    ORDER BY catatan.updated_at DESC
+'''
+TAG_CLOUD_QUERY = '''
+    SELECT tag, COUNT(*) AS jumlah
+    FROM note_tags
+    GROUP BY tag
+    ORDER BY jumlah DESC, tag
+    LIMIT ?
+'''
+
+
+def parse_tags(raw: Optional[str]) -> List[str]:
+    """Tag dari kolom JSON lama; data rusak dianggap tanpa tag"""
+    if not raw:
+        return []
+    try:
+        tags = json.loads(raw)
+    except (ValueError, TypeError):
+        return []
+    return [str(t) for t in tags] if isinstance(tags, list) else []
+
+
+def split_tag_list(tag_list: Optional[str]) -> List[str]:
+    """Isi kolom tag_list (hasil group_concat) jadi list"""
+    return tag_list.split(PEMISAH) if tag_list else []
+
+
+def normalisasi_tags(tags: Iterable[str]) -> List[str]:
+    """Rapikan spasi, buang tag kosong & ganda (tanpa beda huruf besar/kecil)"""
+    hasil, seen = [], set()
+    for tag in tags:
+        tag = tag.strip().replace(PEMISAH, " ")
+        if tag and tag.lower() not in seen:
+            seen.add(tag.lower())
+            hasil.append(tag)
+    return hasil
+
+
+def simpan_tags(db, note_id: int, tags: List[str]):
+    """Ganti semua tag satu catatan di note_tags.
+
+    tags sebaiknya sudah lewat normalisasi_tags dan ditulis juga ke kolom
+    catatan.tags dalam transaksi yang sama.
+    """
+    with db.transaction():
+        db.execute_query("DELETE FROM note_tags WHERE note_id = ?", (note_id,))
+        if tags:
+            db.execute_many(
+                "INSERT INTO note_tags (note_id, tag) VALUES (?, ?)",
+                [(note_id, tag) for tag in tags]
+            )
+
+
+def tag_cloud(db, batas: int = 50) -> List[Dict]:
+    """Tag terbanyak dipakai beserta jumlah catatannya"""
+    return db.fetch_all(TAG_CLOUD_QUERY, (batas,))
+
+
+def migrate_note_tags(db):
+    """Migrasi 8: tabel note_tags, index per tag, lalu isi dari catatan.tags"""
+    db.execute_query('''
+        CREATE TABLE IF NOT EXISTS note_tags (
+            note_id INTEGER NOT NULL,
+            tag TEXT NOT NULL COLLATE NOCASE,
+            PRIMARY KEY (note_id, tag),
+            FOREIGN KEY (note_id) REFERENCES catatan(id)
+        ) WITHOUT ROWID
+    ''')
+    # Filter per tag & awan tag (GROUP BY tag) dibaca dari index ini
+    db.execute_query("CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags(tag, note_id)")
+    db.execute_query('''
+        CREATE TRIGGER IF NOT EXISTS trg_catatan_tags_delete
+        AFTER DELETE ON catatan
+        BEGIN
+            DELETE FROM note_tags WHERE note_id = OLD.id;
+        END
+    ''')
+    rebuild_note_tags(db)
+
+
+def rebuild_note_tags(db) -> int:
+    """Isi ulang note_tags dari kolom JSON catatan.tags"""
+    with db.transaction():
+        db.execute_query("DELETE FROM note_tags")
+        rows = [
+            (row['id'], tag)
+            for row in db.iter_rows("SELECT id, tags FROM catatan WHERE tags IS NOT NULL AND tags != '[]'")
+            for tag in normalisasi_tags(parse_tags(row['tags']))
+        ]
+        if rows:
+            db.execute_many("INSERT INTO note_tags (note_id, tag) VALUES (?, ?)", rows)
+    return len(rows)
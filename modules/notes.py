@@ -5,9 +5,16 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.text import Text
+from rich.markup import escape
 import json
 import os
 
+from modules.note_tags import (
+    NOTES_BY_TAG_QUERY, TAG_LIST_COLUMN, normalisasi_tags, simpan_tags, split_tag_list, tag_cloud
+)
+from modules.notes_search import BATAS_HASIL, PENANDA_AKHIR, PENANDA_AWAL, cari_catatan
+from modules.streaming_export import write_json_stream
+
 console = Console()
 
 class NotesManager:
@@ -37,14 +44,16 @@ class NotesManager:
             return
         
         tags_input = Prompt.ask("[yellow]Tags (pisah dengan koma, opsional)[/yellow]", default="")
-        tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()] if tags_input.strip() else []
+        tags = normalisasi_tags(tags_input.split(","))
         
         kategori = Prompt.ask("[yellow]Kategori (opsional)[/yellow]", default="Umum")
         
-        self.db.execute_query('''
-            INSERT INTO catatan (judul, isi, tags, kategori)
-            VALUES (?, ?, ?, ?)
-        ''', (judul, isi, json.dumps(tags), kategori))
+        with self.db.transaction():
+            note_id = self.db.execute_query('''
+                INSERT INTO catatan (judul, isi, tags, kategori)
+                VALUES (?, ?, ?, ?)
+            ''', (judul, isi, json.dumps(tags), kategori))
+            simpan_tags(self.db, note_id, tags)
         
         console.print(f"\n[green]✓ Catatan '[bold]{judul}[/bold]' berhasil disimpan![/green]")
     
@@ -60,13 +69,13 @@ class NotesManager:
             console.print("[red]❌ ID harus angka![/red]")
             return
         
-        note = self.db.fetch_one("SELECT * FROM catatan WHERE id = ?", (note_id,))
+        note = self.db.fetch_one(f"SELECT *, {TAG_LIST_COLUMN} FROM catatan WHERE id = ?", (note_id,))
         
         if not note:
             console.print("[red]❌ Catatan tidak ditemukan![/red]")
             return
         
-        current_tags = json.loads(note['tags']) if note['tags'] else []
+        current_tags = split_tag_list(note['tag_list'])
         
         console.print(f"\n[bold yellow]✏️  Mengedit: {note['judul']}[/bold yellow]")
         
@@ -94,35 +103,32 @@ class NotesManager:
         
         tags_default = ", ".join(current_tags) if current_tags else ""
         tags_input = Prompt.ask("[cyan]Tags baru (pisah dengan koma)[/cyan]", default=tags_default)
-        new_tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()] if tags_input.strip() else []
+        new_tags = normalisasi_tags(tags_input.split(","))
         
         new_kategori = Prompt.ask("[cyan]Kategori baru[/cyan]", default=note['kategori'])
         
-        self.db.execute_query('''
-            UPDATE catatan 
-            SET judul = ?, isi = ?, tags = ?, kategori = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (new_judul, new_isi, json.dumps(new_tags), new_kategori, note_id))
+        with self.db.transaction():
+            self.db.execute_query('''
+                UPDATE catatan 
+                SET judul = ?, isi = ?, tags = ?, kategori = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (new_judul, new_isi, json.dumps(new_tags), new_kategori, note_id))
+            simpan_tags(self.db, note_id, new_tags)
         
         console.print("[green]✓ Catatan berhasil diupdate![/green]")
     
-    def list_notes(self, search_term=None, kategori=None):
+    def list_notes(self, search_term=None, kategori=None, tag=None):
         """Tampilkan semua catatan"""
         if search_term:
-            query = """
-                SELECT * FROM catatan 
-                WHERE judul LIKE ? OR isi LIKE ? 
-                ORDER BY updated_at DESC
-            """
-            params = (f"%{search_term}%", f"%{search_term}%")
+            rows = cari_catatan(self.db, search_term)
+        elif tag:
+            rows = self.db.fetch_all(NOTES_BY_TAG_QUERY, (tag,))
         elif kategori:
-            query = "SELECT * FROM catatan WHERE kategori = ? ORDER BY updated_at DESC"
-            params = (kategori,)
+            rows = self.db.fetch_all(
+                f"SELECT *, {TAG_LIST_COLUMN} FROM catatan WHERE kategori = ? ORDER BY updated_at DESC", (kategori,)
+            )
         else:
-            query = "SELECT * FROM catatan ORDER BY updated_at DESC"
-            params = ()
-        
-        rows = self.db.fetch_all(query, params)
+            rows = self.db.fetch_all(f"SELECT *, {TAG_LIST_COLUMN} FROM catatan ORDER BY updated_at DESC")
         
         if not rows:
             console.print("[yellow]📭 Tidak ada catatan ditemukan[/yellow]")
@@ -137,7 +143,7 @@ class NotesManager:
         table.add_column("Diupdate", style="blue", width=12)
         
         for i, row in enumerate(rows, 1):
-            tags = json.loads(row['tags']) if row['tags'] else []
+            tags = split_tag_list(row['tag_list'])
             tags_str = ", ".join(tags[:3]) + ("..." if len(tags) > 3 else "")
             tags_str = tags_str if tags_str else "-"
             
@@ -150,6 +156,10 @@ class NotesManager:
             judul = row['judul'][:27] + "..." if len(row['judul']) > 27 else row['judul']
             kat = row['kategori'][:12] + "..." if len(row['kategori']) > 12 else row['kategori']
             
+            judul = escape(judul)
+            if row.get('cuplikan'):
+                judul += f"\n[dim]{self._format_cuplikan(row['cuplikan'])}[/dim]"
+            
             table.add_row(
                 str(i),
                 str(row['id']),
@@ -162,17 +172,25 @@ class NotesManager:
         console.print()
         console.print(table)
         console.print(f"[dim]Total: {len(rows)} catatan (gunakan ID untuk memilih)[/dim]")
+        if search_term and len(rows) >= BATAS_HASIL:
+            console.print(f"[dim]Menampilkan {BATAS_HASIL} hasil paling relevan, perjelas kata kunci untuk mempersempit[/dim]")
         return rows
     
+    @staticmethod
+    def _format_cuplikan(cuplikan):
+        """Cuplikan hasil FTS dengan kata yang cocok ditebalkan"""
+        teks = escape(" ".join(cuplikan.split()))
+        return teks.replace(PENANDA_AWAL, "[bold yellow]").replace(PENANDA_AKHIR, "[/bold yellow]")
+    
     def view_note_detail(self, note_id):
         """Lihat detail catatan"""
-        note = self.db.fetch_one("SELECT * FROM catatan WHERE id = ?", (note_id,))
+        note = self.db.fetch_one(f"SELECT *, {TAG_LIST_COLUMN} FROM catatan WHERE id = ?", (note_id,))
         
         if not note:
             console.print("[red]❌ Catatan tidak ditemukan![/red]")
             return
         
-        tags = json.loads(note['tags']) if note['tags'] else []
+        tags = split_tag_list(note['tag_list'])
         tags_str = ", ".join(tags) if tags else "-"
         
         created = note['created_at'][:16] if note['created_at'] else "-"
@@ -209,6 +227,43 @@ class NotesManager:
         
         self.list_notes(search_term=search_term)
     
+    def show_tag_cloud(self):
+        """Awan tag: tag terbanyak dipakai, lalu opsional filter per tag"""
+        tags = tag_cloud(self.db)
+        
+        if not tags:
+            console.print("[yellow]🏷️ Belum ada catatan bertag[/yellow]")
+            return
+        
+        terbanyak = tags[0]['jumlah']
+        cloud = Text()
+        for row in sorted(tags, key=lambda r: r['tag'].lower()):
+            rasio = row['jumlah'] / terbanyak
+            if rasio >= 0.66:
+                style = "bold magenta"
+            elif rasio >= 0.33:
+                style = "bold cyan"
+            else:
+                style = "dim cyan"
+            cloud.append(f"#{row['tag']}", style=style)
+            cloud.append(f"({row['jumlah']})  ", style="dim")
+        
+        console.print(Panel(cloud, title="☁️ Awan Tag", border_style="cyan"))
+        
+        tag = Prompt.ask("[yellow]Tampilkan catatan dengan tag (kosongkan untuk kembali)[/yellow]", default="")
+        if tag.strip():
+            self.list_notes(tag=tag.strip().lstrip("#"))
+    
+    def filter_by_tag(self):
+        """Tampilkan catatan dengan tag tertentu"""
+        tag = Prompt.ask("[yellow]Tag[/yellow]").strip().lstrip("#")
+        
+        if not tag:
+            console.print("[red]❌ Tag tidak boleh kosong![/red]")
+            return
+        
+        self.list_notes(tag=tag)
+    
     def delete_note(self):
         """Hapus catatan"""
         rows = self.list_notes()
@@ -235,29 +290,16 @@ class NotesManager:
     
     def export_notes(self):
         """Export catatan ke JSON"""
-        rows = self.db.fetch_all("SELECT * FROM catatan ORDER BY created_at DESC")
+        total = self.db.fetch_one("SELECT COUNT(*) AS n FROM catatan")['n']
         
-        if not rows:
+        if not total:
             console.print("[yellow]📭 Tidak ada catatan untuk diexport[/yellow]")
             return
         
-        clean_rows = []
-        for row in rows:
-            clean_row = dict(row)
-            if clean_row['tags']:
-                try:
-                    clean_row['tags'] = json.loads(clean_row['tags'])
-                except:
-                    clean_row['tags'] = []
-            else:
-                clean_row['tags'] = []
-            clean_rows.append(clean_row)
-        
-        export_data = {
-            "export_date": datetime.now().isoformat(),
-            "total_notes": len(clean_rows),
-            "notes": clean_rows
-        }
+        def clean_row(row):
+            clean = dict(row)
+            clean['tags'] = split_tag_list(clean.pop('tag_list'))
+            return clean
         
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         export_dir = os.path.join(base_dir, "exports")
@@ -267,8 +309,14 @@ class NotesManager:
         
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-            console.print(f"[green]✓ {len(clean_rows)} catatan berhasil diexport ke: {filename}[/green]")
+                written = write_json_stream(
+                    f,
+                    {"export_date": datetime.now().isoformat(), "total_notes": total},
+                    "notes",
+                    self.db.stream(f"SELECT *, {TAG_LIST_COLUMN} FROM catatan ORDER BY created_at DESC"),
+                    transform=clean_row
+                )
+            console.print(f"[green]✓ {written} catatan berhasil diexport ke: {filename}[/green]")
         except Exception as e:
             console.print(f"[red]❌ Gagal export: {str(e)}[/red]")
     
@@ -292,6 +340,8 @@ class NotesManager:
                 ("5", "✏️ Edit Catatan"),
                 ("6", "🗑️ Hapus Catatan"),
                 ("7", "📂 Export Catatan"),
+                ("8", "🏷️ Filter per Tag"),
+                ("9", "☁️ Awan Tag"),
                 ("0", "🔙 Kembali")
             ]
             
@@ -301,7 +351,7 @@ class NotesManager:
             console.print(menu)
             
             choice = Prompt.ask("[bold cyan]Pilihan[/bold cyan]", 
-                              choices=["0", "1", "2", "3", "4", "5", "6", "7"], 
+                              choices=["0", "1", "2", "3", "4", "5", "6", "7", "8", "9"], 
                               default="0")
             
             if choice == "0":
@@ -325,6 +375,10 @@ class NotesManager:
                 self.delete_note()
             elif choice == "7":
                 self.export_notes()
+            elif choice == "8":
+                self.filter_by_tag()
+            elif choice == "9":
+                self.show_tag_cloud()
             
             if choice != "0":
                 console.print("[dim]Tekan Enter untuk melanjutkan...[/dim]")
@@ -0,0 +1,129 @@
+import re
+import sqlite3
+from functools import lru_cache
+from typing import Dict, List
+
+from modules.note_tags import TAG_LIST_COLUMN
+
+# Pencarian catatan lewat index FTS5 catatan_fts (external content di atas
+# tabel catatan, dijaga trigger; dipasang pasang_index_catatan). Hasil
+# diurutkan BM25 dan diberi cuplikan dengan kata yang cocok ditandai.
+# Kalau SQLite tidak punya FTS5, pencarian jatuh ke LIKE seperti dulu.
+
+FTS_TABLE = "catatan_fts"
+# Bobot BM25 per kolom: judul, isi, tags, kategori
+BOBOT_KOLOM = (10.0, 1.0, 5.0, 2.0)
+BATAS_HASIL = 50
+# Penanda awal/akhir kata yang cocok di cuplikan; diganti markup saat tampil
+PENANDA_AWAL = "\x02"
+PENANDA_AKHIR = "\x03"
+KATA_CUPLIKAN = 12
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Semua catatan yang cocok dirangking BM25 lewat kolom rank. ORDER BY rank
+# diurutkan di dalam FTS5 sendiri, jadi SQLite berhenti setelah LIMIT baris:
+# cuplikan, join ke catatan dan daftar tag hanya dihitung untuk baris yang
+# ditampilkan, bukan untuk setiap catatan yang cocok.
+FTS_SEARCH_QUERY = f'''
+    SELECT catatan.*, {TAG_LIST_COLUMN},
+           snippet({FTS_TABLE}, -1, '{PENANDA_AWAL}', '{PENANDA_AKHIR}', '…', {KATA_CUPLIKAN}) AS cuplikan,
+           {FTS_TABLE}.rank AS skor
+    FROM {FTS_TABLE}
+    JOIN catatan ON catatan.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH ?
+      AND {FTS_TABLE}.rank MATCH 'bm25({", ".join(map(str, BOBOT_KOLOM))})'
+    ORDER BY {FTS_TABLE}.rank
+    LIMIT ?
+'''
+LIKE_SEARCH_QUERY = f'''
+    SELECT *, {TAG_LIST_COLUMN}, NULL AS cuplikan, NULL AS skor FROM catatan
+    WHERE judul LIKE ? OR isi LIKE ?
+    ORDER BY updated_at DESC
+    LIMIT ?
+'''
+
+
+@lru_cache(maxsize=1)
+def fts5_didukung() -> bool:
+    """Apakah build SQLite ini punya modul FTS5"""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def index_tersedia(db) -> bool:
+    return db.fetch_one(
+        "SELECT 1 AS ada FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ) is not None
+
+
+def buat_query_fts(kata_kunci: str) -> str:
+    """Ubah input bebas jadi query FTS5 yang aman.
+
+    Tiap kata dikutip (operator FTS di input tidak ikut dieksekusi) dan
+    dicocokkan sebagai prefix, jadi "rapat ang" menemukan "rapat anggaran".
+    Semua kata harus ada (AND implisit).
+    """
+    return " ".join(f'"{kata}"*' for kata in TOKEN_RE.findall(kata_kunci))
+
+
+def cari_catatan(db, kata_kunci: str, batas: int = BATAS_HASIL) -> List[Dict]:
+    """Catatan yang cocok, paling relevan dulu (kolom tambahan: cuplikan, skor)"""
+    if fts5_didukung() and index_tersedia(db):
+        query = buat_query_fts(kata_kunci)
+        if not query:
+            return []
+        return db.fetch_all(FTS_SEARCH_QUERY, (query, batas))
+    pola = f"%{kata_kunci}%"
+    return db.fetch_all(LIKE_SEARCH_QUERY, (pola, pola, batas))
+
+
+def pasang_index_catatan(db):
+    """Pasang index full-text catatan kalau FTS5 didukung dan index belum ada.
+
+    Dijalankan setiap database dibuka (SETUP_SAAT_BUKA di database.py),
+    bukan sebagai migrasi sekali jalan, jadi index ikut terpasang setelah
+    SQLite di-upgrade. Kalau sudah terpasang cukup satu lookup sqlite_master.
+    """
+    if not fts5_didukung() or index_tersedia(db):
+        return
+    with db.transaction():
+        # External content: teks tetap di tabel catatan, index hanya menyimpan
+        # token. prefix='2 3' mempercepat pencarian awalan kata pendek.
+        db.execute_query(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                judul, isi, tags, kategori,
+                content='catatan', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+        kolom = "judul, isi, tags, kategori"
+        hapus = f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {kolom}) VALUES ('delete', OLD.id, OLD.judul, OLD.isi, OLD.tags, OLD.kategori);"
+        tambah = f"INSERT INTO {FTS_TABLE} (rowid, {kolom}) VALUES (NEW.id, NEW.judul, NEW.isi, NEW.tags, NEW.kategori);"
+        db.execute_query(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_catatan_fts_insert
+            AFTER INSERT ON catatan BEGIN {tambah} END
+        ''')
+        db.execute_query(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_catatan_fts_delete
+            AFTER DELETE ON catatan BEGIN {hapus} END
+        ''')
+        db.execute_query(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_catatan_fts_update
+            AFTER UPDATE OF {kolom} ON catatan BEGIN {hapus} {tambah} END
+        ''')
+        rebuild_catatan_fts(db)
+
+
+def rebuild_catatan_fts(db) -> bool:
+    """Bangun ulang index dari tabel catatan; False kalau index tidak ada"""
+    if not index_tersedia(db):
+        return False
+    db.execute_query(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+    return True
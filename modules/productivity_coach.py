@@ -6,61 +6,44 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 
+from modules.budget import KATEGORI_TOTAL
+from modules.dashboard_snapshot import SnapshotCache
+
 console = Console()
 
 class ProductivityCoach:
-    def __init__(self, db):
+    def __init__(self, db, snapshots=None):
         self.db = db
+        self.snapshots = snapshots or SnapshotCache(db)
     
     def analisa_hari_ini(self):
         """Analisa produktivitas hari ini"""
         os.system('cls' if os.name == 'nt' else 'clear')
         
-        today = datetime.now().strftime("%Y-%m-%d")
         now = datetime.now()
         
         console.print(f"\n[bold cyan]🧠 Analisa Produktivitas Hari Ini[/bold cyan]")
         console.print(f"[dim]{now.strftime('%A, %d %B %Y %H:%M')}[/dim]\n")
         
-        # === Task Analysis ===
-        tasks_today = self.db.fetch_all(
-            "SELECT * FROM tasks WHERE status != 'completed' ORDER BY priority"
-        )
-        completed_today = self.db.fetch_all(
-            "SELECT * FROM tasks WHERE status = 'completed' AND DATE(updated_at) = ?",
-            (today,)
-        )
+        snap, changed = self.snapshots.get()
+        if self.db.profiler and not changed:
+            console.print(f"[dim]⚡ cached (data {snap.taken_at.strftime('%H:%M:%S')})[/dim]\n")
         
-        total_active = len(tasks_today)
-        total_completed = len(completed_today)
+        # === Task Analysis ===
+        total_active = snap.active_tasks
+        total_completed = snap.completed_today
         
         # === Expense Analysis ===
-        expense_today = self.db.fetch_one(
-            "SELECT COALESCE(SUM(jumlah), 0) as total FROM expenses WHERE tanggal = ?",
-            (today,)
-        )
-        expense_total = expense_today['total'] if expense_today else 0
+        expense_total = snap.expense_today
         
         # === Habit Analysis ===
-        habits = self.db.fetch_all("SELECT * FROM habits")
-        habits_done = 0
-        for h in habits:
-            log = self.db.fetch_one(
-                "SELECT * FROM habit_logs WHERE habit_id = ? AND tanggal = ?",
-                (h['id'], today)
-            )
-            if log:
-                habits_done += 1
-        
-        total_habits = len(habits)
+        habits_done = snap.habits_done_today
+        total_habits = snap.habits_total
+        habit_week_rate = snap.habit_week_rate
         habit_rate = (habits_done / total_habits * 100) if total_habits > 0 else 0
         
         # === Study Analysis ===
-        study = self.db.fetch_one(
-            "SELECT COALESCE(SUM(duration_minutes), 0) as total FROM study_sessions WHERE date = ?",
-            (today,)
-        )
-        study_mins = study['total'] if study else 0
+        study_mins = snap.study_minutes_today
         
         # === SKOR PRODUKTIVITAS ===
         score = 0
@@ -92,13 +75,8 @@ class ProductivityCoach:
             score += 10  # At least tracking
             max_score += 25
             
-            bulan = now.strftime("%Y-%m")
-            budget = self.db.fetch_one(
-                "SELECT * FROM budget WHERE bulan = ? ORDER BY id DESC LIMIT 1",
-                (bulan,)
-            )
-            if budget:
-                daily_budget = budget['budget_bulanan'] / 30
+            if snap.budget.total.budget is not None:
+                daily_budget = snap.budget.total.budget / 30
                 if expense_total <= daily_budget:
                     score += 15
         else:
@@ -131,12 +109,13 @@ class ProductivityCoach:
 
 [bold magenta]🔥 Kebiasaan:[/bold magenta]
   Selesai: {habits_done}/{total_habits} ({habit_rate:.0f}%)
+  Minggu ini: {habit_week_rate:.0f}%
 
 [bold yellow]📚 Belajar:[/bold yellow]
   Waktu belajar: {study_mins} menit ({study_mins/60:.1f} jam)
 
 [bold green]💰 Keuangan:[/bold green]
-  Pengeluaran hari ini: Rp {expense_total:,.0f}
+  Pengeluaran hari ini: Rp {expense_total:,.0f}{self._ringkas_budget(snap.budget)}
         """
         
         console.print(Panel(report, title="🧠 Laporan Produktivitas", border_style="cyan", width=60))
@@ -144,6 +123,17 @@ class ProductivityCoach:
         # Saran
         self._berikan_saran(final_score, total_active, habits_done, total_habits, study_mins, expense_total)
     
+    @staticmethod
+    def _ringkas_budget(budget) -> str:
+        """Baris tambahan laporan: budget bulan ini & kategori yang melewati ambang"""
+        lines = ""
+        if budget.total.persen is not None:
+            lines += f"\n  Budget bulan ini terpakai: {budget.total.persen:.0f}%"
+        for row in budget.peringatan:
+            nama = "total" if row['kategori'] == KATEGORI_TOTAL else row['kategori']
+            lines += f"\n  [{'red' if row['ambang'] >= 100 else 'yellow'}]⚠️ Budget {nama} ≥{row['ambang']}%[/]"
+        return lines
+    
     def _berikan_saran(self, score, tasks_active, habits_done, total_habits, study_mins, expense):
         """Berikan saran berdasarkan analisa"""
         console.print("\n[bold yellow]💡 Saran untuk Kamu:[/bold yellow]\n")
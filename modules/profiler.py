@@ -0,0 +1,114 @@
+import logging
+import sqlite3
+import threading
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+DEFAULT_SLOW_MS = 20.0
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+
+class QueryProfiler:
+    """Catat waktu semua query Database selama mode profiling.
+    
+    Query di atas threshold ditulis ke slow_queries.log (rotating) bersama
+    output EXPLAIN QUERY PLAN-nya, dan ringkasan per query bisa dicetak
+    di akhir sesi.
+    """
+    
+    def __init__(self, log_dir: Path, threshold_ms: float = DEFAULT_SLOW_MS):
+        self.threshold_ms = threshold_ms
+        self.log_file = log_dir / "slow_queries.log"
+        self._stats: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        
+        self.logger = logging.getLogger("rizz.slow_queries")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            handler = RotatingFileHandler(
+                self.log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(handler)
+    
+    @staticmethod
+    def _key(query: str) -> str:
+        name = getattr(query, "name", None)
+        if name:
+            return name
+        sql = " ".join(query.split())
+        return sql if len(sql) <= 70 else sql[:67] + "..."
+    
+    def record(self, conn: sqlite3.Connection, query: str, params: Any, elapsed: float,
+               explain: bool = True):
+        elapsed_ms = elapsed * 1000
+        key = self._key(query)
+        
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                self._stats[key] = [1, elapsed_ms, elapsed_ms]
+            else:
+                stat[0] += 1
+                stat[1] += elapsed_ms
+                stat[2] = max(stat[2], elapsed_ms)
+        
+        if elapsed_ms >= self.threshold_ms:
+            self._log_slow(conn, query, params, elapsed_ms, explain)
+    
+    def _log_slow(self, conn, query, params, elapsed_ms, explain):
+        plan = []
+        if explain:
+            try:
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+            except sqlite3.Error:
+                pass
+        
+        lines = [f"[{elapsed_ms:.1f} ms] {' '.join(query.split())}"]
+        if params and explain:
+            lines.append(f"  params: {params!r}")
+        lines.extend(f"  plan: {detail}" for detail in plan)
+        self.logger.info("\n".join(lines))
+    
+    def summary(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """Top query berdasarkan total waktu"""
+        with self._lock:
+            rows = [
+                {"query": key, "calls": int(calls), "total_ms": total,
+                 "avg_ms": total / calls, "max_ms": worst}
+                for key, (calls, total, worst) in self._stats.items()
+            ]
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows[:limit]
+    
+    def print_summary(self, limit: int = 15):
+        rows = self.summary(limit)
+        if not rows:
+            return
+        
+        table = Table(title="⏱️ Ringkasan Query Sesi Ini")
+        table.add_column("Query", style="cyan", max_width=60)
+        table.add_column("Panggilan", style="yellow", justify="right")
+        table.add_column("Total (ms)", style="green", justify="right")
+        table.add_column("Rata-rata (ms)", style="magenta", justify="right")
+        table.add_column("Maks (ms)", style="red", justify="right")
+        
+        for r in rows:
+            table.add_row(
+                r["query"],
+                str(r["calls"]),
+                f"{r['total_ms']:.2f}",
+                f"{r['avg_ms']:.3f}",
+                f"{r['max_ms']:.2f}",
+            )
+        
+        console.print(table)
+        console.print(f"[dim]Query lambat (≥ {self.threshold_ms:.0f} ms) dicatat di {self.log_file}[/dim]")
@@ -0,0 +1,29 @@
+import json
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+def write_json_stream(f, meta: Dict[str, Any], key: str, batches: Iterable[Iterable],
+                      transform: Optional[Callable] = None) -> int:
+    """Tulis `{**meta, key: [...]}` ke file secara bertahap.
+    
+    Hasilnya sama dengan json.dump(..., indent=2, ensure_ascii=False), tapi
+    baris ditulis per batch sehingga memori tetap kecil berapa pun jumlah
+    datanya. Mengembalikan jumlah item yang ditulis.
+    """
+    f.write("{\n")
+    for name, value in meta.items():
+        f.write(f"  {json.dumps(name)}: {json.dumps(value, ensure_ascii=False)},\n")
+    f.write(f"  {json.dumps(key)}: [")
+    
+    count = 0
+    for batch in batches:
+        chunk = []
+        for row in batch:
+            item = transform(row) if transform else dict(row)
+            text = json.dumps(item, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+            chunk.append(("\n    " if count == 0 else ",\n    ") + text)
+            count += 1
+        f.write("".join(chunk))
+    
+    f.write("\n  ]\n}" if count else "]\n}")
+    return count
@@ -115,20 +115,18 @@ class TaskManager:
     
     def show_task_stats(self):
         """Tampilkan statistik task"""
-        tasks = self.db.fetch_all("SELECT * FROM tasks")
-        total = len(tasks)
-        
-        if total == 0:
-            console.print("[yellow]Belum ada task sama sekali.[/yellow]")
-            return
-        
-        completed = sum(1 for t in tasks if t['status'] == 'completed')
-        in_progress = sum(1 for t in tasks if t['status'] == 'in_progress')
-        pending = sum(1 for t in tasks if t['status'] == 'pending')
-        
-        overdue = 0
+        total = completed = in_progress = pending = overdue = 0
         today = datetime.now().date()
-        for task in tasks:
+        
+        for task in self.db.iter_rows("SELECT status, deadline FROM tasks"):
+            total += 1
+            if task['status'] == 'completed':
+                completed += 1
+            elif task['status'] == 'in_progress':
+                in_progress += 1
+            elif task['status'] == 'pending':
+                pending += 1
+            
             if task['deadline'] and task['status'] != 'completed':
                 try:
                     deadline = datetime.strptime(task['deadline'], "%Y-%m-%d").date()
@@ -137,6 +135,10 @@ class TaskManager:
                 except:
                     pass
         
+        if total == 0:
+            console.print("[yellow]Belum ada task sama sekali.[/yellow]")
+            return
+        
         completion_rate = (completed / total * 100) if total > 0 else 0
         
         stats_text = f"""
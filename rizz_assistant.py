@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import os
+from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
@@ -11,7 +12,7 @@ from rich.prompt import Prompt
 import click
 
 from config.config_manager import ConfigManager
-from modules.database import Database
+from modules.database import Database, HABITS_ALL
 from modules.jadwal import JadwalManager
 from modules.notes import NotesManager
 from modules.tasks import TaskManager
@@ -20,28 +21,54 @@ from modules.study_tools import StudyTools
 from modules.weather import WeatherInfo
 from modules.expense_tracker import ExpenseTracker
 from modules.clipboard_manager import ClipboardManager
-from modules.habit_tracker import HabitTracker
+from modules.habit_tracker import HabitTracker, rentang_tanggal
+from modules.habit_analytics import HabitAnalytics
+from modules.dashboard_snapshot import SnapshotCache
 from modules.network_check import NetworkCheck
 from modules.productivity_coach import ProductivityCoach
-from modules.life_dashboard import LifeDashboard
+from modules.life_dashboard import LifeDashboard, DEFAULT_LIVE_INTERVAL
 from modules.future_you import FutureYou
 from modules.financial_survival import FinancialSurvival
+from modules.profiler import QueryProfiler
 
 console = Console()
 
+def buka_database(config_mgr: ConfigManager, profiling: bool = False) -> Database:
+    """Buka database sesuai config (dipakai menu interaktif & perintah CLI)"""
+    config = config_mgr.load_config()
+    db = Database(
+        config_mgr.config_dir,
+        durability=config.get("db_durability", "balanced"),
+        checkpoint_interval=config.get("db_checkpoint_interval", 500),
+    )
+    if profiling:
+        db.profiler = QueryProfiler(
+            config_mgr.config_dir,
+            threshold_ms=config.get("profile_slow_ms", 20),
+        )
+    return db
+
+def tutup_database(db: Database):
+    if db.profiler:
+        db.profiler.print_summary()
+    db.close()
+
 def clear_screen():
     """Bersihkan layar terminal"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
 class RIzzAssistant:
-    def __init__(self):
+    def __init__(self, profiling: bool = False):
         self.config_mgr = ConfigManager()
         self.profile = self.config_mgr.load_profile()
         
         if not self.profile:
             self.profile = self.config_mgr.collect_user_profile()
         
-        self.db = Database(self.config_mgr.config_dir)
+        self.db = buka_database(self.config_mgr, profiling)
+        # Dipakai bersama supaya data kebiasaan cukup dibaca sekali
+        self.habit_analytics = HabitAnalytics(self.db)
+        self.snapshots = SnapshotCache(self.db, self.habit_analytics)
         
         self.modules = {
             'jadwal': JadwalManager(self.db, self.profile),
@@ -52,10 +79,10 @@ class RIzzAssistant:
             'weather': WeatherInfo(),
             'expense': ExpenseTracker(self.db),
             'clipboard': ClipboardManager(self.db),
-            'habits': HabitTracker(self.db),
+            'habits': HabitTracker(self.db, self.habit_analytics),
             'network': NetworkCheck(),
-            'coach': ProductivityCoach(self.db),
-            'dashboard': LifeDashboard(self.db),
+            'coach': ProductivityCoach(self.db, self.snapshots),
+            'dashboard': LifeDashboard(self.db, self.snapshots),
             'future': FutureYou(self.db),
             'survival': FinancialSurvival(self.db),
         }
@@ -160,23 +187,33 @@ class RIzzAssistant:
         clear_screen()
         self.display_banner()
         
-        while self.running:
-            try:
-                clear_screen()
-                self.display_banner()
-                self.display_main_menu()
-                command = Prompt.ask(
-                    f"\n[bold cyan]{self.profile.get('nickname', 'User')}[/bold cyan]@rizz>"
-                )
-                self.handle_command(command)
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Ketik '0' atau 'keluar' untuk keluar[/yellow]")
+        try:
+            while self.running:
+                try:
+                    clear_screen()
+                    self.display_banner()
+                    self.display_main_menu()
+                    command = Prompt.ask(
+                        f"\n[bold cyan]{self.profile.get('nickname', 'User')}[/bold cyan]@rizz>"
+                    )
+                    self.handle_command(command)
+                except KeyboardInterrupt:
+                    console.print("\n[yellow]Ketik '0' atau 'keluar' untuk keluar[/yellow]")
+        finally:
+            tutup_database(self.db)
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option('--setup', is_flag=True, help='Jalankan setup ulang profil')
-def main(setup):
+@click.option('--profile', 'profiling', is_flag=True, envvar='RIZZ_PROFILE',
+              help='Ukur waktu query database & catat query lambat')
+@click.pass_context
+def main(ctx, setup, profiling):
+    ctx.obj = {'profiling': profiling}
+    if ctx.invoked_subcommand is not None:
+        return
+    
     try:
-        assistant = RIzzAssistant()
+        assistant = RIzzAssistant(profiling=profiling)
         if setup:
             assistant.profile = assistant.config_mgr.collect_user_profile()
         assistant.run()
@@ -184,5 +221,62 @@ def main(setup):
         console.print(f"[bold red]Error Fatal: {str(e)}[/bold red]")
         sys.exit(1)
 
+@main.command('dashboard')
+@click.option('--live', is_flag=True, help='Perbarui otomatis (cocok untuk panel tmux)')
+@click.option('--interval', type=click.FloatRange(min=0.5),
+              help='Detik antar pengecekan data (default: dashboard_refresh_seconds di config)')
+@click.pass_context
+def dashboard(ctx, live, interval):
+    """Tampilkan dashboard kehidupan tanpa membuka menu"""
+    config_mgr = ConfigManager()
+    db = buka_database(config_mgr, ctx.obj['profiling'])
+    try:
+        dash = LifeDashboard(db)
+        if live:
+            if interval is None:
+                interval = config_mgr.load_config().get("dashboard_refresh_seconds", DEFAULT_LIVE_INTERVAL)
+            dash.live(interval)
+        else:
+            dash.tampilkan()
+    finally:
+        tutup_database(db)
+
+@main.group()
+def habits():
+    """Perintah pelacak kebiasaan tanpa menu (cocok untuk cron)"""
+
+@habits.command('checkin')
+@click.option('--all', 'semua', is_flag=True, help='Checkin semua kebiasaan')
+@click.option('--habit', 'habit_ids', type=int, multiple=True, help='ID kebiasaan (boleh diulang)')
+@click.option('--date', 'tanggal', help='Tanggal YYYY-MM-DD (default: hari ini)')
+@click.option('--from', 'dari', help='Awal rentang tanggal untuk isi mundur')
+@click.option('--to', 'sampai', help='Akhir rentang tanggal (default: hari ini)')
+@click.pass_context
+def habits_checkin(ctx, semua, habit_ids, tanggal, dari, sampai):
+    """Checkin kebiasaan untuk satu tanggal atau rentang tanggal"""
+    if semua == bool(habit_ids):
+        raise click.UsageError("Pilih salah satu: --all atau --habit ID")
+    if tanggal and (dari or sampai):
+        raise click.UsageError("--date tidak bisa digabung dengan --from/--to")
+    
+    today = datetime.now().strftime("%Y-%m-%d")
+    db = buka_database(ConfigManager(), ctx.obj['profiling'])
+    try:
+        if dari or sampai:
+            dates = rentang_tanggal(dari or today, sampai or today)
+        else:
+            dates = rentang_tanggal(tanggal or today, tanggal or today)
+        
+        if semua:
+            habit_ids = [h['id'] for h in db.fetch_all(HABITS_ALL)]
+        baru, sudah = HabitTracker(db).checkin_bulk(habit_ids, dates)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+    finally:
+        tutup_database(db)
+    
+    console.print(f"[green]✓ {baru} checkin baru tercatat[/green] [dim]({sudah} sudah ada)[/dim]")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Database baru (sudah dimigrasi) di folder sementara"""
+    database = Database(tmp_path)
+    yield database
+    database.close()
@@ -0,0 +1,114 @@
+import pytest
+
+from modules.budget import BudgetStatus, atur_budget, peringatan_baru, rebuild_budget_mtd
+from modules.expense_rollup import cek_konsistensi_rollup, rebuild_expense_rollup
+
+BULAN = "2026-03"
+INSERT = "INSERT INTO expenses (tanggal, jumlah, kategori) VALUES (?, ?, ?)"
+
+
+def mtd(db, kategori):
+    row = db.fetch_one(
+        "SELECT terpakai, jumlah_transaksi FROM budget_mtd WHERE bulan = ? AND kategori = ?",
+        (BULAN, kategori)
+    )
+    return (row['terpakai'], row['jumlah_transaksi']) if row else (0, 0)
+
+
+def alerts(db):
+    return [(r['kategori'], r['ambang'], r['dilihat'])
+            for r in db.fetch_all("SELECT * FROM budget_alerts ORDER BY kategori, ambang")]
+
+
+def cek_semua_konsisten(db):
+    assert cek_konsistensi_rollup(db) == []
+    expected = {}
+    for row in db.fetch_all("SELECT substr(tanggal, 1, 7) AS bulan, "
+                            "COALESCE(kategori, 'Lainnya') AS kategori, jumlah FROM expenses"):
+        for key in ((row['bulan'], row['kategori']), (row['bulan'], '*')):
+            total, count = expected.get(key, (0, 0))
+            expected[key] = (total + row['jumlah'], count + 1)
+    actual = {(r['bulan'], r['kategori']): (r['terpakai'], r['jumlah_transaksi'])
+              for r in db.fetch_all("SELECT * FROM budget_mtd") if r['jumlah_transaksi']}
+    assert actual == pytest.approx(expected)
+
+
+def test_insert_update_delete_menjaga_rollup_dan_mtd(db):
+    db.execute_query(INSERT, ("2026-03-01", 50000, "Makanan"))
+    db.execute_query(INSERT, ("2026-03-01", 20000, "Makanan"))
+    db.execute_query(INSERT, ("2026-03-02", 30000, None))
+    assert mtd(db, "Makanan") == (70000, 2)
+    assert mtd(db, "Lainnya") == (30000, 1)
+    assert mtd(db, "*") == (100000, 3)
+    cek_semua_konsisten(db)
+
+    # Pindah kategori dan bulan
+    db.execute_query("UPDATE expenses SET kategori = 'Transportasi' WHERE jumlah = 20000")
+    db.execute_query("UPDATE expenses SET tanggal = '2026-04-01' WHERE jumlah = 30000")
+    assert mtd(db, "Makanan") == (50000, 1)
+    assert mtd(db, "Transportasi") == (20000, 1)
+    assert mtd(db, "*") == (70000, 2)
+    cek_semua_konsisten(db)
+
+    db.execute_query("DELETE FROM expenses WHERE jumlah = 50000")
+    assert db.fetch_one("SELECT * FROM expense_daily_rollup WHERE kategori = 'Makanan'") is None
+    assert mtd(db, "*") == (20000, 1)
+    cek_semua_konsisten(db)
+
+
+def test_peringatan_ambang_naik_dan_turun(db):
+    atur_budget(db, 100000, "Makanan", BULAN)
+    db.execute_query(INSERT, ("2026-03-01", 79000, "Makanan"))
+    assert alerts(db) == []
+
+    db.execute_query(INSERT, ("2026-03-02", 1000, "Makanan"))
+    assert alerts(db) == [("Makanan", 80, 0)]
+
+    db.execute_query(INSERT, ("2026-03-03", 25000, "Makanan"))
+    assert alerts(db) == [("Makanan", 80, 0), ("Makanan", 100, 0)]
+    assert [r['ambang'] for r in BudgetStatus.load(db, BULAN).peringatan] == [100]
+
+    # Pengeluaran dihapus: ambang 100% tidak terlewati lagi
+    db.execute_query("DELETE FROM expenses WHERE jumlah = 25000")
+    assert alerts(db) == [("Makanan", 80, 0)]
+
+    # Budget baru menggantikan peringatan lama
+    atur_budget(db, 200000, "Makanan", BULAN)
+    assert alerts(db) == []
+
+
+def test_peringatan_baru_hanya_sekali(db):
+    atur_budget(db, 100000, None, BULAN)
+    db.execute_query(INSERT, ("2026-03-01", 90000, "Makanan"))
+    assert [r['ambang'] for r in peringatan_baru(db)] == [80]
+    assert peringatan_baru(db) == []
+
+
+@pytest.mark.parametrize("rebuild", [rebuild_expense_rollup, rebuild_budget_mtd])
+def test_rebuild_mempertahankan_peringatan_dilihat(db, rebuild):
+    atur_budget(db, 100000, "Makanan", BULAN)
+    db.execute_many(INSERT, [("2026-03-01", 60000, "Makanan"), ("2026-03-02", 50000, "Makanan")])
+    peringatan_baru(db)
+    assert alerts(db) == [("Makanan", 80, 1), ("Makanan", 100, 1)]
+
+    rebuild(db)
+    assert alerts(db) == [("Makanan", 80, 1), ("Makanan", 100, 1)]
+    assert peringatan_baru(db) == []
+    cek_semua_konsisten(db)
+
+
+def test_rebuild_memperbaiki_ringkasan_rusak(db):
+    atur_budget(db, 100000, "Makanan", BULAN)
+    db.execute_many(INSERT, [("2026-03-01", 90000, "Makanan"), ("2026-03-02", 5000, "Hiburan")])
+    peringatan_baru(db)
+
+    # Ringkasan diubah di luar trigger: total terlalu kecil, plus baris yatim
+    db.execute_query("UPDATE expense_daily_rollup SET total = 1000 WHERE kategori = 'Makanan'")
+    db.execute_query("INSERT INTO expense_daily_rollup VALUES ('2026-03-05', 'Belanja', 7000, 1)")
+    assert len(cek_konsistensi_rollup(db)) == 2
+    # Turun di bawah 80% membuang peringatannya
+    assert alerts(db) == []
+
+    rebuild_expense_rollup(db)
+    cek_semua_konsisten(db)
+    assert alerts(db) == [("Makanan", 80, 0)]
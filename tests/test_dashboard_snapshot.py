@@ -0,0 +1,90 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from modules import dashboard_snapshot
+from modules.dashboard_snapshot import SECTION_LOADERS, SnapshotCache
+from modules.habit_tracker import HabitTracker
+
+SEMUA = frozenset(SECTION_LOADERS)
+
+
+@pytest.fixture
+def cache(db):
+    cache = SnapshotCache(db)
+    _, changed = cache.get()
+    assert changed == SEMUA
+    return cache
+
+
+def test_tanpa_perubahan_dari_cache(cache):
+    snapshot, _ = cache.get()
+    lagi, changed = cache.get()
+    assert changed == frozenset()
+    assert lagi is snapshot
+
+
+@pytest.mark.parametrize("bagian, sql, params", [
+    ("tasks", "INSERT INTO tasks (task) VALUES (?)", ("Tugas",)),
+    ("money", "INSERT INTO expenses (tanggal, jumlah) VALUES (date('now', 'localtime'), ?)", (15000,)),
+    ("money", "INSERT INTO budget (bulan, budget_bulanan) VALUES (strftime('%Y-%m', 'now', 'localtime'), ?)",
+     (100000,)),
+    ("study", "INSERT INTO study_sessions (date, duration_minutes) VALUES (date('now', 'localtime'), ?)", (25,)),
+    ("goals", "INSERT INTO future_goals (target, deadline) VALUES (?, '2030-01-01')", ("Lulus",)),
+])
+def test_tulisan_hanya_memuat_ulang_bagiannya(cache, db, bagian, sql, params):
+    lama, _ = cache.get()
+    db.execute_query(sql, params)
+
+    baru, changed = cache.get()
+    assert changed == {bagian}
+    # Bagian lain dipakai ulang apa adanya
+    if bagian != "tasks":
+        assert baru.top_tasks is lama.top_tasks
+    if bagian != "money":
+        assert baru.budget is lama.budget
+    if bagian != "goals":
+        assert baru.goals is lama.goals
+
+
+def test_isi_bagian_ikut_terbarui(cache, db):
+    db.execute_query("INSERT INTO tasks (task) VALUES ('Tugas')")
+    db.execute_query("INSERT INTO expenses (tanggal, jumlah) VALUES (date('now', 'localtime'), 15000)")
+    snapshot, changed = cache.get()
+    assert changed == {"tasks", "money"}
+    assert snapshot.active_tasks == 1
+    assert (snapshot.expense_today, snapshot.expense_month) == (15000, 15000)
+
+
+def test_checkin_memuat_ulang_bagian_kebiasaan(cache, db):
+    db.execute_query("INSERT INTO habits (nama) VALUES ('Olahraga')")
+    assert cache.get()[1] == {"habits"}
+
+    HabitTracker(db, cache.analytics).checkin_bulk([1], [datetime.now().strftime("%Y-%m-%d")])
+    snapshot, changed = cache.get()
+    assert changed == {"habits"}
+    assert snapshot.habits_done_today == 1
+
+
+def test_tulisan_proses_lain_memuat_ulang_semua(cache, db):
+    conn = sqlite3.connect(db.db_path)
+    try:
+        with conn:
+            conn.execute("INSERT INTO tasks (task) VALUES ('Dari cron')")
+    finally:
+        conn.close()
+
+    snapshot, changed = cache.get()
+    assert changed == SEMUA
+    assert snapshot.active_tasks == 1
+
+
+def test_hari_berganti_memuat_ulang_semua(cache, monkeypatch):
+    class Besok(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=1)
+
+    monkeypatch.setattr(dashboard_snapshot, "datetime", Besok)
+    assert cache.get()[1] == SEMUA
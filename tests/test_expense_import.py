@@ -0,0 +1,120 @@
+import csv
+
+import pytest
+
+from modules.expense_import import ImporterPengeluaran, baca_csv
+from modules.expense_rollup import cek_konsistensi_rollup
+
+KATEGORI = ["Makanan", "Transportasi", "Belanja", "Lainnya"]
+
+MUTASI_CSV = """Tanggal;Keterangan;Debit;Kredit
+01/03/2026;Kopi Kenangan;25.000;
+01/03/2026;Kopi Kenangan;25.000;
+02/03/2026;Gaji;;5.000.000
+03/03/2026;Indomaret;112.500;
+"""
+
+MUTASI_OFX = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260305120000
+<TRNAMT>-45000.00
+<NAME>GRAB*Ride
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260306
+<TRNAMT>1000000.00
+<NAME>Transfer masuk
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260307
+<TRNAMT>-15000.00
+<NAME>Parkir
+<MEMO>Mall
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def expenses(db):
+    return [(r['tanggal'], r['jumlah'], r['deskripsi'])
+            for r in db.fetch_all("SELECT * FROM expenses ORDER BY id")]
+
+
+def test_csv_import_ulang_tidak_menggandakan(db, tmp_path):
+    path = tmp_path / "mutasi.csv"
+    path.write_text(MUTASI_CSV, encoding="utf-8")
+
+    hasil = ImporterPengeluaran(db, KATEGORI).import_file(path)
+    assert (hasil.dibaca, hasil.baru, hasil.duplikat, hasil.dilewati) == (4, 3, 0, 1)
+    # Dua kopi di hari yang sama adalah transaksi sah, bukan duplikat
+    assert expenses(db) == [
+        ("2026-03-01", 25000, "Kopi Kenangan"),
+        ("2026-03-01", 25000, "Kopi Kenangan"),
+        ("2026-03-03", 112500, "Indomaret"),
+    ]
+
+    ulang = ImporterPengeluaran(db, KATEGORI).import_file(path)
+    assert (ulang.baru, ulang.duplikat) == (0, 3)
+    assert len(expenses(db)) == 3
+    assert cek_konsistensi_rollup(db) == []
+
+
+def test_csv_tumpang_tindih_hanya_menambah_yang_baru(db, tmp_path):
+    lama = tmp_path / "lama.csv"
+    lama.write_text(MUTASI_CSV, encoding="utf-8")
+    ImporterPengeluaran(db, KATEGORI).import_file(lama)
+
+    baru = tmp_path / "baru.csv"
+    baru.write_text(MUTASI_CSV + "01/03/2026;Kopi Kenangan;25.000;\n04/03/2026;Token PLN;100.000;\n",
+                    encoding="utf-8")
+    hasil = ImporterPengeluaran(db, KATEGORI).import_file(baru)
+    assert (hasil.baru, hasil.duplikat) == (2, 3)
+    assert expenses(db).count(("2026-03-01", 25000, "Kopi Kenangan")) == 3
+    assert cek_konsistensi_rollup(db) == []
+
+
+def test_csv_kolom_bertanda_hanya_ambil_negatif(db, tmp_path):
+    path = tmp_path / "mutasi.csv"
+    path.write_text("date,description,amount\n2026-03-01,Salary,5000000\n"
+                    "2026-03-02,Bakso,-20000\n2026-03-03,Kopi,(15000)\n", encoding="utf-8")
+    hasil = ImporterPengeluaran(db, KATEGORI).import_file(path)
+    assert (hasil.baru, hasil.dilewati) == (2, 1)
+    assert [r[1] for r in expenses(db)] == [20000, 15000]
+
+
+def test_ofx_import_ulang_tidak_menggandakan(db, tmp_path):
+    path = tmp_path / "mutasi.ofx"
+    path.write_text(MUTASI_OFX, encoding="utf-8")
+
+    hasil = ImporterPengeluaran(db, KATEGORI).import_file(path)
+    assert (hasil.dibaca, hasil.baru) == (2, 2)
+    assert expenses(db) == [
+        ("2026-03-05", 45000, "GRAB*Ride"),
+        ("2026-03-07", 15000, "Parkir Mall"),
+    ]
+
+    ulang = ImporterPengeluaran(db, KATEGORI).import_file(path)
+    assert (ulang.baru, ulang.duplikat) == (0, 2)
+    assert cek_konsistensi_rollup(db) == []
+
+
+def test_csv_rusak_jadi_value_error(db, tmp_path):
+    path = tmp_path / "rusak.csv"
+    besar = "x" * (csv.field_size_limit() + 1)
+    path.write_text(f'tanggal,jumlah,deskripsi\n2026-03-01,1000,ok\n2026-03-02,2000,"{besar}"\n',
+                    encoding="utf-8")
+    with pytest.raises(ValueError, match="CSV tidak valid di baris 3"):
+        ImporterPengeluaran(db, KATEGORI).import_file(path)
+    assert expenses(db) == []
+
+
+def test_csv_tanpa_kolom_jumlah(tmp_path):
+    path = tmp_path / "salah.csv"
+    path.write_text("tanggal,keterangan\n2026-03-01,Kopi\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Kolom tanggal/jumlah"):
+        list(baca_csv(path))
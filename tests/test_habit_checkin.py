@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+
+import pytest
+
+from modules.habit_tracker import HabitTracker
+
+TODAY = date.today()
+
+
+def hari_lalu(n):
+    return (TODAY - timedelta(days=n)).isoformat()
+
+
+@pytest.fixture
+def tracker(db):
+    db.execute_many("INSERT INTO habits (nama) VALUES (?)", [("Olahraga",), ("Membaca",)])
+    return HabitTracker(db)
+
+
+def jumlah_log(db):
+    return db.fetch_one("SELECT COUNT(*) AS n FROM habit_logs")['n']
+
+
+def test_id_tidak_dikenal_ditolak_tanpa_menulis(tracker, db):
+    with pytest.raises(ValueError, match="ID kebiasaan tidak ditemukan: 7, 9"):
+        tracker.checkin_bulk([1, 9, 7], [hari_lalu(0)])
+    assert jumlah_log(db) == 0
+
+
+def test_tanggal_masa_depan_ditolak(tracker, db):
+    besok = (TODAY + timedelta(days=1)).isoformat()
+    with pytest.raises(ValueError, match="masa depan"):
+        tracker.checkin_bulk([1], [hari_lalu(0), besok])
+    assert jumlah_log(db) == 0
+
+
+def test_input_kosong(tracker, db):
+    assert tracker.checkin_bulk([], [hari_lalu(0)]) == (0, 0)
+    assert tracker.checkin_bulk([1], []) == (0, 0)
+    assert jumlah_log(db) == 0
+
+
+def test_checkin_ulang_dihitung_sudah_ada(tracker, db):
+    assert tracker.checkin_bulk([1, 2, 2], [hari_lalu(0)]) == (2, 0)
+    assert tracker.checkin_bulk([1, 2], [hari_lalu(1), hari_lalu(0)]) == (2, 2)
+    assert jumlah_log(db) == 4
+
+
+def test_isi_mundur_memperbarui_streak_dan_cache(tracker, db):
+    tracker.checkin_bulk([1], [hari_lalu(0)])
+    assert tracker.analytics.streaks()[1] == 1
+
+    # Isi mundur menyambung rangkaian di belakang log hari ini
+    tracker.checkin_bulk([1], [hari_lalu(n) for n in range(1, 5)])
+    assert tracker.analytics.streaks() == {1: 5, 2: 0}
+    row = db.fetch_one("SELECT * FROM habit_streaks WHERE habit_id = 1")
+    assert (row['current_streak'], row['longest_streak']) == (5, 5)
+    assert tracker.analytics.done_today() == {1}
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from modules import database as database_module
+from modules.database import MIGRATIONS, Database
+from modules.expense_rollup import cek_konsistensi_rollup
+
+
+@pytest.fixture
+def baseline_dir(tmp_path, monkeypatch):
+    """Folder berisi database versi lama: skema awal tanpa migrasi (user_version 0)"""
+    with monkeypatch.context() as m:
+        m.setattr(database_module, "MIGRATIONS", [])
+        m.setattr(database_module, "SETUP_SAAT_BUKA", [])
+        db = Database(tmp_path)
+        assert db.schema_version() == 0
+        db.execute_query("INSERT INTO habits (nama) VALUES ('Olahraga')")
+        # Log ganda: dulu checkin yang sama bisa tercatat dua kali
+        db.execute_many(
+            "INSERT INTO habit_logs (habit_id, tanggal) VALUES (?, ?)",
+            [(1, "2026-03-01"), (1, "2026-03-02"), (1, "2026-03-02"), (1, "2026-03-03")],
+        )
+        db.execute_many(
+            "INSERT INTO expenses (tanggal, jumlah, kategori, deskripsi) VALUES (?, ?, ?, ?)",
+            [("2026-03-01", 50000, "Makanan", "Bakso"),
+             ("2026-03-01", 25000, "Makanan", "Kopi"),
+             ("2026-03-02", 100000, None, "Tanpa kategori"),
+             (None, 10000, "Makanan", "Tanpa tanggal")],
+        )
+        db.execute_query("INSERT INTO budget (bulan, budget_bulanan) VALUES ('2026-03', 150000)")
+        db.execute_query(
+            "INSERT INTO catatan (judul, isi, tags) VALUES ('Ide', 'isi', '[\"Kerja\", \"kerja\", \" ide \"]')"
+        )
+        db.close()
+    return tmp_path
+
+
+def test_upgrade_baseline_ke_versi_terbaru(baseline_dir):
+    db = Database(baseline_dir)
+    try:
+        assert db.schema_version() == len(MIGRATIONS)
+
+        logs = db.fetch_all("SELECT tanggal FROM habit_logs ORDER BY tanggal")
+        assert [r['tanggal'] for r in logs] == ["2026-03-01", "2026-03-02", "2026-03-03"]
+        streak = db.fetch_one("SELECT * FROM habit_streaks WHERE habit_id = 1")
+        assert (streak['current_streak'], streak['longest_streak'], streak['last_date']) == (3, 3, "2026-03-03")
+
+        assert cek_konsistensi_rollup(db) == []
+        rollup = db.fetch_all("SELECT tanggal, kategori, total, count FROM expense_daily_rollup ORDER BY 1, 2")
+        assert [tuple(r.values()) for r in rollup] == [
+            ("2026-03-01", "Makanan", 75000, 2),
+            ("2026-03-02", "Lainnya", 100000, 1),
+        ]
+
+        # Budget lama jadi budget total; pengeluaran 175rb > 150rb memicu 80% dan 100%
+        assert db.fetch_one("SELECT kategori FROM budget")['kategori'] is None
+        total = db.fetch_one("SELECT * FROM budget_mtd WHERE bulan = '2026-03' AND kategori = '*'")
+        assert (total['terpakai'], total['jumlah_transaksi']) == (175000, 3)
+        ambang = db.fetch_all("SELECT ambang FROM budget_alerts WHERE kategori = '*' ORDER BY ambang")
+        assert [r['ambang'] for r in ambang] == [80, 100]
+
+        tags = db.fetch_all("SELECT tag FROM note_tags ORDER BY tag")
+        assert [r['tag'] for r in tags] == ["ide", "Kerja"]
+    finally:
+        db.close()
+
+
+def test_buka_ulang_tidak_menjalankan_migrasi_lagi(baseline_dir):
+    Database(baseline_dir).close()
+    db = Database(baseline_dir)
+    try:
+        assert db.schema_version() == len(MIGRATIONS)
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM budget_alerts")['n'] == 2
+        assert db.fetch_one("SELECT COUNT(*) AS n FROM note_tags")['n'] == 2
+    finally:
+        db.close()
+
+
+def test_migrasi_gagal_di_rollback(tmp_path, monkeypatch):
+    Database(tmp_path).close()
+    monkeypatch.setattr(database_module, "MIGRATIONS", MIGRATIONS + [[
+        "CREATE TABLE tabel_baru (id INTEGER)",
+        "INSERT INTO tabel_yang_tidak_ada VALUES (1)",
+    ]])
+
+    with pytest.raises(sqlite3.OperationalError):
+        Database(tmp_path)
+
+    conn = sqlite3.connect(tmp_path / "rizz_data.db")
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'tabel_baru'").fetchone() is None
+    finally:
+        conn.close()